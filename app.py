@@ -16,18 +16,96 @@ Future integrations:
     - Azure Blob Storage for file uploads
 """
 
+import os
+import logging
+
 # Import necessary Flask modules
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, Request, Response, render_template, request, redirect, url_for, flash, stream_with_context, g
+from werkzeug.utils import cached_property
+
+class StreamingUploadRequest(Request):
+    """
+    Request that streams uploaded CSV files straight to the upload folder.
+    
+    The multipart parser writes each CSV part into an UploadWriter as it
+    arrives, so the file is sniffed and size-checked while it is received
+    instead of being buffered and saved afterwards. Uploads that no route
+    completes (extra CSV parts, refused or failed uploads) are removed when
+    the request is closed.
+    """
+    
+    @cached_property
+    def upload_writers(self):
+        """
+        Writers opened for the CSV parts of this request.
+        """
+        return []
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and filename.endswith('.csv'):
+            from app.services.csv_service import CSVService
+            writer = CSVService().open_upload()
+            self.upload_writers.append(writer)
+            return writer
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+    
+    def close(self):
+        for writer in self.__dict__.get('upload_writers', ()):
+            if not writer.finished:
+                writer.discard()
+        super().close()
 
 # Initialize and configure Flask application
 app = Flask(__name__, 
             static_folder='app/static',  # Location of static assets (CSS, JS, images)
             template_folder='app/templates')  # Location of HTML templates
+app.request_class = StreamingUploadRequest
+
+# Requests with a larger declared body are refused before it is read
+# (uploads without a declared length are limited by UploadWriter)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 500 * 1024 * 1024))  # 500 MB
             
 # Secret key for session management and CSRF protection
 # SECURITY: Change this to a random secret key in production
 app.secret_key = 'your_secret_key'
 
+def json_response(payload, status=200):
+    """
+    Build a JSON response.
+    
+    NumPy and pandas values in the payload (for example from import previews)
+    are encoded directly, with NaN and NaT as null.
+    
+    Args:
+        payload: Data to encode
+        status: HTTP status code
+    
+    Returns:
+        Response with the application/json content type
+    """
+    from app.services.serialization import to_json
+    return Response(to_json(payload), status=status, mimetype='application/json')
+
+@app.before_request
+def start_request_metrics():
+    """
+    Start measuring the request (subject to METRICS_SAMPLE_RATE).
+    """
+    from app.services.metrics import start_request
+    g.metrics = start_request()
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    Record the time and memory used by the request, per route.
+    """
+    from app.services.metrics import finish_request
+    measurement = g.pop('metrics', None)
+    if measurement is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        finish_request(measurement, route, request.method, response.status_code)
+    return response
+
 # Route definitions
 @app.route('/')
 def index():
@@ -261,40 +339,58 @@ def upload_csv_file():
     Handle CSV file upload.
     
     This endpoint:
-    1. Validates the uploaded file
-    2. Saves it to a temporary location
-    3. Reads the CSV data
-    4. Suggests column mappings
+    1. Streams the uploaded file to a temporary location, rejecting files that
+       are too large or do not look like CSV while they are received
+    2. Reads the CSV data
+    3. Suggests column mappings and the date format
     
     Returns:
         JSON response with file ID, column names, and suggested mappings
     """
     from app.services.csv_service import CSVService
-    import json
+    from app.services.upload_service import UploadRejected, size_limit_message
+    from app.services.serialization import frame_records
+    from werkzeug.exceptions import RequestEntityTooLarge
     
     # Initialize CSV service
     csv_service = CSVService()
     
+    # Parsing the form streams the file to disk
+    try:
+        files = request.files
+    except UploadRejected as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except RequestEntityTooLarge:
+        return json_response({'error': size_limit_message(app.config['MAX_CONTENT_LENGTH'])}, 413)
+    
     # Check if file was uploaded
-    if 'file' not in request.files:
-        return json.dumps({'error': 'No file uploaded'}), 400
+    if 'file' not in files:
+        return json_response({'error': 'No file uploaded'}, 400)
     
-    file = request.files['file']
+    file = files['file']
     
     # Check if filename is empty
     if file.filename == '':
-        return json.dumps({'error': 'No file selected'}), 400
+        return json_response({'error': 'No file selected'}, 400)
     
     # Check file extension
     if not file.filename.endswith('.csv'):
-        return json.dumps({'error': 'File must be a CSV'}), 400
+        return json_response({'error': 'File must be a CSV'}, 400)
     
+    file_path = None
     try:
-        # Save the file to a temporary location
-        file_path = csv_service.save_uploaded_file(file)
+        # Complete the streamed file and remember its sniffed format
+        try:
+            file_path = csv_service.save_uploaded_file(file)
+        except UploadRejected as e:
+            return json_response({'error': str(e)}, e.status_code)
         
-        # Read the CSV file
-        df = csv_service.read_csv(file_path)
+        # Read the CSV file and cache the parsed data for later wizard steps.
+        # Large files are only sampled here and imported in chunks later.
+        if csv_service.should_stream(file_path):
+            df = csv_service.read_csv(file_path, nrows=1000)
+        else:
+            df = csv_service.load_csv(file_path)
         
         # Get column names
         columns = df.columns.tolist()
@@ -302,19 +398,30 @@ def upload_csv_file():
         # Suggest column mappings
         suggested_mapping = csv_service.suggest_column_mapping(df)
         
+        # Infer the date format of the suggested date column
+        suggested_date_format = None
+        if 'date' in suggested_mapping:
+            date_column = suggested_mapping['date']
+            suggested_date_format = csv_service.resolve_date_format(file_path, date_column, df[date_column])
+        
         # Get sample data for preview (first 5 rows)
-        sample_data = df.head(5).to_dict('records')
+        sample_data = frame_records(df.head(5))
         
         # Return the file path, columns, and suggested mappings
-        return json.dumps({
+        return json_response({
             'file_path': file_path,
             'columns': columns,
             'suggested_mapping': suggested_mapping,
+            'suggested_date_format': suggested_date_format,
             'sample_data': sample_data
-        }), 200
+        }, 200)
     
     except Exception as e:
-        return json.dumps({'error': str(e)}), 500
+        app.logger.exception('CSV upload failed')
+        # Don't leave the failed upload behind (unfinished uploads are removed with the request)
+        if file_path is not None:
+            csv_service.cleanup_temp_file(file_path)
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/import/map', methods=['POST'])
 def map_csv_columns():
@@ -326,12 +433,15 @@ def map_csv_columns():
     2. Converts dates to a standard format
     3. Normalizes amounts
     4. Categorizes transactions
+    5. Flags transactions that were already imported
     
     Returns:
         JSON response with preview data
     """
-    from app.services.csv_service import CSVService
-    import json
+    from app.services.csv_service import CSVService, ImportAggregates
+    from app.services.parallel_pipeline import (
+        process_parallel, should_process_parallel, DEFAULT_WORKERS as PARALLEL_WORKERS
+    )
     
     # Initialize CSV service
     csv_service = CSVService()
@@ -340,47 +450,86 @@ def map_csv_columns():
     data = request.get_json()
     
     if not data:
-        return json.dumps({'error': 'No data provided'}), 400
+        return json_response({'error': 'No data provided'}, 400)
     
     file_path = data.get('file_path')
     mapping = data.get('mapping')
     date_format = data.get('date_format')
     amount_format = data.get('amount_format', 'negative_expense')
     
+    # An empty or 'auto' date format means the format is inferred from the data
+    if date_format == 'auto':
+        date_format = None
+    
     if not file_path or not mapping:
-        return json.dumps({'error': 'Missing required parameters'}), 400
+        return json_response({'error': 'Missing required parameters'}, 400)
     
     try:
-        # Read the CSV file
-        df = csv_service.read_csv(file_path)
+        # Remember the settings so the import can be replayed chunk by chunk
+        csv_service.save_import_settings(file_path, {
+            'mapping': mapping,
+            'date_format': date_format,
+            'amount_format': amount_format
+        })
+        
+        # Large files are previewed in chunks, keeping only running totals
+        if csv_service.should_stream(file_path):
+            aggregates = ImportAggregates()
+            for _ in csv_service.stream_import(file_path, mapping, date_format, amount_format,
+                                               aggregates=aggregates, build_transactions=False):
+                pass
+            
+            return json_response({
+                'file_path': file_path,
+                'preview': aggregates.to_preview()
+            }, 200)
+        
+        # Reuse the parsed CSV from the upload step when it is still cached
+        df = csv_service.load_csv(file_path)
         
         # Apply column mapping
         df = csv_service.apply_column_mapping(df, mapping)
         
-        # Convert dates if date column and format are provided
-        if 'date' in df.columns and date_format:
-            df = csv_service.convert_dates(df, 'date', date_format)
+        # Convert dates, inferring the format from the column once per upload if needed
+        if 'date' in df.columns:
+            if date_format:
+                df = csv_service.convert_dates(df, 'date', date_format)
+            else:
+                inferred_format = csv_service.resolve_date_format(file_path, mapping['date'], df['date'])
+                if inferred_format:
+                    df = csv_service.convert_dates(df, 'date', inferred_format, errors='coerce')
         
-        # Normalize amounts
-        df = csv_service.normalize_amounts(df, amount_format)
+        if should_process_parallel(df):
+            # Very large files are normalized, categorized and validated on several cores
+            df, issues = process_parallel(df, amount_format, PARALLEL_WORKERS, csv_service)
+        else:
+            # Normalize amounts
+            df = csv_service.normalize_amounts(df, amount_format)
+            
+            # Categorize transactions
+            df = csv_service.categorize_transactions(df)
+            
+            # Validate the data
+            issues = csv_service.validate_data(df)
         
-        # Categorize transactions
-        df = csv_service.categorize_transactions(df)
+        # Flag transactions that are already in the store
+        issues.extend(csv_service.duplicate_issues(csv_service.find_duplicates(df)))
         
-        # Validate the data
-        issues = csv_service.validate_data(df)
+        # Cache the mapped data so preview and process can skip re-parsing
+        csv_service.cache_frame(file_path, 'mapped', df)
         
         # Generate preview
         preview = csv_service.generate_preview(df, issues)
         
         # Return the preview data
-        return json.dumps({
+        return json_response({
             'file_path': file_path,
             'preview': preview
-        }), 200
+        }, 200)
     
     except Exception as e:
-        return json.dumps({'error': str(e)}), 500
+        app.logger.exception('Column mapping failed')
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/import/preview', methods=['POST'])
 def preview_csv_import():
@@ -395,8 +544,7 @@ def preview_csv_import():
     Returns:
         JSON response with detailed preview data
     """
-    from app.services.csv_service import CSVService
-    import json
+    from app.services.csv_service import CSVService, ImportAggregates
     
     # Initialize CSV service
     csv_service = CSVService()
@@ -405,7 +553,7 @@ def preview_csv_import():
     data = request.get_json()
     
     if not data:
-        return json.dumps({'error': 'No data provided'}), 400
+        return json_response({'error': 'No data provided'}, 400)
     
     file_path = data.get('file_path')
     skip_duplicates = data.get('skip_duplicates', True)
@@ -413,12 +561,32 @@ def preview_csv_import():
     fix_issues = data.get('fix_issues', True)
     
     if not file_path:
-        return json.dumps({'error': 'Missing file path'}), 400
+        return json_response({'error': 'Missing file path'}, 400)
     
     try:
-        # Read the CSV file with previously applied mappings
-        # (This would be stored in a session in a real application)
-        df = csv_service.read_csv(file_path)
+        # Use the data with previously applied mappings from the import session cache
+        df = csv_service.get_cached_frame(file_path, 'mapped')
+        settings = csv_service.get_import_settings(file_path)
+        
+        # Without a cached frame, replay the saved mapping chunk by chunk
+        if df is None and settings:
+            aggregates = ImportAggregates()
+            for _ in csv_service.stream_import(file_path, settings['mapping'],
+                                               settings['date_format'],
+                                               settings['amount_format'],
+                                               aggregates=aggregates,
+                                               build_transactions=False,
+                                               skip_duplicates=skip_duplicates):
+                pass
+            
+            return json_response({
+                'file_path': file_path,
+                'preview': aggregates.to_preview()
+            }, 200)
+        
+        # Fall back to the raw file if the mapping step has not run
+        if df is None:
+            df = csv_service.load_csv(file_path)
         
         # Apply any additional processing based on user options
         if auto_categorize:
@@ -427,17 +595,66 @@ def preview_csv_import():
         # Validate the data
         issues = csv_service.validate_data(df)
         
+        # Flag transactions that are already in the store, leaving them out if requested
+        duplicates = csv_service.find_duplicates(df)
+        issues.extend(csv_service.duplicate_issues(duplicates))
+        if skip_duplicates:
+            df = df[~duplicates]
+        
         # Generate detailed preview
         preview = csv_service.generate_preview(df, issues)
         
         # Return the preview data
-        return json.dumps({
+        return json_response({
             'file_path': file_path,
             'preview': preview
-        }), 200
+        }, 200)
     
     except Exception as e:
-        return json.dumps({'error': str(e)}), 500
+        app.logger.exception('Import preview failed')
+        return json_response({'error': str(e)}, 500)
+
+@app.route('/import/issues')
+def import_issue_rows():
+    """
+    Page through the rows affected by a validation issue.
+    
+    Previews only include the first affected rows of each issue; this
+    endpoint returns the full list one page at a time.
+    
+    Parameters (from query string):
+        file_path: Path of the uploaded file
+        type: Issue type (for example invalid_dates or duplicate_rows)
+        offset: Number of affected rows to skip (default 0)
+        limit: Page size (default 1000, max 10000)
+    
+    Returns:
+        JSON response with the issue count, the page of row indices and
+        the offset of the next page
+    """
+    from app.services.csv_service import CSVService
+    
+    file_path = request.args.get('file_path')
+    issue_type = request.args.get('type')
+    
+    if not file_path or not issue_type:
+        return json_response({'error': 'Missing file path or issue type'}, 400)
+    
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 1000))
+    except ValueError:
+        return json_response({'error': 'offset and limit must be integers'}, 400)
+    
+    csv_service = CSVService()
+    try:
+        page = csv_service.get_issue_rows(file_path, issue_type, offset, limit)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    except FileNotFoundError:
+        return json_response({'error': 'Upload not found'}, 404)
+    
+    return json_response(page, 200)
 
 @app.route('/import/process', methods=['POST'])
 def process_csv_import():
@@ -453,9 +670,7 @@ def process_csv_import():
         JSON response with import summary
     """
     from app.services.csv_service import CSVService
-    from app.models.transaction import Transaction, TransactionBatch, add_transaction_batch
-    from datetime import datetime
-    import json
+    from app.services.import_jobs import run_import
     
     # Initialize CSV service
     csv_service = CSVService()
@@ -464,47 +679,95 @@ def process_csv_import():
     data = request.get_json()
     
     if not data:
-        return json.dumps({'error': 'No data provided'}), 400
+        return json_response({'error': 'No data provided'}, 400)
     
     file_path = data.get('file_path')
+    skip_duplicates = data.get('skip_duplicates', True)
     
     if not file_path:
-        return json.dumps({'error': 'Missing file path'}), 400
+        return json_response({'error': 'Missing file path'}, 400)
     
     try:
-        # Read the CSV file with previously applied mappings
-        df = csv_service.read_csv(file_path)
-        
-        # Process the import
-        import_result = csv_service.process_import(df)
-        
-        # Create Transaction objects
-        transactions = []
-        for t_data in import_result['transactions']:
-            transaction = Transaction.from_dict(t_data)
-            transactions.append(transaction)
-        
-        # Create a TransactionBatch
-        batch = TransactionBatch(
-            batch_id=import_result['summary']['batch_id'],
-            transactions=transactions,
-            import_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
-        
-        # Add the batch to the database
-        add_transaction_batch(batch)
-        
-        # Clean up the temporary file
-        csv_service.cleanup_temp_file(file_path)
+        # Run the import pipeline and store the batch
+        batch = run_import(csv_service, file_path, skip_duplicates=skip_duplicates)
         
         # Return the import summary
-        return json.dumps({
+        return json_response({
             'success': True,
             'summary': batch.to_dict()
-        }), 200
+        }, 200)
     
     except Exception as e:
-        return json.dumps({'error': str(e)}), 500
+        app.logger.exception('Import failed')
+        return json_response({'error': str(e)}, 500)
+
+@app.route('/import/jobs', methods=['POST'])
+def submit_import_job():
+    """
+    Queue the final CSV import as a background job.
+    
+    This endpoint returns immediately with a job ID. The import runs on a
+    worker thread and its progress can be polled at /import/jobs/<job_id>.
+    
+    Returns:
+        JSON response with the job ID and initial status
+    """
+    from app.services.import_jobs import import_job_manager, QueueFullError
+    
+    # Get request data
+    data = request.get_json()
+    
+    if not data:
+        return json_response({'error': 'No data provided'}, 400)
+    
+    file_path = data.get('file_path')
+    skip_duplicates = data.get('skip_duplicates', True)
+    
+    if not file_path:
+        return json_response({'error': 'Missing file path'}, 400)
+    
+    try:
+        job = import_job_manager.submit(file_path, skip_duplicates)
+        return json_response(job.to_dict(), 202)
+    
+    except QueueFullError as e:
+        return json_response({'error': str(e)}, 503)
+
+@app.route('/import/jobs/<job_id>')
+def import_job_status(job_id):
+    """
+    Report the status of a background import job.
+    
+    Parameters (from URL):
+        job_id: ID returned when the job was submitted
+    
+    Returns:
+        JSON response with status, current stage, rows processed and,
+        once finished, the import summary or error
+    """
+    from app.services.import_jobs import import_job_manager
+    
+    job = import_job_manager.get(job_id)
+    if job is None:
+        return json_response({'error': 'Import job not found'}, 404)
+    
+    return json_response(job.to_dict(), 200)
+
+@app.route('/metrics')
+def metrics():
+    """
+    Expose import pipeline and request metrics for Prometheus.
+    
+    Reports wall time, rows processed and memory use per pipeline stage and
+    per route for sampled requests, plus process memory and import cache
+    counters.
+    
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    from app.services.metrics import metrics_registry
+    
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/accounts/bank')
 def bank_accounts():
@@ -582,6 +845,205 @@ def transactions():
     
     return render_template('transactions.html')
 
+def parse_transaction_filters(args) -> dict:
+    """
+    Read the transaction filter query parameters shared by the transaction APIs.
+    
+    Args:
+        args: The request's query parameters
+        
+    Returns:
+        dict: Keyword arguments for query_transactions
+        
+    Raises:
+        ValueError: If a date or amount is malformed
+    """
+    from app.models.fingerprint_index import date_to_day
+    
+    start_date = args.get('start_date') or None
+    end_date = args.get('end_date') or None
+    for value in (start_date, end_date):
+        if value is not None and date_to_day(value) is None:
+            raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'categories': args.getlist('category') or None,
+        'accounts': args.getlist('account') or None,
+        'min_amount': float(args['min_amount']) if args.get('min_amount') else None,
+        'max_amount': float(args['max_amount']) if args.get('max_amount') else None,
+        'text': args.get('q') or None
+    }
+
+@app.route('/api/transactions')
+def api_transactions():
+    """
+    List stored transactions as JSON, one page at a time.
+    
+    Query parameters:
+    - start_date, end_date: Date range (YYYY-MM-DD, inclusive)
+    - category, account: Values to include (may be repeated)
+    - min_amount, max_amount: Amount range (inclusive)
+    - q: Search terms; each must match the start of a word in the description or notes
+    - order: 'desc' (newest first, the default) or 'asc'
+    - limit: Page size (default 50, at most 500)
+    - cursor: The next_cursor of the previous page
+    
+    Pages are fetched with keyset pagination on (date, id), so a page never
+    re-reads the pages before it; filters that reject many rows (amount
+    ranges above all) make a page read more of them.
+    
+    Returns:
+        JSON response with the transactions and the cursor of the next page
+    """
+    from app.models.transaction import query_transactions
+    from app.services.pagination import encode_cursor, decode_cursor, parse_limit
+    
+    args = request.args
+    try:
+        filters = parse_transaction_filters(args)
+        
+        order = args.get('order', 'desc')
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        
+        limit = parse_limit(args.get('limit'))
+        after = decode_cursor(args.get('cursor'), 2)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    
+    try:
+        # Fetch one extra row to find out whether there is a next page
+        transactions = query_transactions(
+            after=tuple(after) if after else None,
+            limit=limit + 1,
+            descending=order == 'desc',
+            **filters
+        )
+        
+        has_more = len(transactions) > limit
+        transactions = transactions[:limit]
+        next_cursor = None
+        if has_more:
+            last = transactions[-1]
+            next_cursor = encode_cursor([last.date, last.id])
+        
+        return json_response({
+            'transactions': [transaction.to_dict() for transaction in transactions],
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }, 200)
+    
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+@app.route('/api/transactions/export')
+def api_export_transactions():
+    """
+    Download stored transactions as CSV or NDJSON.
+    
+    Query parameters:
+    - format: 'csv' (the default) or 'ndjson'
+    - start_date, end_date, category, account, min_amount, max_amount, q:
+      The same filters as /api/transactions
+    
+    The response is streamed: transactions are read from the store in chunks
+    and written out as they are encoded, so memory use does not grow with the
+    size of the history.
+    
+    Returns:
+        Streaming CSV or NDJSON response ordered by date
+    """
+    from app.services.export_service import iter_transaction_chunks, generate_csv, generate_ndjson
+    
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return json_response({'error': "format must be 'csv' or 'ndjson'"}, 400)
+    try:
+        filters = parse_transaction_filters(request.args)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    
+    chunks = iter_transaction_chunks(filters)
+    if export_format == 'csv':
+        body, mimetype = generate_csv(chunks), 'text/csv'
+    else:
+        body, mimetype = generate_ndjson(chunks), 'application/x-ndjson'
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=transactions.{export_format}'
+    })
+
+@app.route('/api/transactions/search')
+def api_search_transactions():
+    """
+    Search stored transactions by description and notes, best matches first.
+    
+    Query parameters:
+    - q: Search terms; each must match the start of a word in the description or notes
+    - limit: Number of results (default 50, at most 500)
+    
+    Results come from a full-text index, ranked by where and how well the
+    terms match and then newest first.
+    
+    Returns:
+        JSON response with the number of matches and the best matching transactions
+    """
+    from app.models.transaction import search_transactions
+    from app.services.pagination import parse_limit
+    
+    query = request.args.get('q', '').strip()
+    if not query:
+        return json_response({'error': 'q is required'}, 400)
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    
+    try:
+        total, transactions = search_transactions(query, limit)
+        return json_response({
+            'total': total,
+            'transactions': [transaction.to_dict() for transaction in transactions]
+        }, 200)
+    
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+@app.route('/api/dashboard/summary')
+def api_dashboard_summary():
+    """
+    Summarize income and spending for the dashboard and budget views.
+    
+    Query parameters:
+    - start_month, end_month: Month range (YYYY-MM, inclusive)
+    - account: Accounts to include (may be repeated)
+    
+    The summary is built from precomputed per-(month, category, account)
+    rollups, so its cost depends on the number of months and categories,
+    not on the number of stored transactions.
+    
+    Returns:
+        JSON response with monthly totals, category totals and per-category
+        spending by month
+    """
+    from app.models.transaction import get_transaction_rollups
+    from app.models.rollups import summarize_rollups
+    from app.models.fingerprint_index import date_to_day
+    
+    start_month = request.args.get('start_month') or None
+    end_month = request.args.get('end_month') or None
+    for value in (start_month, end_month):
+        if value is not None and (len(value) != 7 or date_to_day(value + '-01') is None):
+            return json_response({'error': f"Invalid month '{value}', expected YYYY-MM"}, 400)
+    
+    try:
+        rows = get_transaction_rollups(start_month, end_month, request.args.getlist('account') or None)
+        return json_response(summarize_rollups(rows), 200)
+    
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
 @app.route('/subscriptions')
 def subscriptions():
     """
@@ -726,5 +1188,10 @@ if __name__ == '__main__':
     - Debug console for exceptions
     
     SECURITY: Set debug=False in production environments
+    
+    Logging is configured here for the development server only; deployments
+    configure it themselves (metrics log lines are written at DEBUG level).
     """
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'),
+                        format='%(asctime)s %(levelname)s %(name)s %(message)s')
     app.run(debug=True)  # Development server with debug mode
@@ -0,0 +1,672 @@
+"""
+database.py - Pooled Data-Access Layer for Muzzy Tracker
+
+This module provides database access shared by the persistent stores. SQL is
+written once with qmark ('?') placeholders and runs on any supported driver.
+It includes:
+- Pluggable drivers for SQLite (local development and tests) and PyMySQL
+  (Azure Database for MySQL)
+- A bounded, thread-safe connection pool with health checks on checkout
+- A statement cache, so each SQL text is translated to the driver's parameter
+  style once and compiled statements are reused per connection
+- Bulk insert and upsert helpers that run in a single database transaction
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Sequence, Tuple
+
+# Pool settings, overridable through environment variables
+DEFAULT_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 5))
+DEFAULT_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 10))
+DEFAULT_HEALTH_CHECK_INTERVAL = float(os.environ.get('DATABASE_HEALTH_CHECK_INTERVAL', 30))
+
+# Rows sent to the database per executemany call by the bulk helpers
+BULK_CHUNK_SIZE = 5000
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+@lru_cache(maxsize=512)
+def translate_placeholders(sql: str, paramstyle: str) -> str:
+    """
+    Translate qmark ('?') placeholders into a driver's parameter style.
+
+    Placeholders inside quoted strings are left alone. Results are cached, so
+    each statement is translated once.
+
+    Args:
+        sql: SQL text with qmark placeholders
+        paramstyle: DB-API paramstyle of the driver ('qmark' or 'format')
+
+    Returns:
+        str: SQL text for the driver
+    """
+    if paramstyle == 'qmark':
+        return sql
+    if paramstyle != 'format':
+        raise ValueError(f"Unsupported paramstyle: {paramstyle}")
+
+    parts = []
+    quote = None
+    for char in sql:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"', '`'):
+            quote = char
+        elif char == '?':
+            parts.append('%s')
+            continue
+        # A literal % must be doubled for format-style drivers
+        parts.append('%%' if char == '%' else char)
+    return ''.join(parts)
+
+
+class Driver(ABC):
+    """
+    Base class for database drivers.
+
+    A driver opens connections and knows the SQL dialect of its database.
+    """
+
+    name = 'base'
+    paramstyle = 'qmark'
+
+    @abstractmethod
+    def connect(self) -> Any:
+        """
+        Open a new DB-API connection in autocommit mode.
+
+        Returns:
+            A DB-API connection
+        """
+
+    def ping(self, connection: Any) -> None:
+        """
+        Check that a connection is still usable.
+
+        Args:
+            connection: The connection to check
+
+        Raises:
+            Exception: If the connection is broken
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def begin(self, connection: Any) -> None:
+        """
+        Start a transaction on a connection.
+
+        Args:
+            connection: The connection
+        """
+        connection.begin()
+
+    @abstractmethod
+    def upsert_sql(self, table: str, columns: Sequence[str], keys: Sequence[str],
+                   increment: Sequence[str] = ()) -> str:
+        """
+        Build an insert statement that updates the existing row on a key conflict.
+
+        Args:
+            table: Table name
+            columns: Columns to insert
+            keys: Columns of the unique key that may conflict
+            increment: Columns whose new value is added to the existing value
+                instead of replacing it
+
+        Returns:
+            str: SQL with qmark placeholders
+        """
+
+
+class SQLiteDriver(Driver):
+    """
+    Driver for SQLite database files, using WAL journaling.
+    """
+
+    name = 'sqlite'
+    paramstyle = 'qmark'
+
+    def __init__(self, path: str, timeout: float = 30.0, cached_statements: int = 256):
+        """
+        Initialize the driver.
+
+        Args:
+            path: Path to the database file, created if missing (':memory:' is not
+                supported, since every pooled connection opens the file separately)
+            timeout: Seconds to wait for locks held by other connections
+            cached_statements: Compiled statements kept per connection
+        """
+        self.path = path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def connect(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, but only one thread uses each at a time
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                     check_same_thread=False,
+                                     cached_statements=self.cached_statements)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def begin(self, connection: sqlite3.Connection) -> None:
+        # Take the write lock up front so concurrent writers wait instead of failing mid-transaction
+        connection.execute('BEGIN IMMEDIATE')
+
+    def upsert_sql(self, table: str, columns: Sequence[str], keys: Sequence[str],
+                   increment: Sequence[str] = ()) -> str:
+        updates = ', '.join(f"{column} = {table}.{column} + excluded.{column}" if column in increment
+                            else f"{column} = excluded.{column}"
+                            for column in columns if column not in keys)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({', '.join(keys)}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+
+
+class PyMySQLDriver(Driver):
+    """
+    Driver for MySQL through PyMySQL.
+    """
+
+    name = 'mysql'
+    paramstyle = 'format'
+
+    def __init__(self, host: str, user: str, password: str, database: str, port: int = 3306,
+                 ssl_ca: Optional[str] = None, connect_timeout: int = 10):
+        """
+        Initialize the driver.
+
+        Args:
+            host: Server hostname
+            user: Database user
+            password: Database password
+            database: Database name
+            port: Server port
+            ssl_ca: Path to the CA certificate for TLS connections (required by Azure)
+            connect_timeout: Seconds to wait when connecting
+        """
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.port = port
+        self.ssl_ca = ssl_ca
+        self.connect_timeout = connect_timeout
+
+    @classmethod
+    def from_env(cls) -> 'PyMySQLDriver':
+        """
+        Create a driver from the AZURE_MYSQL_* environment variables.
+
+        Returns:
+            PyMySQLDriver: The driver
+        """
+        return cls(
+            host=os.environ.get('AZURE_MYSQL_SERVER', 'localhost'),
+            user=os.environ.get('AZURE_MYSQL_USERNAME', ''),
+            password=os.environ.get('AZURE_MYSQL_PASSWORD', ''),
+            database=os.environ.get('AZURE_MYSQL_DATABASE', ''),
+            port=int(os.environ.get('AZURE_MYSQL_PORT', 3306)),
+            ssl_ca=os.environ.get('AZURE_MYSQL_SSL_CA') or None
+        )
+
+    def connect(self) -> Any:
+        import pymysql
+
+        return pymysql.connect(host=self.host, user=self.user, password=self.password,
+                               database=self.database, port=self.port, charset='utf8mb4',
+                               autocommit=True, connect_timeout=self.connect_timeout,
+                               ssl={'ca': self.ssl_ca} if self.ssl_ca else None)
+
+    def ping(self, connection: Any) -> None:
+        connection.ping(reconnect=False)
+
+    def upsert_sql(self, table: str, columns: Sequence[str], keys: Sequence[str],
+                   increment: Sequence[str] = ()) -> str:
+        updates = [f"{column} = {column} + VALUES({column})" if column in increment
+                   else f"{column} = VALUES({column})"
+                   for column in columns if column not in keys]
+        if not updates:
+            # Re-assigning a key column turns the conflict into a no-op
+            updates = [f"{keys[0]} = {keys[0]}"]
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {', '.join(updates)}")
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections.
+
+    At most max_size connections exist at once. Idle connections are reused in
+    last-in first-out order and are health-checked on checkout if they have been
+    idle for longer than health_check_interval; broken connections are replaced.
+    """
+
+    def __init__(self, driver: Driver, max_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_POOL_TIMEOUT,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL):
+        """
+        Initialize an empty pool. Connections are opened on demand.
+
+        Args:
+            driver: Driver used to open connections
+            max_size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before giving up
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+        """
+        self.driver = driver
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle: 'queue.LifoQueue[Tuple[Any, float]]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.in_use = 0
+
+    def acquire(self) -> Any:
+        """
+        Check out a connection, opening one if the pool is not yet full.
+
+        Returns:
+            A DB-API connection
+
+        Raises:
+            PoolTimeoutError: If every connection stays busy for the whole timeout
+        """
+        if self._closed:
+            raise RuntimeError('Connection pool is closed')
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeoutError(f"No database connection available within {self.timeout}s")
+
+        try:
+            connection = self._checkout_idle()
+            if connection is None:
+                connection = self.driver.connect()
+                with self._lock:
+                    self.created += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+        return connection
+
+    def _checkout_idle(self) -> Optional[Any]:
+        """
+        Take a healthy idle connection, discarding broken ones.
+
+        Returns:
+            A connection, or None if there is no idle connection
+        """
+        while True:
+            try:
+                connection, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - idle_since < self.health_check_interval:
+                return connection
+            try:
+                self.driver.ping(connection)
+                return connection
+            except Exception:
+                self._discard(connection)
+
+    def release(self, connection: Any, broken: bool = False) -> None:
+        """
+        Return a checked-out connection to the pool.
+
+        Args:
+            connection: The connection
+            broken: Whether the connection failed and must be closed instead of reused
+        """
+        with self._lock:
+            self.in_use -= 1
+        if broken or self._closed:
+            self._discard(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Check out a connection for the duration of a with block.
+
+        Yields:
+            A DB-API connection
+        """
+        connection = self.acquire()
+        broken = False
+        try:
+            yield connection
+        except Exception:
+            # Keep the connection only if it still responds after the error
+            try:
+                self.driver.ping(connection)
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(connection, broken)
+
+    def _discard(self, connection: Any) -> None:
+        """
+        Close a connection that leaves the pool.
+
+        Args:
+            connection: The connection
+        """
+        with self._lock:
+            self.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """
+        Close all idle connections. Checked-out connections are closed when released.
+        """
+        self._closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict[str, Any]: Pool size, usage and counters
+        """
+        with self._lock:
+            return {
+                'driver': self.driver.name,
+                'max_size': self.max_size,
+                'idle': self._idle.qsize(),
+                'in_use': self.in_use,
+                'created': self.created,
+                'discarded': self.discarded,
+                'timeouts': self.timeouts
+            }
+
+
+class Session:
+    """
+    Runs statements on one connection inside a database transaction.
+    """
+
+    def __init__(self, database: 'Database', connection: Any):
+        """
+        Initialize the session.
+
+        Args:
+            database: The database the connection belongs to
+            connection: The checked-out connection
+        """
+        self._database = database
+        self._connection = connection
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """
+        Run one statement.
+
+        Args:
+            sql: SQL with qmark placeholders
+            params: Statement parameters
+
+        Returns:
+            int: Number of affected rows
+        """
+        return self._database._execute(self._connection, sql, params)
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Run one statement for many parameter rows, in chunks of BULK_CHUNK_SIZE.
+
+        Args:
+            sql: SQL with qmark placeholders
+            rows: Parameter rows (may be a generator)
+
+        Returns:
+            int: Number of rows sent
+        """
+        return self._database._executemany(self._connection, sql, rows)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """
+        Run a query and fetch all rows.
+
+        Args:
+            sql: SQL with qmark placeholders
+            params: Query parameters
+
+        Returns:
+            List[Tuple]: The rows
+        """
+        return self._database._query(self._connection, sql, params)
+
+
+class Database:
+    """
+    Pooled access to one database through a driver.
+    """
+
+    def __init__(self, driver: Driver, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_POOL_TIMEOUT,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL):
+        """
+        Initialize the database.
+
+        Args:
+            driver: Driver used to open connections
+            pool_size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+        """
+        self.driver = driver
+        self.pool = ConnectionPool(driver, pool_size, timeout, health_check_interval)
+
+    @property
+    def dialect(self) -> str:
+        """
+        Get the SQL dialect of the database.
+
+        Returns:
+            str: The driver name ('sqlite' or 'mysql')
+        """
+        return self.driver.name
+
+    def _sql(self, sql: str) -> str:
+        return translate_placeholders(sql, self.driver.paramstyle)
+
+    def _execute(self, connection: Any, sql: str, params: Sequence[Any]) -> int:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self._sql(sql), tuple(params))
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def _executemany(self, connection: Any, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        sql = self._sql(sql)
+        cursor = connection.cursor()
+        total = 0
+        try:
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= BULK_CHUNK_SIZE:
+                    cursor.executemany(sql, chunk)
+                    total += len(chunk)
+                    chunk = []
+            if chunk:
+                cursor.executemany(sql, chunk)
+                total += len(chunk)
+            return total
+        finally:
+            cursor.close()
+
+    def _query(self, connection: Any, sql: str, params: Sequence[Any]) -> List[Tuple]:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self._sql(sql), tuple(params))
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """
+        Run a query on a pooled connection and fetch all rows.
+
+        Args:
+            sql: SQL with qmark placeholders
+            params: Query parameters
+
+        Returns:
+            List[Tuple]: The rows
+        """
+        with self.pool.connection() as connection:
+            return self._query(connection, sql, params)
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[Tuple]:
+        """
+        Run a query on a pooled connection and fetch the first row.
+
+        Args:
+            sql: SQL with qmark placeholders
+            params: Query parameters
+
+        Returns:
+            Tuple: The first row, or None if there are no rows
+        """
+        rows = self.query(sql, params)
+        return rows[0] if rows else None
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """
+        Run one statement in its own transaction.
+
+        Args:
+            sql: SQL with qmark placeholders
+            params: Statement parameters
+
+        Returns:
+            int: Number of affected rows
+        """
+        with self.transaction() as session:
+            return session.execute(sql, params)
+
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """
+        Run statements in one database transaction, committed when the block
+        exits and rolled back if it raises.
+
+        Yields:
+            Session: Session bound to the transaction's connection
+        """
+        with self.pool.connection() as connection:
+            self.driver.begin(connection)
+            try:
+                yield Session(self, connection)
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def bulk_insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+                    session: Optional[Session] = None) -> int:
+        """
+        Insert many rows with executemany.
+
+        Args:
+            table: Table name
+            columns: Columns to insert
+            rows: Row values in column order (may be a generator)
+            session: Session of an open transaction, or None to use a new transaction
+
+        Returns:
+            int: Number of rows inserted
+        """
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if session is not None:
+            return session.executemany(sql, rows)
+        with self.transaction() as session:
+            return session.executemany(sql, rows)
+
+    def bulk_upsert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+                    keys: Sequence[str], session: Optional[Session] = None,
+                    increment: Sequence[str] = ()) -> int:
+        """
+        Insert many rows, updating existing rows whose unique key conflicts.
+
+        Args:
+            table: Table name
+            columns: Columns to insert
+            rows: Row values in column order (may be a generator)
+            keys: Columns of the unique key
+            session: Session of an open transaction, or None to use a new transaction
+            increment: Columns added to the existing value on conflict (e.g. counters)
+
+        Returns:
+            int: Number of rows sent
+        """
+        sql = self.driver.upsert_sql(table, columns, keys, increment)
+        if session is not None:
+            return session.executemany(sql, rows)
+        with self.transaction() as session:
+            return session.executemany(sql, rows)
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        self.pool.close()
+
+
+def create_database(driver: Optional[str] = None, path: Optional[str] = None) -> Database:
+    """
+    Create a pooled database for a driver name.
+
+    Args:
+        driver: 'sqlite' or 'mysql'
+        path: Database file for the SQLite driver (defaults to SQLITE_PATH)
+
+    Returns:
+        Database: The database
+
+    Raises:
+        ValueError: If the driver is unknown
+    """
+    if driver == 'sqlite':
+        return Database(SQLiteDriver(path or os.environ.get('SQLITE_PATH', 'instance/muzzy_tracker.db')))
+    if driver == 'mysql':
+        return Database(PyMySQLDriver.from_env())
+    raise ValueError(f"Unknown database driver: {driver}")
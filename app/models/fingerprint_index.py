@@ -0,0 +1,163 @@
+"""
+fingerprint_index.py - Duplicate Transaction Index for Muzzy Tracker
+
+This module defines the FingerprintIndex class, which detects transactions
+that have already been imported. Each transaction is reduced to a fingerprint
+of its normalized description, account and amount (in cents), stored together
+with the transaction day. Looking up a new transaction costs a hash lookup plus
+a scan of the few days recorded for that fingerprint, so checks stay O(1) as
+history grows, and matches can be fuzzy within a window of days.
+"""
+
+import hashlib
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Iterable
+
+
+def normalize_text(value: Any) -> str:
+    """
+    Normalize a description or account for fingerprinting.
+
+    Args:
+        value: The raw value
+
+    Returns:
+        str: Lower-cased value with whitespace collapsed ('' for missing values)
+    """
+    if value is None or value != value:  # None or NaN
+        return ''
+    return ' '.join(str(value).lower().split())
+
+
+def amount_to_cents(amount: Any) -> Optional[int]:
+    """
+    Convert an amount to whole cents.
+
+    Args:
+        amount: The amount
+
+    Returns:
+        int: Amount in cents, or None for missing or non-numeric amounts
+    """
+    if amount is None or amount != amount:  # None or NaN
+        return None
+    try:
+        return int(round(float(amount) * 100))
+    except (TypeError, ValueError, OverflowError):
+        # Unnormalized values such as "$12.00" have no fingerprint
+        return None
+
+
+@lru_cache(maxsize=65536)
+def date_to_day(value: Any) -> Optional[int]:
+    """
+    Convert a YYYY-MM-DD date string to a day number.
+
+    Args:
+        value: Date string
+
+    Returns:
+        int: Proleptic Gregorian ordinal of the date, or None if invalid
+    """
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def fingerprint(description: Any, account: Any, cents: int) -> int:
+    """
+    Compute the fingerprint of a transaction, excluding its date.
+
+    The fingerprint is a stable signed 64-bit hash, so it can also be persisted
+    in an integer database column.
+
+    Args:
+        description: Transaction description
+        account: Source account
+        cents: Amount in cents
+
+    Returns:
+        int: Signed 64-bit fingerprint
+    """
+    key = f"{normalize_text(description)}\x1f{normalize_text(account)}\x1f{cents}"
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+
+class FingerprintIndex:
+    """
+    Index of transaction fingerprints and the days they occurred on.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self._days: Dict[int, List[int]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, day: Optional[int], description: Any, amount: Any, account: Any) -> None:
+        """
+        Record a transaction.
+
+        Transactions without a valid day or amount cannot be matched and are skipped.
+
+        Args:
+            day: Day number of the transaction (see date_to_day)
+            description: Transaction description
+            amount: Transaction amount
+            account: Source account
+        """
+        cents = amount_to_cents(amount)
+        if day is None or cents is None:
+            return
+        self._days.setdefault(fingerprint(description, account, cents), []).append(day)
+        self._size += 1
+
+    def add_many(self, dates: Iterable[Any], descriptions: Iterable[Any],
+                 amounts: Iterable[Any], accounts: Iterable[Any]) -> None:
+        """
+        Record several transactions.
+
+        Args:
+            dates: Transaction dates (YYYY-MM-DD)
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts
+            accounts: Source accounts
+        """
+        for row_date, description, amount, account in zip(dates, descriptions, amounts, accounts):
+            self.add(date_to_day(row_date), description, amount, account)
+
+    def contains(self, day: Optional[int], description: Any, amount: Any, account: Any,
+                 window_days: int = 0) -> bool:
+        """
+        Check whether a matching transaction has been recorded.
+
+        Args:
+            day: Day number of the transaction (see date_to_day)
+            description: Transaction description
+            amount: Transaction amount
+            account: Source account
+            window_days: Maximum difference in days for a match (0 for the same day)
+
+        Returns:
+            bool: True if a transaction with the same fingerprint lies within the window
+        """
+        cents = amount_to_cents(amount)
+        if day is None or cents is None:
+            return False
+        days = self._days.get(fingerprint(description, account, cents))
+        if not days:
+            return False
+        return any(abs(recorded - day) <= window_days for recorded in days)
+
+    def clear(self) -> None:
+        """
+        Remove all recorded fingerprints.
+        """
+        self._days.clear()
+        self._size = 0
@@ -0,0 +1,229 @@
+"""
+rollups.py - Monthly Transaction Rollups for Muzzy Tracker
+
+This module defines the MonthlyRollups class, which keeps transaction counts,
+income and expense sums per (month, category, account). Rollups are updated
+incrementally as transactions are stored, so dashboard and budget views read
+O(months x categories) precomputed rows instead of scanning every transaction.
+"""
+
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from app.models.fingerprint_index import date_to_day
+
+# Rollup key: (month as YYYY-MM, category, account)
+RollupKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def month_of(date: Any) -> Optional[str]:
+    """
+    Get the month of a transaction date.
+
+    Args:
+        date: Transaction date (YYYY-MM-DD)
+
+    Returns:
+        str: The month as YYYY-MM, or None if the date is invalid
+    """
+    if not isinstance(date, str) or date_to_day(date) is None:
+        return None
+    return date[:7]
+
+
+class MonthlyRollups:
+    """
+    Per-(month, category, account) transaction counts and sums.
+
+    Each entry holds [count, income, expenses], where income sums positive
+    amounts and expenses sums negative amounts. Transactions with an invalid
+    date or a missing amount are not rolled up.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty rollups.
+        """
+        self._entries: Dict[RollupKey, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, date: Any, amount: Any, category: Optional[str], account: Optional[str]) -> None:
+        """
+        Roll up one transaction.
+
+        Args:
+            date: Transaction date (YYYY-MM-DD)
+            amount: Transaction amount
+            category: Transaction category
+            account: Source account
+        """
+        month = month_of(date)
+        if month is None or amount is None or amount != amount:  # Skip missing and NaN amounts
+            return
+        entry = self._entries.get((month, category, account))
+        if entry is None:
+            entry = self._entries[(month, category, account)] = [0, 0.0, 0.0]
+        entry[0] += 1
+        if amount > 0:
+            entry[1] += amount
+        elif amount < 0:
+            entry[2] += amount
+
+    def add_many(self, dates: Iterable[Any], amounts: Iterable[Any],
+                 categories: Iterable[Optional[str]], accounts: Iterable[Optional[str]]) -> None:
+        """
+        Roll up several transactions.
+
+        Args:
+            dates: Transaction dates (YYYY-MM-DD)
+            amounts: Transaction amounts
+            categories: Transaction categories
+            accounts: Source accounts
+        """
+        for date, amount, category, account in zip(dates, amounts, categories, accounts):
+            self.add(date, amount, category, account)
+
+    def merge(self, other: 'MonthlyRollups') -> None:
+        """
+        Add the entries of other rollups to these.
+
+        Args:
+            other: The rollups to merge
+        """
+        for key, (count, income, expenses) in other._entries.items():
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [count, income, expenses]
+            else:
+                entry[0] += count
+                entry[1] += income
+                entry[2] += expenses
+
+    def items(self) -> Iterable[Tuple[RollupKey, List[float]]]:
+        """
+        Get all entries.
+
+        Returns:
+            Iterable[Tuple[RollupKey, List[float]]]: ((month, category, account), [count, income, expenses]) pairs
+        """
+        return self._entries.items()
+
+    def query(self, start_month: Optional[str] = None, end_month: Optional[str] = None,
+              accounts: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get rollup rows within a range of months.
+
+        Args:
+            start_month: First month to include (YYYY-MM), or None for no lower bound
+            end_month: Last month to include (YYYY-MM), or None for no upper bound
+            accounts: Accounts to include, or None for all
+
+        Returns:
+            List[Dict[str, Any]]: Rows with month, category, account, count, income and expenses
+        """
+        accounts = set(accounts) if accounts else None
+        rows = []
+        for (month, category, account), (count, income, expenses) in sorted(
+                self._entries.items(), key=lambda item: (item[0][0], str(item[0][1]), str(item[0][2]))):
+            if start_month is not None and month < start_month:
+                continue
+            if end_month is not None and month > end_month:
+                continue
+            if accounts is not None and account not in accounts:
+                continue
+            rows.append(rollup_row(month, category, account, count, income, expenses))
+        return rows
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+
+
+def rollup_row(month: str, category: Optional[str], account: Optional[str],
+               count: int, income: float, expenses: float) -> Dict[str, Any]:
+    """
+    Build a rollup row dictionary.
+
+    Args:
+        month: Month (YYYY-MM)
+        category: Transaction category
+        account: Source account
+        count: Number of transactions
+        income: Sum of positive amounts
+        expenses: Sum of negative amounts
+
+    Returns:
+        Dict[str, Any]: The rollup row
+    """
+    return {
+        'month': month,
+        'category': category,
+        'account': account,
+        'count': int(count),
+        'income': round(income, 2),
+        'expenses': round(expenses, 2)
+    }
+
+
+def summarize_rollups(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build dashboard data from rollup rows.
+
+    Args:
+        rows: Rollup rows (see MonthlyRollups.query)
+
+    Returns:
+        Dict[str, Any]: Monthly totals, per-category spending by month and
+        category totals, in the order the dashboard charts use
+    """
+    months = sorted({row['month'] for row in rows})
+    month_index = {month: index for index, month in enumerate(months)}
+
+    monthly = {month: {'month': month, 'income': 0.0, 'expenses': 0.0, 'count': 0} for month in months}
+    categories: Dict[str, Dict[str, Any]] = {}
+    spending_by_month: Dict[str, List[float]] = {}
+
+    for row in rows:
+        category = row['category'] or 'Uncategorized'
+        totals = monthly[row['month']]
+        totals['income'] += row['income']
+        totals['expenses'] += row['expenses']
+        totals['count'] += row['count']
+
+        summary = categories.get(category)
+        if summary is None:
+            summary = categories[category] = {'category': category, 'spending': 0.0, 'income': 0.0, 'count': 0}
+            spending_by_month[category] = [0.0] * len(months)
+        summary['spending'] -= row['expenses']
+        summary['income'] += row['income']
+        summary['count'] += row['count']
+        spending_by_month[category][month_index[row['month']]] -= row['expenses']
+
+    for totals in monthly.values():
+        totals['income'] = round(totals['income'], 2)
+        totals['expenses'] = round(totals['expenses'], 2)
+        totals['net'] = round(totals['income'] + totals['expenses'], 2)
+
+    # Largest spending categories first
+    category_list = sorted(categories.values(), key=lambda summary: -summary['spending'])
+    for summary in category_list:
+        summary['spending'] = round(summary['spending'], 2)
+        summary['income'] = round(summary['income'], 2)
+
+    return {
+        'months': months,
+        'monthly_totals': [monthly[month] for month in months],
+        'category_totals': category_list,
+        'spending_by_category': {
+            summary['category']: [round(value, 2) for value in spending_by_month[summary['category']]]
+            for summary in category_list
+        },
+        'totals': {
+            'income': round(sum(monthly[month]['income'] for month in months), 2),
+            'expenses': round(sum(monthly[month]['expenses'] for month in months), 2),
+            'count': sum(monthly[month]['count'] for month in months)
+        }
+    }
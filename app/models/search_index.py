@@ -0,0 +1,299 @@
+"""
+search_index.py - Full-Text Transaction Search Index for Muzzy Tracker
+
+This module defines the SearchIndex class, an inverted index over transaction
+descriptions and notes. Descriptions carry the merchant name in bank exports
+and repeat heavily, so the index is two-level: each distinct text is tokenized
+once and posted under its tokens, and each text keeps the documents that use
+it. Queries work on distinct texts and only expand the best matches into
+documents, so answering stays in the millisecond range over millions of rows.
+It includes:
+- Prefix matching of every query term, with exact token matches ranked higher
+- Multi-term queries, where every term must match the description or notes
+- Ranking by field weight and term rarity (IDF), newest documents first on ties
+- Unranked matching of every document, for filtering
+"""
+
+import bisect
+import heapq
+import math
+import re
+from array import array
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Set, Tuple
+
+# Tokens are runs of letters and digits
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+# Relative weight of a match in each field, and of a prefix match against an exact one
+FIELD_WEIGHTS = {'description': 1.0, 'notes': 0.5}
+PREFIX_MATCH_WEIGHT = 0.6
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split text into lower-case search tokens.
+
+    Args:
+        text: The text (non-strings yield no tokens)
+
+    Returns:
+        List[str]: The tokens in order
+    """
+    if not isinstance(text, str):
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class _FieldIndex:
+    """
+    Two-level inverted index for one text field: token -> texts -> documents.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty field index.
+        """
+        self.text_ids: Dict[str, int] = {}
+        self.docs_by_text: List[array] = []
+        self.postings: Dict[str, array] = {}
+        self.doc_frequency: Dict[str, int] = {}
+        self.vocabulary: List[str] = []
+        self._tokens_by_text: List[Tuple[str, ...]] = []
+
+    def add(self, doc_id: int, text: str) -> int:
+        """
+        Add a document's text.
+
+        Args:
+            doc_id: ID of the document; IDs must be added in increasing order
+            text: The text
+
+        Returns:
+            int: ID of the text
+        """
+        text_id = self.text_ids.get(text)
+        if text_id is None:
+            text_id = self.text_ids[text] = len(self.docs_by_text)
+            self.docs_by_text.append(array('q'))
+            tokens = tuple(dict.fromkeys(tokenize(text)))
+            self._tokens_by_text.append(tokens)
+            for token in tokens:
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array('q')
+                    bisect.insort(self.vocabulary, token)
+                posting.append(text_id)
+
+        self.docs_by_text[text_id].append(doc_id)
+        for token in self._tokens_by_text[text_id]:
+            self.doc_frequency[token] = self.doc_frequency.get(token, 0) + 1
+        return text_id
+
+    def expand(self, term: str) -> Iterator[str]:
+        """
+        Find the tokens that start with a query term.
+
+        Args:
+            term: The query term
+
+        Yields:
+            str: Matching tokens in sorted order
+        """
+        vocabulary = self.vocabulary
+        index = bisect.bisect_left(vocabulary, term)
+        while index < len(vocabulary) and vocabulary[index].startswith(term):
+            yield vocabulary[index]
+            index += 1
+
+    def match(self, terms: List[str], total_docs: int, weight: float) -> Dict[int, List[float]]:
+        """
+        Score the texts that match any query term.
+
+        Args:
+            terms: Query terms
+            total_docs: Number of indexed documents, for IDF
+            weight: Field weight
+
+        Returns:
+            Dict[int, List[float]]: text_id -> [bitmask of matched terms, score]
+        """
+        matches: Dict[int, List[float]] = {}
+        for bit, term in enumerate(terms):
+            # A text scores each term once, with its best matching token
+            best: Dict[int, float] = {}
+            for token in self.expand(term):
+                quality = 1.0 if token == term else PREFIX_MATCH_WEIGHT
+                score = weight * quality * math.log(1 + total_docs / self.doc_frequency[token])
+                for text_id in self.postings[token]:
+                    if score > best.get(text_id, 0.0):
+                        best[text_id] = score
+            for text_id, score in best.items():
+                entry = matches.get(text_id)
+                if entry is None:
+                    matches[text_id] = [1 << bit, score]
+                else:
+                    entry[0] |= 1 << bit
+                    entry[1] += score
+        return matches
+
+
+class SearchIndex:
+    """
+    Ranked full-text index over transaction descriptions and notes.
+
+    Documents are identified by increasing integer IDs chosen by the caller,
+    such as store positions or database sequence numbers.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.fields = {'description': _FieldIndex(), 'notes': _FieldIndex()}
+        self._description_of_doc: Dict[int, int] = {}
+        self._notes_docs = 0
+        self.total_docs = 0
+        self.last_doc_id: Optional[int] = None
+
+    def __len__(self) -> int:
+        return self.total_docs
+
+    def add(self, doc_id: int, description: Any, notes: Any = None) -> None:
+        """
+        Index one document.
+
+        Args:
+            doc_id: ID of the document; IDs must be added in increasing order
+            description: Transaction description
+            notes: Transaction notes
+        """
+        description = description if isinstance(description, str) else ''
+        text_id = self.fields['description'].add(doc_id, description)
+        if isinstance(notes, str) and notes:
+            # Documents with notes remember their description so both fields can be
+            # combined; this is recorded before the notes become searchable
+            self._description_of_doc[doc_id] = text_id
+            self.fields['notes'].add(doc_id, notes)
+        self.total_docs += 1
+        self.last_doc_id = doc_id
+
+    def add_many(self, doc_ids: Iterable[int], descriptions: Iterable[Any], notes: Iterable[Any]) -> None:
+        """
+        Index several documents.
+
+        Args:
+            doc_ids: Increasing document IDs
+            descriptions: Transaction descriptions
+            notes: Transaction notes
+        """
+        for doc_id, description, note in zip(doc_ids, descriptions, notes):
+            self.add(doc_id, description, note)
+
+    def search(self, query: str, limit: int = 50) -> Tuple[int, List[int]]:
+        """
+        Find the documents matching every term of a query, best matches first.
+
+        Each query term matches tokens that start with it. A document matches
+        when every term is found in its description or notes. Documents are
+        ranked by the summed term scores, then newest (highest ID) first.
+
+        Args:
+            query: The search text
+            limit: Maximum number of document IDs to return
+
+        Returns:
+            Tuple[int, List[int]]: Number of matching documents and the IDs of the best ones
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.total_docs:
+            return 0, []
+        full_mask = (1 << len(terms)) - 1
+
+        descriptions = self.fields['description']
+        notes = self.fields['notes']
+        description_matches = descriptions.match(terms, self.total_docs, FIELD_WEIGHTS['description'])
+        notes_matches = notes.match(terms, self.total_docs, FIELD_WEIGHTS['notes']) if notes.text_ids else {}
+
+        # Documents with matching notes are scored one by one, combined with their description
+        scored_docs: Dict[int, float] = {}
+        for text_id, (mask, score) in notes_matches.items():
+            for doc_id in notes.docs_by_text[text_id]:
+                description_match = description_matches.get(self._description_of_doc[doc_id])
+                doc_mask, doc_score = mask, score
+                if description_match is not None:
+                    doc_mask |= description_match[0]
+                    doc_score += description_match[1]
+                if doc_mask == full_mask:
+                    scored_docs[doc_id] = doc_score
+
+        # Every other match comes from a description matching all terms on its own,
+        # so whole texts are ranked and only expanded into documents as needed
+        levels: Dict[float, List[int]] = {}
+        total = len(scored_docs)
+        for text_id, (mask, score) in description_matches.items():
+            if mask == full_mask:
+                levels.setdefault(score, []).append(text_id)
+                total += len(descriptions.docs_by_text[text_id])
+        for doc_id, score in scored_docs.items():
+            levels.setdefault(score, [])
+        # Documents already scored through their notes are counted above
+        total -= sum(1 for doc_id in scored_docs
+                     if description_matches.get(self._description_of_doc[doc_id], (0,))[0] == full_mask)
+
+        notes_by_score: Dict[float, List[int]] = {}
+        for doc_id, score in scored_docs.items():
+            notes_by_score.setdefault(score, []).append(doc_id)
+
+        results: List[int] = []
+        for score in sorted(levels, reverse=True):
+            # Merge this score level's documents newest first
+            sources = [reversed(descriptions.docs_by_text[text_id]) for text_id in levels[score]]
+            sources.append(sorted(notes_by_score.get(score, ()), reverse=True))
+            for doc_id in heapq.merge(*sources, reverse=True):
+                if doc_id in scored_docs and scored_docs[doc_id] != score:
+                    continue  # Ranked at its combined score instead
+                results.append(doc_id)
+                if len(results) >= limit:
+                    return total, results
+        return total, results
+
+    def match_docs(self, query: str) -> Set[int]:
+        """
+        Find every document matching all terms of a query, unranked.
+
+        Terms match as in search(). The result holds one ID per matching
+        document, so its cost grows with the number of matches.
+
+        Args:
+            query: The search text
+
+        Returns:
+            Set[int]: IDs of the matching documents (none for a query without terms)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.total_docs:
+            return set()
+        full_mask = (1 << len(terms)) - 1
+
+        descriptions = self.fields['description']
+        notes = self.fields['notes']
+        description_matches = descriptions.match(terms, self.total_docs, FIELD_WEIGHTS['description'])
+
+        doc_ids: Set[int] = set()
+        for text_id, (mask, _) in description_matches.items():
+            if mask == full_mask:
+                doc_ids.update(descriptions.docs_by_text[text_id])
+        if notes.text_ids:
+            for text_id, (mask, _) in notes.match(terms, self.total_docs, FIELD_WEIGHTS['notes']).items():
+                for doc_id in notes.docs_by_text[text_id]:
+                    description_match = description_matches.get(self._description_of_doc[doc_id])
+                    description_mask = description_match[0] if description_match is not None else 0
+                    if mask | description_mask == full_mask:
+                        doc_ids.add(doc_id)
+        return doc_ids
+
+    def clear(self) -> None:
+        """
+        Remove all documents.
+        """
+        self.__init__()
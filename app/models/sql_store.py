@@ -0,0 +1,665 @@
+"""
+sql_store.py - SQL Transaction Store for Muzzy Tracker
+
+This module provides SQLTransactionStore, a persistent drop-in replacement for
+the in-memory TransactionStore. It runs on the pooled data-access layer in
+database.py, with SQLite as the local stand-in for Azure Database for MySQL,
+so transactions survive restarts and every worker process sees the same data.
+It includes:
+- Schemas for SQLite and MySQL with indexes on transaction date, import batch and category
+- Batched inserts, one database transaction per import batch
+- WAL journaling on SQLite, so reads can run alongside writes
+- Persisted duplicate fingerprints for detecting re-imported transactions
+- Monthly rollup rows, updated in the same database transaction as the inserts
+- An in-process full-text index over descriptions and notes, caught up from the
+  table before each search
+
+Select it with TRANSACTION_STORE=sqlite (and SQLITE_PATH for the database file)
+or TRANSACTION_STORE=mysql (with the AZURE_MYSQL_* settings).
+"""
+
+import threading
+from collections.abc import Sequence
+from typing import Dict, Any, Optional, List, Iterator, Iterable, Tuple, Union
+
+from app.models.database import Database
+from app.models.fingerprint_index import amount_to_cents, date_to_day, fingerprint
+from app.models.rollups import MonthlyRollups, rollup_row
+from app.models.search_index import SearchIndex
+from app.models.transaction import Transaction, TransactionBatch, TransactionColumns
+
+SCHEMAS = {
+    'sqlite': """
+CREATE TABLE IF NOT EXISTS import_batches (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    import_date TEXT,
+    total_transactions INTEGER NOT NULL,
+    total_income REAL NOT NULL,
+    total_expenses REAL NOT NULL,
+    start_date TEXT,
+    end_date TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_import_batches_id ON import_batches (id);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    date TEXT,
+    description TEXT,
+    amount REAL,
+    category TEXT,
+    account TEXT,
+    notes TEXT,
+    status TEXT,
+    import_batch_id TEXT,
+    import_date TEXT,
+    fingerprint INTEGER,
+    day INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_id ON transactions (id);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_batch ON transactions (import_batch_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category);
+CREATE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions (fingerprint, day);
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    account TEXT NOT NULL,
+    transaction_count INTEGER NOT NULL,
+    income REAL NOT NULL,
+    expenses REAL NOT NULL,
+    PRIMARY KEY (month, category, account)
+)
+""",
+    'mysql': """
+CREATE TABLE IF NOT EXISTS import_batches (
+    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+    id VARCHAR(64) NOT NULL,
+    import_date VARCHAR(19),
+    total_transactions INT NOT NULL,
+    total_income DOUBLE NOT NULL,
+    total_expenses DOUBLE NOT NULL,
+    start_date CHAR(10),
+    end_date CHAR(10),
+    UNIQUE KEY uq_import_batches_id (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS transactions (
+    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+    id VARCHAR(64) NOT NULL,
+    date CHAR(10),
+    description VARCHAR(512),
+    amount DOUBLE,
+    category VARCHAR(100),
+    account VARCHAR(255),
+    notes TEXT,
+    status VARCHAR(32),
+    import_batch_id VARCHAR(64),
+    import_date VARCHAR(19),
+    fingerprint BIGINT,
+    day INT,
+    KEY idx_transactions_id (id),
+    KEY idx_transactions_date (date, id),
+    KEY idx_transactions_batch (import_batch_id),
+    KEY idx_transactions_category (category),
+    KEY idx_transactions_fingerprint (fingerprint, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    month CHAR(7) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    account VARCHAR(255) NOT NULL,
+    transaction_count INT NOT NULL,
+    income DOUBLE NOT NULL,
+    expenses DOUBLE NOT NULL,
+    PRIMARY KEY (month, category, account)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+}
+
+# Transaction columns in Transaction constructor order
+TRANSACTION_COLUMNS = ('id', 'date', 'description', 'amount', 'category', 'account',
+                       'notes', 'status', 'import_batch_id', 'import_date')
+
+SELECT_TRANSACTIONS = f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions"
+
+# Columns written for each transaction
+INSERT_COLUMNS = TRANSACTION_COLUMNS + ('fingerprint', 'day')
+
+BATCH_COLUMNS = ('id', 'import_date', 'total_transactions', 'total_income', 'total_expenses',
+                 'start_date', 'end_date')
+
+# Rollup columns; missing categories and accounts are stored as '' so they can be part of the key
+ROLLUP_KEYS = ('month', 'category', 'account')
+ROLLUP_COLUMNS = ROLLUP_KEYS + ('transaction_count', 'income', 'expenses')
+
+SELECT_BATCHES = ("SELECT id, import_date, total_transactions, total_income, total_expenses, "
+                  "start_date, end_date FROM import_batches")
+
+# Rows fetched per query when iterating, and fingerprints looked up per query
+FETCH_SIZE = 10000
+LOOKUP_SIZE = 500
+
+
+def _row_values(transaction_id: str, date: Any, description: Any, amount: Any, category: Any,
+                account: Any, notes: Any, status: Any, batch_id: Any, import_date: Any) -> Tuple:
+    """
+    Build the insert parameters for one transaction, including its duplicate fingerprint.
+
+    Args:
+        The Transaction fields, in constructor order
+
+    Returns:
+        Tuple: Values for INSERT_COLUMNS
+    """
+    cents = amount_to_cents(amount)
+    amount = None if cents is None else float(amount)
+    return (transaction_id, date, description, amount, category, account, notes, status,
+            batch_id, import_date,
+            None if cents is None else fingerprint(description, account, cents),
+            date_to_day(date) if isinstance(date, str) else None)
+
+
+class _QuerySequence(Sequence):
+    """
+    Read-only sequence over the rows of a query, loaded from the database on access.
+    """
+
+    def __init__(self, store: 'SQLTransactionStore', where: str = '', params: Tuple = (),
+                 length: Optional[int] = None):
+        """
+        Initialize the view.
+
+        Args:
+            store: The store to query
+            where: SQL condition selecting the rows (empty for all rows)
+            params: Parameters of the condition
+            length: Known number of rows, or None to count them on demand
+        """
+        self._store = store
+        self._where = f" WHERE {where}" if where else ''
+        self._params = params
+        self._length = length
+
+    def __len__(self) -> int:
+        if self._length is not None:
+            return self._length
+        return self._store._query_one(f"SELECT COUNT(*) FROM transactions{self._where}", self._params)[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            rows = self._store._query(f"{SELECT_TRANSACTIONS}{self._where} ORDER BY seq LIMIT ? OFFSET ?",
+                                      self._params + (max(0, stop - start), start))
+            return [Transaction(*row) for row in rows]
+        if index < 0:
+            index += len(self)
+        row = self._store._query_one(f"{SELECT_TRANSACTIONS}{self._where} ORDER BY seq LIMIT 1 OFFSET ?",
+                                     self._params + (index,)) if index >= 0 else None
+        if row is None:
+            raise IndexError('transaction index out of range')
+        return Transaction(*row)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        # Page through the rows by sequence number so each query stays small
+        last = 0
+        condition = f"{self._where} AND seq > ?" if self._where else " WHERE seq > ?"
+        while True:
+            rows = self._store._query(
+                f"SELECT seq, {', '.join(TRANSACTION_COLUMNS)} FROM transactions{condition} ORDER BY seq LIMIT ?",
+                self._params + (last, FETCH_SIZE))
+            for row in rows:
+                yield Transaction(*row[1:])
+            if len(rows) < FETCH_SIZE:
+                return
+            last = rows[-1][0]
+
+
+class _StoredBatches(Sequence):
+    """
+    Read-only sequence of the stored import batches, in insertion order.
+    """
+
+    def __init__(self, store: 'SQLTransactionStore'):
+        """
+        Initialize the view.
+
+        Args:
+            store: The store to query
+        """
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store._query_one("SELECT COUNT(*) FROM import_batches")[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TransactionBatch, List[TransactionBatch]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        row = self._store._query_one(f"{SELECT_BATCHES} ORDER BY seq LIMIT 1 OFFSET ?",
+                                     (index,)) if index >= 0 else None
+        if row is None:
+            raise IndexError('batch index out of range')
+        return self._store._batch_from_row(row)
+
+    def __iter__(self) -> Iterator[TransactionBatch]:
+        for row in self._store._query(f"{SELECT_BATCHES} ORDER BY seq"):
+            yield self._store._batch_from_row(row)
+
+
+class SQLTransactionStore:
+    """
+    Transaction storage in an SQL database, with the interface of TransactionStore.
+
+    Connections come from the database's pool, so the store is safe to share
+    between threads; writes from other processes are serialized by the database.
+    """
+
+    def __init__(self, database: Database):
+        """
+        Open the store, creating the schema if needed.
+
+        Args:
+            database: Pooled database to store transactions in
+        """
+        self.database = database
+        self.transactions = _QuerySequence(self)
+        self.batches = _StoredBatches(self)
+
+        # Search index keyed by seq, built lazily and shared by the store's threads
+        self.search_index = SearchIndex()
+        self._search_lock = threading.Lock()
+
+        with database.transaction() as session:
+            for statement in SCHEMAS[database.dialect].split(';'):
+                if statement.strip():
+                    session.execute(statement)
+
+        # Databases created before rollups existed get them built once
+        if (self._query_one("SELECT 1 FROM monthly_rollups LIMIT 1") is None
+                and self._query_one("SELECT 1 FROM transactions LIMIT 1") is not None):
+            self.rebuild_rollups()
+
+    def rebuild_rollups(self) -> None:
+        """
+        Recompute every monthly rollup row from the stored transactions.
+        """
+        with self.database.transaction() as session:
+            session.execute("DELETE FROM monthly_rollups")
+            session.execute(
+                f"INSERT INTO monthly_rollups ({', '.join(ROLLUP_COLUMNS)}) "
+                "SELECT SUBSTR(date, 1, 7), COALESCE(category, ''), COALESCE(account, ''), COUNT(*), "
+                "SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END), "
+                "SUM(CASE WHEN amount < 0 THEN amount ELSE 0 END) "
+                "FROM transactions WHERE day IS NOT NULL AND amount IS NOT NULL "
+                "GROUP BY SUBSTR(date, 1, 7), COALESCE(category, ''), COALESCE(account, '')")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """
+        Run a query and fetch all rows.
+
+        Args:
+            sql: The query, with qmark placeholders
+            params: Query parameters
+
+        Returns:
+            List[Tuple]: The rows
+        """
+        return self.database.query(sql, params)
+
+    def _query_one(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        """
+        Run a query and fetch the first row.
+
+        Args:
+            sql: The query, with qmark placeholders
+            params: Query parameters
+
+        Returns:
+            Tuple: The first row, or None if there are no rows
+        """
+        return self.database.query_one(sql, params)
+
+    def _batch_from_row(self, row: Tuple) -> TransactionBatch:
+        """
+        Build a TransactionBatch from an import_batches row.
+
+        Args:
+            row: Row selected with SELECT_BATCHES
+
+        Returns:
+            TransactionBatch: The batch, with its transactions loaded on access
+        """
+        batch_id, import_date, count, income, expenses, start_date, end_date = row
+        transactions = _QuerySequence(self, 'import_batch_id = ?', (batch_id,), count)
+        return TransactionBatch.from_aggregates(batch_id, transactions, import_date,
+                                                income, expenses, start_date, end_date)
+
+    def _store_rows(self, rows: Iterable[Tuple], batch: Optional[TransactionBatch] = None) -> None:
+        """
+        Insert transaction rows, their rollups and optionally their batch in one database transaction.
+
+        Args:
+            rows: Insert parameters built by _row_values (may be a generator)
+            batch: The batch the rows belong to, or None
+        """
+        rollups = MonthlyRollups()
+
+        def rolled_up(rows: Iterable[Tuple]) -> Iterator[Tuple]:
+            # Roll rows up as they stream into executemany
+            for row in rows:
+                rollups.add(row[1], row[3], row[4], row[5])
+                yield row
+
+        with self.database.transaction() as session:
+            if batch is not None:
+                date_range = batch.date_range
+                self.database.bulk_upsert('import_batches', BATCH_COLUMNS, [(
+                    batch.id, batch.import_date, batch.total_transactions, float(batch.total_income),
+                    float(batch.total_expenses), date_range['start'], date_range['end']
+                )], keys=('id',), session=session)
+            self.database.bulk_insert('transactions', INSERT_COLUMNS, rolled_up(rows), session=session)
+            self.database.bulk_upsert(
+                'monthly_rollups', ROLLUP_COLUMNS,
+                [(month, category or '', account or '', count, income, expenses)
+                 for (month, category, account), (count, income, expenses) in rollups.items()],
+                keys=ROLLUP_KEYS, session=session, increment=ROLLUP_COLUMNS[3:])
+
+    def add_transaction(self, transaction: Transaction) -> None:
+        """
+        Add a single transaction.
+
+        Args:
+            transaction: Transaction object to add
+        """
+        self._store_rows([_row_values(*(getattr(transaction, column) for column in TRANSACTION_COLUMNS))])
+
+    def add_batch(self, batch: TransactionBatch) -> None:
+        """
+        Add a transaction batch and all of its transactions in one database transaction.
+
+        Args:
+            batch: TransactionBatch object to add
+        """
+        transactions = batch.transactions
+        if isinstance(transactions, TransactionColumns):
+            # Read columnar batches column-wise, without building row views
+            encoded = transactions.encoded
+            rows = (_row_values(*row) for row in zip(
+                transactions.ids, encoded['date'], encoded['description'], transactions.amounts,
+                encoded['category'], encoded['account'], encoded['notes'], encoded['status'],
+                encoded['import_batch_id'], encoded['import_date']))
+        else:
+            rows = (_row_values(*(getattr(transaction, column) for column in TRANSACTION_COLUMNS))
+                    for transaction in transactions)
+        self._store_rows(rows, batch)
+
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        Get a transaction by its ID.
+
+        Args:
+            transaction_id: ID of the transaction
+
+        Returns:
+            Transaction: Transaction object if found, None otherwise
+        """
+        row = self._query_one(f"{SELECT_TRANSACTIONS} WHERE id = ? ORDER BY seq LIMIT 1", (transaction_id,))
+        return None if row is None else Transaction(*row)
+
+    def get_transactions_by_batch(self, batch_id: str) -> List[Transaction]:
+        """
+        Get all transactions imported in a batch.
+
+        Args:
+            batch_id: ID of the batch
+
+        Returns:
+            List[Transaction]: Transactions in the batch
+        """
+        rows = self._query(f"{SELECT_TRANSACTIONS} WHERE import_batch_id = ? ORDER BY seq", (batch_id,))
+        return [Transaction(*row) for row in rows]
+
+    def get_transactions_by_date_range(self, start_date: Optional[str] = None,
+                                       end_date: Optional[str] = None) -> List[Transaction]:
+        """
+        Get transactions dated within a range, ordered by date.
+
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+
+        Returns:
+            List[Transaction]: Matching transactions ordered by date and ID
+        """
+        conditions = ['date IS NOT NULL']
+        params: List[str] = []
+        if start_date is not None:
+            conditions.append('date >= ?')
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append('date <= ?')
+            params.append(end_date)
+
+        rows = self._query(f"{SELECT_TRANSACTIONS} WHERE {' AND '.join(conditions)} ORDER BY date, id",
+                           tuple(params))
+        return [Transaction(*row) for row in rows]
+
+    def get_batch(self, batch_id: str) -> Optional[TransactionBatch]:
+        """
+        Get a transaction batch by its ID.
+
+        Args:
+            batch_id: ID of the batch
+
+        Returns:
+            TransactionBatch: TransactionBatch object if found, None otherwise
+        """
+        row = self._query_one(f"{SELECT_BATCHES} WHERE id = ? ORDER BY seq LIMIT 1", (batch_id,))
+        return None if row is None else self._batch_from_row(row)
+
+    def query_transactions(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           categories: Optional[Iterable[str]] = None,
+                           accounts: Optional[Iterable[str]] = None,
+                           min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                           text: Optional[str] = None, after: Optional[Tuple[str, str]] = None,
+                           limit: int = 50, descending: bool = False) -> List[Transaction]:
+        """
+        Get one page of filtered transactions ordered by (date, id), using keyset pagination.
+
+        The cursor condition and ordering match the (date, id) index, so the
+        database seeks straight to the page instead of skipping earlier rows.
+        A text filter is answered by the search index, with the same matching
+        rules as the in-memory store: every matching row is fetched by sequence
+        number and the page is cut from them.
+
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+            categories: Categories to include, or None for all
+            accounts: Accounts to include, or None for all
+            min_amount: Smallest amount to include, or None
+            max_amount: Largest amount to include, or None
+            text: Search terms that must each match the start of a word in the description or notes, or None
+            after: (date, id) of the last transaction of the previous page, or None for the first page
+            limit: Maximum number of transactions to return
+            descending: Whether to return the newest transactions first
+
+        Returns:
+            List[Transaction]: Up to limit matching transactions
+        """
+        conditions = ['date IS NOT NULL']
+        params: List[Any] = []
+        if start_date is not None:
+            conditions.append('date >= ?')
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append('date <= ?')
+            params.append(end_date)
+        if after is not None:
+            comparison = '<' if descending else '>'
+            conditions.append(f"(date {comparison} ? OR (date = ? AND id {comparison} ?))")
+            params.extend([after[0], after[0], after[1]])
+        for column, values in (('category', categories), ('account', accounts)):
+            if values:
+                values = list(values)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if min_amount is not None:
+            conditions.append('amount >= ?')
+            params.append(min_amount)
+        if max_amount is not None:
+            conditions.append('amount <= ?')
+            params.append(max_amount)
+        where = ' AND '.join(conditions)
+
+        if not text:
+            direction = 'DESC' if descending else 'ASC'
+            rows = self._query(f"{SELECT_TRANSACTIONS} WHERE {where} "
+                               f"ORDER BY date {direction}, id {direction} LIMIT ?", tuple(params) + (limit,))
+            return [Transaction(*row) for row in rows]
+
+        with self._search_lock:
+            self._catch_up_search_index()
+            seqs = sorted(self.search_index.match_docs(text))
+        rows = []
+        for start in range(0, len(seqs), LOOKUP_SIZE):
+            chunk = seqs[start:start + LOOKUP_SIZE]
+            rows.extend(self._query(f"{SELECT_TRANSACTIONS} WHERE {where} "
+                                    f"AND seq IN ({', '.join('?' * len(chunk))})", tuple(params) + tuple(chunk)))
+        # Rows are (id, date, ...)
+        rows.sort(key=lambda row: (row[1], row[0]), reverse=descending)
+        return [Transaction(*row) for row in rows[:limit]]
+
+    def _catch_up_search_index(self) -> None:
+        """
+        Index the rows added since the last search, including those written by other processes.
+        """
+        index = self.search_index
+        last_seq = self._query_one("SELECT MAX(seq) FROM transactions")[0]
+        if index.last_doc_id is not None and (last_seq is None or last_seq < index.last_doc_id):
+            # Rows were deleted since the index was built
+            index.clear()
+        while last_seq is not None and (index.last_doc_id is None or index.last_doc_id < last_seq):
+            start = -1 if index.last_doc_id is None else index.last_doc_id
+            rows = self._query("SELECT seq, description, notes FROM transactions "
+                               "WHERE seq > ? ORDER BY seq LIMIT ?", (start, FETCH_SIZE))
+            if not rows:
+                break
+            seqs, descriptions, notes = zip(*rows)
+            index.add_many(seqs, descriptions, notes)
+
+    def search_transactions(self, query: str, limit: int = 50) -> Tuple[int, List[Transaction]]:
+        """
+        Search descriptions and notes, best matches first.
+
+        Args:
+            query: The search text; every term must match the start of a word
+            limit: Maximum number of transactions to return
+
+        Returns:
+            Tuple[int, List[Transaction]]: Number of matching transactions and the best ones
+        """
+        with self._search_lock:
+            self._catch_up_search_index()
+            total, seqs = self.search_index.search(query, limit)
+        if not seqs:
+            return total, []
+        rows = self._query(f"SELECT seq, {', '.join(TRANSACTION_COLUMNS)} FROM transactions "
+                           f"WHERE seq IN ({', '.join('?' * len(seqs))})", tuple(seqs))
+        by_seq = {row[0]: Transaction(*row[1:]) for row in rows}
+        return total, [by_seq[seq] for seq in seqs if seq in by_seq]
+
+    def get_rollups(self, start_month: Optional[str] = None, end_month: Optional[str] = None,
+                    accounts: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get monthly rollup rows.
+
+        Args:
+            start_month: First month to include (YYYY-MM), or None for no lower bound
+            end_month: Last month to include (YYYY-MM), or None for no upper bound
+            accounts: Accounts to include, or None for all
+
+        Returns:
+            List[Dict[str, Any]]: Rows with month, category, account, count, income and expenses
+        """
+        conditions = []
+        params: List[Any] = []
+        if start_month is not None:
+            conditions.append('month >= ?')
+            params.append(start_month)
+        if end_month is not None:
+            conditions.append('month <= ?')
+            params.append(end_month)
+        if accounts:
+            accounts = list(accounts)
+            conditions.append(f"account IN ({', '.join('?' * len(accounts))})")
+            params.extend(accounts)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = self._query(f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM monthly_rollups{where} "
+                           f"ORDER BY month, category, account", tuple(params))
+        return [rollup_row(month, category or None, account or None, count, income, expenses)
+                for month, category, account, count, income, expenses in rows]
+
+    def find_duplicates(self, days: Iterable[Optional[int]], descriptions: Iterable[Any],
+                        amounts: Iterable[Any], accounts: Iterable[Any],
+                        window_days: int = 0) -> List[bool]:
+        """
+        Check which transactions match one that is already stored.
+
+        The stored days of every distinct fingerprint are fetched through the
+        fingerprint index in a few batched queries, then matched in memory.
+
+        Args:
+            days: Day numbers of the transactions (see fingerprint_index.date_to_day)
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts
+            accounts: Source accounts
+            window_days: Maximum difference in days for a match (0 for the same day)
+
+        Returns:
+            List[bool]: True for each transaction that duplicates a stored one
+        """
+        probes: List[Tuple[Optional[int], Optional[int]]] = []
+        for day, description, amount, account in zip(days, descriptions, amounts, accounts):
+            cents = amount_to_cents(amount)
+            if day is None or cents is None:
+                probes.append((None, None))
+            else:
+                probes.append((fingerprint(description, account, cents), day))
+
+        keys = list({key for key, _ in probes if key is not None})
+        stored: Dict[int, List[int]] = {}
+        for start in range(0, len(keys), LOOKUP_SIZE):
+            chunk = keys[start:start + LOOKUP_SIZE]
+            rows = self._query(f"SELECT fingerprint, day FROM transactions WHERE fingerprint IN "
+                               f"({', '.join('?' * len(chunk))}) AND day IS NOT NULL", tuple(chunk))
+            for key, day in rows:
+                stored.setdefault(key, []).append(day)
+
+        return [key is not None and any(abs(recorded - day) <= window_days
+                                        for recorded in stored.get(key, ()))
+                for key, day in probes]
+
+    def clear(self) -> None:
+        """
+        Remove all transactions and batches.
+        """
+        with self.database.transaction() as session:
+            session.execute("DELETE FROM transactions")
+            session.execute("DELETE FROM import_batches")
+            session.execute("DELETE FROM monthly_rollups")
+        with self._search_lock:
+            self.search_index.clear()
+
+    def close(self) -> None:
+        """
+        Close the pooled database connections.
+        """
+        self.database.close()
@@ -4,16 +4,39 @@ transaction.py - Transaction Model for Muzzy Tracker
 This module defines the Transaction class, which represents a financial transaction
 in the Muzzy Tracker application. It includes methods for validation, categorization,
 and data manipulation.
+
+Large histories are kept compact: Transaction uses __slots__, and imported batches
+can be stored column by column in TransactionColumns, which builds lightweight
+Transaction row views on demand.
 """
 
+import os
+import bisect
+import heapq
+import itertools
+import threading
+from array import array
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Iterator, Iterable, Set, Tuple, Union
+
+from app.models.fingerprint_index import FingerprintIndex, date_to_day
+from app.models.rollups import MonthlyRollups
+from app.models.search_index import SearchIndex
+
+# Candidates copied out per write-lock hold when TransactionStore.query_transactions
+# walks past its first chunk
+QUERY_CHUNK_SIZE = 1000
 
 class Transaction:
     """
     Represents a financial transaction in the Muzzy Tracker application.
     """
     
+    __slots__ = ('id', 'date', 'description', 'amount', 'category', 'account',
+                 'notes', 'status', 'import_batch_id', 'import_date')
+    
     def __init__(self, 
                  transaction_id: str,
                  date: str,
@@ -140,6 +163,261 @@ class Transaction:
             return self.date
 
 
+@lru_cache(maxsize=65536)
+def _parse_date(value: str) -> Optional[datetime]:
+    """
+    Parse a YYYY-MM-DD date string, caching results since dates repeat heavily.
+    
+    Args:
+        value: Date string
+        
+    Returns:
+        datetime: The parsed date, or None if the value is not a valid date
+    """
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+class _DictionaryColumn:
+    """
+    Dictionary-encoded column for repeated values such as dates, categories and accounts.
+    
+    Each distinct value is stored once and rows hold a 4-byte code into the value list.
+    """
+    
+    __slots__ = ('values', 'codes', '_lookup')
+    
+    def __init__(self, values: Iterable[Any] = ()):
+        """
+        Initialize the column.
+        
+        Args:
+            values: Initial values
+        """
+        self.values: List[Any] = []
+        self.codes = array('I')
+        self._lookup: Dict[Any, int] = {}
+        self.extend(values)
+    
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the column.
+        
+        Args:
+            value: The value to append
+        """
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+    
+    def extend(self, values: Iterable[Any]) -> None:
+        """
+        Append several values to the column.
+        
+        Args:
+            values: The values to append
+        """
+        lookup = self._lookup
+        distinct = self.values
+        codes = []
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(distinct)
+                distinct.append(value)
+            codes.append(code)
+        self.codes.extend(codes)
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def __getitem__(self, index: int) -> Any:
+        return self.values[self.codes[index]]
+    
+    def __iter__(self) -> Iterator[Any]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+class TransactionColumns(Sequence):
+    """
+    Columnar storage for a sequence of transactions.
+    
+    Amounts are kept in a typed float array, repeated strings (dates, descriptions,
+    categories, accounts, batch IDs) are dictionary-encoded, and only transaction
+    IDs are stored per row. Indexing or iterating yields Transaction row views that
+    are built on demand, so the storage itself holds no per-row objects.
+    
+    Missing amounts are stored as NaN.
+    """
+    
+    # Transaction fields in to_dict order
+    FIELDS = ('id', 'date', 'description', 'amount', 'category', 'account',
+              'notes', 'status', 'import_batch_id', 'import_date')
+    
+    # Fields stored as dictionary-encoded columns
+    ENCODED_FIELDS = ('date', 'description', 'category', 'account',
+                      'notes', 'status', 'import_batch_id', 'import_date')
+    
+    def __init__(self):
+        """
+        Initialize empty columns.
+        """
+        self.ids: List[str] = []
+        self.amounts = array('d')
+        self.encoded: Dict[str, _DictionaryColumn] = {field: _DictionaryColumn() for field in self.ENCODED_FIELDS}
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any], length: Optional[int] = None) -> 'TransactionColumns':
+        """
+        Build columnar storage from per-field value sequences.
+        
+        A field may be given as a sequence with one value per row or as a single
+        scalar shared by every row. Missing fields get the Transaction defaults.
+        
+        Args:
+            columns: Mapping from Transaction field name to values
+            length: Number of rows (taken from the 'id' column if None)
+            
+        Returns:
+            TransactionColumns: The columnar transactions
+        """
+        result = cls()
+        ids = list(columns['id'])
+        if length is None:
+            length = len(ids)
+        result.ids = ids
+        
+        amounts = columns.get('amount')
+        if amounts is None or isinstance(amounts, (int, float)):
+            amount = float('nan') if amounts is None else float(amounts)
+            result.amounts = array('d', [amount]) * length
+        elif hasattr(amounts, 'tobytes') and getattr(amounts, 'dtype', None) == 'float64':
+            # Float64 arrays (e.g. from NumPy) are copied as raw bytes
+            result.amounts.frombytes(amounts.tobytes())
+        else:
+            result.amounts = array('d', (float('nan') if a is None else a for a in amounts))
+        
+        for field in cls.ENCODED_FIELDS:
+            values = columns.get(field, 'cleared' if field == 'status' else None)
+            column = result.encoded[field]
+            if values is None or isinstance(values, str):
+                # A shared scalar is encoded once and repeated
+                column.append(values)
+                column.codes = array('I', [0]) * length
+            else:
+                column.extend(values)
+        
+        return result
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> 'TransactionColumns':
+        """
+        Build columnar storage from Transaction objects.
+        
+        Args:
+            transactions: Transactions to store
+            
+        Returns:
+            TransactionColumns: The columnar transactions
+        """
+        result = cls()
+        result.extend(transactions)
+        return result
+    
+    def append(self, transaction: Transaction) -> None:
+        """
+        Append a transaction.
+        
+        Args:
+            transaction: Transaction object to append
+        """
+        self.ids.append(transaction.id)
+        self.amounts.append(float('nan') if transaction.amount is None else transaction.amount)
+        for field in self.ENCODED_FIELDS:
+            self.encoded[field].append(getattr(transaction, field))
+    
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Append several transactions.
+        
+        Args:
+            transactions: Transaction objects to append
+        """
+        for transaction in transactions:
+            self.append(transaction)
+    
+    def extend_columns(self, other: 'TransactionColumns') -> None:
+        """
+        Append every row of another TransactionColumns without building row views.
+        
+        Args:
+            other: The columns to append
+        """
+        self.ids.extend(other.ids)
+        self.amounts.extend(other.amounts)
+        for field in self.ENCODED_FIELDS:
+            column = self.encoded[field]
+            source = other.encoded[field]
+            
+            # Translate the other column's codes into this column's dictionary
+            before = len(column)
+            column.extend(source.values)
+            translation = column.codes[before:]
+            del column.codes[before:]
+            column.codes.extend(translation[code] for code in source.codes)
+    
+    def column(self, field: str) -> Sequence:
+        """
+        Get the stored values of one field without building row views.
+        
+        Args:
+            field: Transaction field name
+            
+        Returns:
+            Sequence: The field values in row order
+        """
+        if field == 'id':
+            return self.ids
+        if field == 'amount':
+            return self.amounts
+        return self.encoded[field]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        
+        encoded = self.encoded
+        return Transaction(
+            self.ids[index],
+            encoded['date'][index],
+            encoded['description'][index],
+            self.amounts[index],
+            encoded['category'][index],
+            encoded['account'][index],
+            encoded['notes'][index],
+            encoded['status'][index],
+            encoded['import_batch_id'][index],
+            encoded['import_date'][index]
+        )
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        encoded = self.encoded
+        for row in zip(self.ids, encoded['date'], encoded['description'], self.amounts,
+                       encoded['category'], encoded['account'], encoded['notes'],
+                       encoded['status'], encoded['import_batch_id'], encoded['import_date']):
+            yield Transaction(*row)
+
+
 class TransactionBatch:
     """
     Represents a batch of transactions imported together.
@@ -151,12 +429,138 @@ class TransactionBatch:
         
         Args:
             batch_id: Unique identifier for the batch
-            transactions: List of Transaction objects in the batch
+            transactions: List of Transaction objects in the batch, or TransactionColumns
             import_date: Date when the batch was imported
         """
         self.id = batch_id
         self.transactions = transactions
         self.import_date = import_date
+        
+        # Aggregates are computed once here and kept current by append()
+        self._income = 0
+        self._expenses = 0
+        self._min_date: Optional[datetime] = None
+        self._max_date: Optional[datetime] = None
+        if isinstance(transactions, TransactionColumns):
+            self._aggregate_columns(transactions)
+        else:
+            for transaction in transactions:
+                self._accumulate(transaction.amount, transaction.date)
+    
+    def _accumulate(self, amount: Optional[float], date: Any) -> None:
+        """
+        Fold one transaction into the cached aggregates.
+        
+        Args:
+            amount: Transaction amount
+            date: Transaction date (YYYY-MM-DD)
+        """
+        if amount is not None:
+            if amount > 0:
+                self._income += amount
+            elif amount < 0:
+                self._expenses += amount
+        self._accumulate_date(date)
+    
+    def _accumulate_date(self, date: Any) -> None:
+        """
+        Fold one date into the cached date range. Invalid dates are ignored.
+        
+        Args:
+            date: Transaction date (YYYY-MM-DD)
+        """
+        parsed = _parse_date(date) if isinstance(date, str) else None
+        if parsed is None:
+            return
+        if self._min_date is None or parsed < self._min_date:
+            self._min_date = parsed
+        if self._max_date is None or parsed > self._max_date:
+            self._max_date = parsed
+    
+    def _aggregate_columns(self, columns: TransactionColumns) -> None:
+        """
+        Compute the cached aggregates straight from columnar storage.
+        
+        Args:
+            columns: The columnar transactions
+        """
+        for amount in columns.amounts:
+            if amount > 0:
+                self._income += amount
+            elif amount < 0:
+                self._expenses += amount
+        
+        # Every distinct date is used by at least one row, so only those need parsing
+        for date in columns.column('date').values:
+            self._accumulate_date(date)
+    
+    def append(self, transaction: Transaction) -> None:
+        """
+        Append a transaction to the batch and update the cached aggregates.
+        
+        Transactions should be appended before the batch is added to the store.
+        
+        Args:
+            transaction: Transaction object to append
+        """
+        self.transactions.append(transaction)
+        self._accumulate(transaction.amount, transaction.date)
+    
+    def extend(self, columns: TransactionColumns) -> None:
+        """
+        Append columnar transactions to a columnar batch and update the cached aggregates.
+        
+        Transactions should be appended before the batch is added to the store.
+        
+        Args:
+            columns: The columnar transactions to append
+        """
+        self.transactions.extend_columns(columns)
+        self._aggregate_columns(columns)
+    
+    @classmethod
+    def from_columns(cls, batch_id: str, columns: Dict[str, Any], import_date: str) -> 'TransactionBatch':
+        """
+        Create a TransactionBatch backed by columnar storage.
+        
+        Args:
+            batch_id: Unique identifier for the batch
+            columns: Mapping from Transaction field name to values (see TransactionColumns.from_columns)
+            import_date: Date when the batch was imported
+            
+        Returns:
+            TransactionBatch: A new batch whose transactions are TransactionColumns
+        """
+        return cls(batch_id, TransactionColumns.from_columns(columns), import_date)
+    
+    @classmethod
+    def from_aggregates(cls, batch_id: str, transactions: Sequence, import_date: str,
+                        income: float, expenses: float,
+                        start_date: Optional[str], end_date: Optional[str]) -> 'TransactionBatch':
+        """
+        Create a TransactionBatch whose aggregates are already known, e.g. loaded from a database.
+        
+        The transactions are not scanned, so they may be a lazily loaded sequence.
+        
+        Args:
+            batch_id: Unique identifier for the batch
+            transactions: Sequence of the batch's transactions
+            import_date: Date when the batch was imported
+            income: Total income
+            expenses: Total expenses
+            start_date: First transaction date (YYYY-MM-DD), or None
+            end_date: Last transaction date (YYYY-MM-DD), or None
+            
+        Returns:
+            TransactionBatch: The batch
+        """
+        batch = cls(batch_id, [], import_date)
+        batch.transactions = transactions
+        batch._income = income
+        batch._expenses = expenses
+        batch._min_date = _parse_date(start_date) if start_date else None
+        batch._max_date = _parse_date(end_date) if end_date else None
+        return batch
     
     @property
     def total_transactions(self) -> int:
@@ -176,7 +580,7 @@ class TransactionBatch:
         Returns:
             float: Total income
         """
-        return sum(t.amount for t in self.transactions if t.is_income())
+        return self._income
     
     @property
     def total_expenses(self) -> float:
@@ -186,7 +590,7 @@ class TransactionBatch:
         Returns:
             float: Total expenses
         """
-        return sum(t.amount for t in self.transactions if t.is_expense())
+        return self._expenses
     
     @property
     def net_amount(self) -> float:
@@ -196,7 +600,7 @@ class TransactionBatch:
         Returns:
             float: Net amount
         """
-        return self.total_income + self.total_expenses
+        return self._income + self._expenses
     
     @property
     def date_range(self) -> Dict[str, str]:
@@ -206,14 +610,10 @@ class TransactionBatch:
         Returns:
             Dict[str, str]: Dictionary with 'start' and 'end' dates
         """
-        if not self.transactions:
+        if self._min_date is None:
             return {'start': None, 'end': None}
         
-        dates = [datetime.strptime(t.date, '%Y-%m-%d') for t in self.transactions]
-        min_date = min(dates).strftime('%Y-%m-%d')
-        max_date = max(dates).strftime('%Y-%m-%d')
-        
-        return {'start': min_date, 'end': max_date}
+        return {'start': self._min_date.strftime('%Y-%m-%d'), 'end': self._max_date.strftime('%Y-%m-%d')}
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -233,29 +633,640 @@ class TransactionBatch:
         }
 
 
-# In-memory storage for transactions (to be replaced with database in production)
-transactions_db = []
-transaction_batches_db = []
+class StoredTransactions(Sequence):
+    """
+    Read-only view of every transaction in a TransactionStore, in insertion order.
+    
+    The store keeps transactions in segments (plain lists for transactions added
+    one at a time, TransactionColumns for columnar batches); this view presents
+    them as one sequence.
+    """
+    
+    def __init__(self, store: 'TransactionStore'):
+        """
+        Initialize the view.
+        
+        Args:
+            store: The store to present
+        """
+        self._store = store
+    
+    def __len__(self) -> int:
+        return self._store._size
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        return self._store._get_at(index)
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        for segment in self._store._segments:
+            yield from segment
+
+
+class _DateIndex:
+    """
+    Transaction IDs ordered by (date, id), for range queries and keyset pages.
+    
+    Distinct dates are kept sorted, each with its transaction IDs kept sorted.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.dates: List[str] = []
+        self.ids_by_date: Dict[str, List[str]] = {}
+        self.size = 0
+    
+    def add(self, date: str, transaction_id: str) -> None:
+        """
+        Add a transaction.
+        
+        Args:
+            date: Date of the transaction (YYYY-MM-DD)
+            transaction_id: ID of the transaction
+        """
+        ids = self.ids_by_date.get(date)
+        if ids is None:
+            # Create the ID list before the date becomes visible in the sorted dates
+            ids = self.ids_by_date[date] = []
+            bisect.insort(self.dates, date)
+        if not ids or ids[-1] < transaction_id:
+            ids.append(transaction_id)
+        else:
+            bisect.insort(ids, transaction_id)
+        self.size += 1
+    
+    def keys(self, start_date: Optional[str], end_date: Optional[str], after: Optional[Tuple[str, str]],
+             descending: bool, count: int) -> List[Tuple[str, str]]:
+        """
+        Get the next keys of a keyset walk over a date range.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+            after: (date, id) key to resume after, or None to start at the first key
+            descending: Whether to walk from the newest key
+            count: Maximum number of keys to return
+        
+        Returns:
+            List[Tuple[str, str]]: Up to count (date, id) keys in walk order
+        """
+        # Narrow the dates to the requested range and the cursor
+        dates = self.dates
+        low = 0 if start_date is None else bisect.bisect_left(dates, start_date)
+        high = len(dates) if end_date is None else bisect.bisect_right(dates, end_date)
+        if after is not None:
+            if descending:
+                high = min(high, bisect.bisect_right(dates, after[0]))
+            else:
+                low = max(low, bisect.bisect_left(dates, after[0]))
+        
+        keys: List[Tuple[str, str]] = []
+        for date_index in (range(high - 1, low - 1, -1) if descending else range(low, high)):
+            date = dates[date_index]
+            ids = self.ids_by_date[date]
+            first, last = 0, len(ids)
+            if after is not None and date == after[0]:
+                # Resume within the cursor's date, right after the cursor's ID
+                if descending:
+                    last = bisect.bisect_left(ids, after[1])
+                else:
+                    first = bisect.bisect_right(ids, after[1])
+            
+            needed = count - len(keys)
+            if descending:
+                keys.extend((date, transaction_id) for transaction_id in reversed(ids[max(first, last - needed):last]))
+            else:
+                keys.extend((date, transaction_id) for transaction_id in ids[first:first + needed])
+            if len(keys) >= count:
+                break
+        return keys
+    
+    def clear(self) -> None:
+        """
+        Remove all transactions.
+        """
+        self.dates.clear()
+        self.ids_by_date.clear()
+        self.size = 0
+
+
+def _next_keys(indexes: List[_DateIndex], start_date: Optional[str], end_date: Optional[str],
+               after: Optional[Tuple[str, str]], descending: bool, count: int) -> List[Tuple[str, str]]:
+    """
+    Get the next keys of a keyset walk over the union of several date indexes.
+
+    Args:
+        indexes: Date indexes holding disjoint sets of transactions
+        start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+        end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+        after: (date, id) key to resume after, or None to start at the first key
+        descending: Whether to walk from the newest key
+        count: Maximum number of keys to return
+
+    Returns:
+        List[Tuple[str, str]]: Up to count (date, id) keys in walk order
+    """
+    if len(indexes) == 1:
+        return indexes[0].keys(start_date, end_date, after, descending, count)
+    runs = [index.keys(start_date, end_date, after, descending, count) for index in indexes]
+    return list(itertools.islice(heapq.merge(*runs, reverse=descending), count))
+
+
+class TransactionStore:
+    """
+    In-memory transaction storage with indexes for fast lookups.
+    
+    Transactions are kept in insertion order, with hash indexes by transaction ID,
+    batch ID and batch, date indexes ordered by (date, id) for range queries (one
+    over all transactions and one per category and per account), a fingerprint
+    index for duplicate detection, monthly rollups for dashboards and a full-text
+    index over descriptions and notes.
+    All indexes are maintained as transactions and batches are added. Indexes refer to row positions, so
+    columnar batches are never expanded into objects.
+    """
+    
+    def __init__(self):
+        """
+        Initialize an empty store.
+        """
+        self.transactions = StoredTransactions(self)
+        self.batches: List[TransactionBatch] = []
+        self._segments: List[Sequence] = []
+        self._offsets: List[int] = []
+        self._size = 0
+        self._by_id: Dict[str, int] = {}
+        self._by_batch_id: Dict[str, array] = {}
+        self._batch_by_id: Dict[str, TransactionBatch] = {}
+        
+        # Date indexes: all transactions, and the postings of each category and account
+        self._date_index = _DateIndex()
+        self._dates_by_category: Dict[str, _DateIndex] = {}
+        self._dates_by_account: Dict[str, _DateIndex] = {}
+        
+        # Fingerprints of every stored transaction, used to detect re-imports
+        self.fingerprints = FingerprintIndex()
+        
+        # Per-(month, category, account) counts and sums
+        self.rollups = MonthlyRollups()
+        
+        # Full-text index over descriptions and notes, keyed by store position
+        self.search_index = SearchIndex()
+        
+        # Writes may come from background import threads
+        self._write_lock = threading.RLock()
+    
+    def add_transaction(self, transaction: Transaction) -> None:
+        """
+        Add a single transaction and index it.
+        
+        Args:
+            transaction: Transaction object to add
+        """
+        with self._write_lock:
+            self._append_transaction(transaction)
+    
+    def _append_transaction(self, transaction: Transaction) -> None:
+        """
+        Add a single transaction without taking the write lock.
+        
+        Args:
+            transaction: Transaction object to add
+        """
+        # Single transactions share a trailing list segment owned by the store
+        if not self._segments or not isinstance(self._segments[-1], list):
+            self._offsets.append(self._size)
+            self._segments.append([])
+        self._segments[-1].append(transaction)
+        self._index_transaction(transaction, self._size)
+        self._size += 1
+    
+    def add_batch(self, batch: 'TransactionBatch') -> None:
+        """
+        Add a transaction batch and all of its transactions.
+        
+        Args:
+            batch: TransactionBatch object to add
+        """
+        with self._write_lock:
+            self.batches.append(batch)
+            self._batch_by_id.setdefault(batch.id, batch)
+            
+            if isinstance(batch.transactions, TransactionColumns):
+                self._add_columns(batch.transactions)
+            else:
+                for transaction in batch.transactions:
+                    self._append_transaction(transaction)
+    
+    def _add_columns(self, columns: TransactionColumns) -> None:
+        """
+        Add columnar transactions as their own segment and index them.
+        
+        Args:
+            columns: The columnar transactions
+        """
+        start = self._size
+        self._offsets.append(start)
+        self._segments.append(columns)
+        self._size += len(columns)
+        
+        for position, row in enumerate(zip(columns.ids, columns.column('date'), columns.column('import_batch_id'),
+                                           columns.column('category'), columns.column('account')), start):
+            self._index_fields(row[0], row[1], row[2], row[3], row[4], position)
+        self.fingerprints.add_many(columns.column('date'), columns.column('description'),
+                                   columns.amounts, columns.column('account'))
+        self.rollups.add_many(columns.column('date'), columns.amounts,
+                              columns.column('category'), columns.column('account'))
+        self.search_index.add_many(range(start, self._size), columns.column('description'),
+                                   columns.column('notes'))
+    
+    def _index_transaction(self, transaction: Transaction, position: int) -> None:
+        """
+        Add a transaction to the ID, batch, date, fingerprint, rollup and search indexes.
+        
+        Args:
+            transaction: Transaction object to index
+            position: Position of the transaction in the store
+        """
+        self._index_fields(transaction.id, transaction.date, transaction.import_batch_id,
+                           transaction.category, transaction.account, position)
+        self.fingerprints.add(date_to_day(transaction.date), transaction.description,
+                              transaction.amount, transaction.account)
+        self.rollups.add(transaction.date, transaction.amount, transaction.category, transaction.account)
+        self.search_index.add(position, transaction.description, transaction.notes)
+    
+    def _index_fields(self, transaction_id: str, date: Any, batch_id: Optional[str],
+                      category: Any, account: Any, position: int) -> None:
+        """
+        Add the ID, batch and date index entries of one transaction.
+        
+        Args:
+            transaction_id: ID of the transaction
+            date: Date of the transaction
+            batch_id: ID of the import batch
+            category: Category of the transaction
+            account: Source account
+            position: Position of the transaction in the store
+        """
+        positions = self._by_batch_id.get(batch_id)
+        if positions is None:
+            positions = self._by_batch_id[batch_id] = array('q')
+        positions.append(position)
+        
+        # Keep the first transaction for an ID, matching a front-to-back scan
+        if self._by_id.setdefault(transaction_id, position) != position:
+            return
+        
+        # Transactions without a valid date string cannot be range-queried
+        if not isinstance(date, str):
+            return
+        self._date_index.add(date, transaction_id)
+        for postings, value in ((self._dates_by_category, category), (self._dates_by_account, account)):
+            # Filters name categories and accounts, so missing values need no postings
+            if isinstance(value, str):
+                index = postings.get(value)
+                if index is None:
+                    index = postings[value] = _DateIndex()
+                index.add(date, transaction_id)
+    
+    def _get_at(self, position: int) -> Transaction:
+        """
+        Get the transaction at a store position.
+        
+        Args:
+            position: Position of the transaction
+            
+        Returns:
+            Transaction: The transaction (a row view for columnar segments)
+        """
+        segment_index = bisect.bisect_right(self._offsets, position) - 1
+        return self._segments[segment_index][position - self._offsets[segment_index]]
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        Get a transaction by its ID.
+        
+        Args:
+            transaction_id: ID of the transaction
+            
+        Returns:
+            Transaction: Transaction object if found, None otherwise
+        """
+        position = self._by_id.get(transaction_id)
+        return None if position is None else self._get_at(position)
+    
+    def get_transactions_by_batch(self, batch_id: str) -> List[Transaction]:
+        """
+        Get all transactions imported in a batch.
+        
+        Args:
+            batch_id: ID of the batch
+            
+        Returns:
+            List[Transaction]: Transactions in the batch
+        """
+        return [self._get_at(position) for position in self._by_batch_id.get(batch_id, ())]
+    
+    def get_transactions_by_date_range(self, start_date: Optional[str] = None,
+                                       end_date: Optional[str] = None) -> List[Transaction]:
+        """
+        Get transactions dated within a range, ordered by date.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+            
+        Returns:
+            List[Transaction]: Matching transactions ordered by date and ID
+        """
+        # Background imports add to the date index, so read it under the write lock
+        with self._write_lock:
+            dates = self._date_index.dates
+            low = 0 if start_date is None else bisect.bisect_left(dates, start_date)
+            high = len(dates) if end_date is None else bisect.bisect_right(dates, end_date)
+            
+            by_id = self._by_id
+            ids_by_date = self._date_index.ids_by_date
+            result = []
+            for date in dates[low:high]:
+                result.extend(self._get_at(by_id[transaction_id]) for transaction_id in ids_by_date[date])
+            return result
+    
+    def get_batch(self, batch_id: str) -> Optional['TransactionBatch']:
+        """
+        Get a transaction batch by its ID.
+        
+        Args:
+            batch_id: ID of the batch
+            
+        Returns:
+            TransactionBatch: TransactionBatch object if found, None otherwise
+        """
+        return self._batch_by_id.get(batch_id)
+    
+    def query_transactions(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           categories: Optional[Iterable[str]] = None,
+                           accounts: Optional[Iterable[str]] = None,
+                           min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                           text: Optional[str] = None, after: Optional[Tuple[str, str]] = None,
+                           limit: int = 50, descending: bool = False) -> List[Transaction]:
+        """
+        Get one page of filtered transactions ordered by (date, id), using keyset pagination.
+        
+        Candidates are walked in (date, id) order from the smallest applicable
+        index: the postings of the requested categories, the postings of the
+        requested accounts, the transactions matching the text, or else all
+        transactions. The walk starts right after the cursor, so skipping earlier
+        pages costs nothing; the other filters, including the amount bounds, are
+        checked per candidate, so a page that they thin out walks more candidates.
+        A text filter first collects every matching transaction from the search
+        index. Candidates are copied out in chunks under the write lock and
+        filtered after it is released. Transactions without a valid date are not
+        included.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+            categories: Categories to include, or None for all
+            accounts: Accounts to include, or None for all
+            min_amount: Smallest amount to include, or None
+            max_amount: Largest amount to include, or None
+            text: Search terms that must each match the start of a word in the description or notes, or None
+            after: (date, id) of the last transaction of the previous page, or None for the first page
+            limit: Maximum number of transactions to return
+            descending: Whether to return the newest transactions first
+            
+        Returns:
+            List[Transaction]: Up to limit matching transactions
+        """
+        categories = set(categories) if categories else None
+        accounts = set(accounts) if accounts else None
+        
+        # Background imports add to the indexes, so read them under the write lock
+        with self._write_lock:
+            text_positions, text_index = self._match_text(text) if text else (None, None)
+            walked, indexes = self._query_source(categories, accounts, text_index)
+        
+        result: List[Transaction] = []
+        chunk_size = limit
+        while True:
+            with self._write_lock:
+                keys = _next_keys(indexes, start_date, end_date, after, descending, chunk_size)
+                candidates = [(position, self._get_at(position))
+                              for position in [self._by_id[key[1]] for key in keys]]
+            
+            for position, transaction in candidates:
+                if categories is not None and walked != 'category' and transaction.category not in categories:
+                    continue
+                if accounts is not None and walked != 'account' and transaction.account not in accounts:
+                    continue
+                if text_positions is not None and walked != 'text' and position not in text_positions:
+                    continue
+                amount = transaction.amount
+                if min_amount is not None and not (amount is not None and amount >= min_amount):
+                    continue
+                if max_amount is not None and not (amount is not None and amount <= max_amount):
+                    continue
+                
+                result.append(transaction)
+                if len(result) >= limit:
+                    return result
+            
+            if len(keys) < chunk_size:
+                return result
+            after = keys[-1]
+            chunk_size = max(limit, QUERY_CHUNK_SIZE)
+    
+    def _match_text(self, text: str) -> Tuple[Set[int], _DateIndex]:
+        """
+        Find the transactions matching a text filter, without taking the write lock.
+        
+        Args:
+            text: Search terms that must each match the start of a word in the description or notes
+            
+        Returns:
+            Tuple[Set[int], _DateIndex]: Positions of the matching transactions, and a date index over them
+        """
+        positions = set()
+        keys = []
+        for position in self.search_index.match_docs(text):
+            transaction = self._get_at(position)
+            # Only the transactions reachable through the date index can be returned
+            if self._by_id.get(transaction.id) == position and isinstance(transaction.date, str):
+                positions.add(position)
+                keys.append((transaction.date, transaction.id))
+        
+        index = _DateIndex()
+        for date, transaction_id in sorted(keys):
+            index.add(date, transaction_id)
+        return positions, index
+    
+    def _query_source(self, categories: Optional[Set[str]], accounts: Optional[Set[str]],
+                      text_index: Optional[_DateIndex]) -> Tuple[Optional[str], List[_DateIndex]]:
+        """
+        Pick the smallest index a query can walk, without taking the write lock.
+        
+        Args:
+            categories: Categories to include, or None for all
+            accounts: Accounts to include, or None for all
+            text_index: Date index over the transactions matching the text filter, or None
+            
+        Returns:
+            Tuple[Optional[str], List[_DateIndex]]: The filter answered by the walk ('category',
+                'account', 'text' or None), and the date indexes to walk
+        """
+        choices = []
+        if categories is not None:
+            choices.append(('category', [self._dates_by_category[category] for category in categories
+                                         if category in self._dates_by_category]))
+        if accounts is not None:
+            choices.append(('account', [self._dates_by_account[account] for account in accounts
+                                        if account in self._dates_by_account]))
+        if text_index is not None:
+            choices.append(('text', [text_index]))
+        if not choices:
+            return None, [self._date_index]
+        return min(choices, key=lambda choice: sum(index.size for index in choice[1]))
+    
+    def get_rollups(self, start_month: Optional[str] = None, end_month: Optional[str] = None,
+                    accounts: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get monthly rollup rows.
+        
+        Args:
+            start_month: First month to include (YYYY-MM), or None for no lower bound
+            end_month: Last month to include (YYYY-MM), or None for no upper bound
+            accounts: Accounts to include, or None for all
+            
+        Returns:
+            List[Dict[str, Any]]: Rows with month, category, account, count, income and expenses
+        """
+        return self.rollups.query(start_month, end_month, accounts)
+    
+    def search_transactions(self, query: str, limit: int = 50) -> Tuple[int, List[Transaction]]:
+        """
+        Search descriptions and notes, best matches first.
+        
+        Args:
+            query: The search text; every term must match the start of a word
+            limit: Maximum number of transactions to return
+            
+        Returns:
+            Tuple[int, List[Transaction]]: Number of matching transactions and the best ones
+        """
+        # Background imports add to the search index, so read it under the write lock
+        with self._write_lock:
+            total, positions = self.search_index.search(query, limit)
+            return total, [self._get_at(position) for position in positions]
+    
+    def find_duplicates(self, days: Iterable[Optional[int]], descriptions: Iterable[Any],
+                        amounts: Iterable[Any], accounts: Iterable[Any],
+                        window_days: int = 0) -> List[bool]:
+        """
+        Check which transactions match one that is already stored.
+        
+        Args:
+            days: Day numbers of the transactions (see fingerprint_index.date_to_day)
+            descriptions: Transaction descriptions
+            amounts: Transaction amounts
+            accounts: Source accounts
+            window_days: Maximum difference in days for a match (0 for the same day)
+            
+        Returns:
+            List[bool]: True for each transaction that duplicates a stored one
+        """
+        contains = self.fingerprints.contains
+        return [contains(day, description, amount, account, window_days)
+                for day, description, amount, account in zip(days, descriptions, amounts, accounts)]
+    
+    def clear(self) -> None:
+        """
+        Remove all transactions and batches.
+        """
+        with self._write_lock:
+            self._clear()
+    
+    def _clear(self) -> None:
+        """
+        Remove all transactions and batches without taking the write lock.
+        """
+        self.batches.clear()
+        self._segments.clear()
+        self._offsets.clear()
+        self._size = 0
+        self._by_id.clear()
+        self._by_batch_id.clear()
+        self._batch_by_id.clear()
+        self._date_index.clear()
+        self._dates_by_category.clear()
+        self._dates_by_account.clear()
+        self.fingerprints.clear()
+        self.rollups.clear()
+        self.search_index.clear()
+
+
+def create_transaction_store(backend: Optional[str] = None, path: Optional[str] = None):
+    """
+    Create a transaction store for the configured storage backend.
+    
+    Args:
+        backend: 'memory', 'sqlite' or 'mysql' (defaults to the TRANSACTION_STORE environment variable)
+        path: Database file for the SQLite backend (defaults to SQLITE_PATH)
+        
+    Returns:
+        The transaction store (TransactionStore or SQLTransactionStore)
+        
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or os.environ.get('TRANSACTION_STORE', 'memory')).lower()
+    if backend == 'memory':
+        return TransactionStore()
+    
+    from app.models.database import create_database
+    from app.models.sql_store import SQLTransactionStore
+    return SQLTransactionStore(create_database(backend, path))
+
+def set_transaction_store(store) -> None:
+    """
+    Replace the store used by the module-level functions.
+    
+    Args:
+        store: The transaction store to use
+    """
+    global transaction_store, transactions_db, transaction_batches_db
+    transaction_store = store
+    transactions_db = store.transactions
+    transaction_batches_db = store.batches
+
+# Storage for transactions: in memory by default, or a database when configured
+transaction_store = create_transaction_store()
+transactions_db = transaction_store.transactions
+transaction_batches_db = transaction_store.batches
 
 def add_transaction(transaction: Transaction) -> None:
     """
-    Add a transaction to the in-memory database.
+    Add a transaction to the transaction store.
     
     Args:
         transaction: Transaction object to add
     """
-    transactions_db.append(transaction)
+    transaction_store.add_transaction(transaction)
 
 def add_transaction_batch(batch: TransactionBatch) -> None:
     """
-    Add a transaction batch to the in-memory database.
+    Add a transaction batch to the transaction store.
     
     Args:
         batch: TransactionBatch object to add
     """
-    transaction_batches_db.append(batch)
-    for transaction in batch.transactions:
-        add_transaction(transaction)
+    transaction_store.add_batch(batch)
 
 def get_transaction_by_id(transaction_id: str) -> Optional[Transaction]:
     """
@@ -267,10 +1278,7 @@ def get_transaction_by_id(transaction_id: str) -> Optional[Transaction]:
     Returns:
         Transaction: Transaction object if found, None otherwise
     """
-    for transaction in transactions_db:
-        if transaction.id == transaction_id:
-            return transaction
-    return None
+    return transaction_store.get_transaction(transaction_id)
 
 def get_transactions_by_batch_id(batch_id: str) -> List[Transaction]:
     """
@@ -282,14 +1290,101 @@ def get_transactions_by_batch_id(batch_id: str) -> List[Transaction]:
     Returns:
         List[Transaction]: List of Transaction objects in the batch
     """
-    return [t for t in transactions_db if t.import_batch_id == batch_id]
+    return transaction_store.get_transactions_by_batch(batch_id)
+
+def get_transactions_by_date_range(start_date: Optional[str] = None,
+                                   end_date: Optional[str] = None) -> List[Transaction]:
+    """
+    Get all transactions dated within a range.
+    
+    Args:
+        start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+        end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+        
+    Returns:
+        List[Transaction]: List of Transaction objects ordered by date
+    """
+    return transaction_store.get_transactions_by_date_range(start_date, end_date)
+
+def find_duplicate_transactions(days: Iterable[Optional[int]], descriptions: Iterable[Any],
+                                amounts: Iterable[Any], accounts: Iterable[Any],
+                                window_days: int = 0) -> List[bool]:
+    """
+    Check which transactions match one that is already stored.
+    
+    Args:
+        days: Day numbers of the transactions (see fingerprint_index.date_to_day)
+        descriptions: Transaction descriptions
+        amounts: Transaction amounts
+        accounts: Source accounts
+        window_days: Maximum difference in days for a match (0 for the same day)
+        
+    Returns:
+        List[bool]: True for each transaction that duplicates a stored one
+    """
+    return transaction_store.find_duplicates(days, descriptions, amounts, accounts, window_days)
+
+def query_transactions(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       categories: Optional[Iterable[str]] = None,
+                       accounts: Optional[Iterable[str]] = None,
+                       min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+                       text: Optional[str] = None, after: Optional[Tuple[str, str]] = None,
+                       limit: int = 50, descending: bool = False) -> List[Transaction]:
+    """
+    Get one page of filtered transactions ordered by (date, id).
+    
+    Args:
+        start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+        end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+        categories: Categories to include, or None for all
+        accounts: Accounts to include, or None for all
+        min_amount: Smallest amount to include, or None
+        max_amount: Largest amount to include, or None
+        text: Search terms that must each match the start of a word in the description or notes, or None
+        after: (date, id) of the last transaction of the previous page, or None for the first page
+        limit: Maximum number of transactions to return
+        descending: Whether to return the newest transactions first
+        
+    Returns:
+        List[Transaction]: Up to limit matching transactions
+    """
+    return transaction_store.query_transactions(start_date, end_date, categories, accounts,
+                                                min_amount, max_amount, text, after, limit, descending)
+
+def search_transactions(query: str, limit: int = 50) -> Tuple[int, List[Transaction]]:
+    """
+    Search transaction descriptions and notes, best matches first.
+    
+    Args:
+        query: The search text; every term must match the start of a word
+        limit: Maximum number of transactions to return
+        
+    Returns:
+        Tuple[int, List[Transaction]]: Number of matching transactions and the best ones
+    """
+    return transaction_store.search_transactions(query, limit)
+
+def get_transaction_rollups(start_month: Optional[str] = None, end_month: Optional[str] = None,
+                            accounts: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get per-(month, category, account) transaction counts and sums.
+    
+    Args:
+        start_month: First month to include (YYYY-MM), or None for no lower bound
+        end_month: Last month to include (YYYY-MM), or None for no upper bound
+        accounts: Accounts to include, or None for all
+        
+    Returns:
+        List[Dict[str, Any]]: Rows with month, category, account, count, income and expenses
+    """
+    return transaction_store.get_rollups(start_month, end_month, accounts)
 
-def get_all_transactions() -> List[Transaction]:
+def get_all_transactions() -> Sequence:
     """
     Get all transactions.
     
     Returns:
-        List[Transaction]: List of all Transaction objects
+        Sequence[Transaction]: Read-only sequence of all Transaction objects
     """
     return transactions_db
 
@@ -303,16 +1398,13 @@ def get_transaction_batch_by_id(batch_id: str) -> Optional[TransactionBatch]:
     Returns:
         TransactionBatch: TransactionBatch object if found, None otherwise
     """
-    for batch in transaction_batches_db:
-        if batch.id == batch_id:
-            return batch
-    return None
+    return transaction_store.get_batch(batch_id)
 
-def get_all_transaction_batches() -> List[TransactionBatch]:
+def get_all_transaction_batches() -> Sequence:
     """
     Get all transaction batches.
     
     Returns:
-        List[TransactionBatch]: List of all TransactionBatch objects
+        Sequence[TransactionBatch]: Read-only sequence of all TransactionBatch objects
     """
     return transaction_batches_db
@@ -0,0 +1,342 @@
+"""
+category_matcher.py - Compiled Keyword Category Matcher for Muzzy Tracker
+
+This module provides a matcher that assigns transaction categories from
+description keywords. All keywords are compiled into a single trie-shaped
+regular expression, so a whole description column is categorized with one
+regex pass instead of one substring scan per keyword and row.
+
+The matcher keeps the semantics of a plain ordered scan: the first category
+(in definition order) with any keyword contained in the description wins.
+
+Bank exports repeat the same merchants many times, so CategoryCache memoizes
+normalized description -> category results and can persist them to a local
+file so new worker processes start warm.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Iterable
+
+import pandas as pd
+
+DEFAULT_CATEGORY = 'Other'
+
+
+def _build_trie_pattern(keywords: List[str]) -> str:
+    """
+    Build a regular expression that matches any of the keywords, shaped as a trie.
+
+    Sibling branches always start with different characters, so the regex
+    engine never retries the same prefix, and greedy optional groups make it
+    report the longest keyword that matches at a given position.
+
+    Args:
+        keywords: Keywords to match
+
+    Returns:
+        str: Regular expression source
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-keyword marker
+
+    def render(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Keywords may stop here, so the longer continuations are optional
+            body = body + '?' if len(branches) == 1 and len(branches[0]) == 1 else '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+class CategoryMatcher:
+    """
+    Categorizes descriptions with a single compiled pattern over all keywords.
+    """
+
+    def __init__(self, category_keywords: Dict[str, List[str]], default: str = DEFAULT_CATEGORY):
+        """
+        Compile the matcher.
+
+        Args:
+            category_keywords: Ordered mapping from category to its keywords
+            default: Category used when no keyword matches
+        """
+        self.categories = list(category_keywords)
+        self.default = default
+
+        # Rank of each keyword: the position of the first category that lists it
+        ranks: Dict[str, int] = {}
+        for rank, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword and keyword not in ranks:
+                    ranks[keyword] = rank
+
+        # The pattern reports the longest keyword starting at each position. Every
+        # shorter keyword that is a prefix of it matches there as well, so a match
+        # stands for the best rank among the keyword and its prefixes.
+        self._match_ranks = {
+            keyword: min(rank for other, rank in ranks.items() if keyword.startswith(other))
+            for keyword in ranks
+        }
+
+        # A zero-width lookahead finds matches at every position, including overlapping ones
+        self._pattern = re.compile('(?=(' + _build_trie_pattern(list(ranks)) + '))') if ranks else None
+
+    def _category_for(self, matches: Optional[List[str]]) -> str:
+        """
+        Pick the winning category for the keywords found in one description.
+
+        Args:
+            matches: Keywords found in the description
+
+        Returns:
+            str: The category
+        """
+        if not matches or not isinstance(matches, list):
+            return self.default
+        return self.categories[min(map(self._match_ranks.__getitem__, matches))]
+
+    def match(self, description: str) -> str:
+        """
+        Categorize a single description.
+
+        Args:
+            description: The transaction description
+
+        Returns:
+            str: The matched category, or the default category
+        """
+        if self._pattern is None:
+            return self.default
+        return self._category_for(self._pattern.findall(description.lower()))
+
+    def match_series(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Categorize a whole column of descriptions in one pass.
+
+        Args:
+            descriptions: Series of transaction descriptions
+
+        Returns:
+            pd.Series: Categories aligned with the input index
+        """
+        if self._pattern is None or descriptions.empty:
+            return pd.Series(self.default, index=descriptions.index, dtype=object)
+
+        found = descriptions.astype(str).str.lower().str.findall(self._pattern)
+        return pd.Series([self._category_for(matches) for matches in found],
+                         index=descriptions.index, dtype=object)
+
+
+def normalize_description(description: str) -> str:
+    """
+    Normalize a description for category lookups.
+
+    Keyword matching is case-insensitive and keywords never start or end with
+    whitespace, so lower-casing and stripping does not change the result.
+
+    Args:
+        description: The transaction description
+
+    Returns:
+        str: The normalized description
+    """
+    return description.strip().lower()
+
+
+class CategoryCache:
+    """
+    Bounded LRU cache from normalized description to category.
+
+    The cache can be persisted to a JSON file. The file records a fingerprint
+    of the category keywords (including their order, which decides ties) and
+    is ignored if the keywords have changed.
+    """
+
+    def __init__(self, category_keywords: Dict[str, List[str]], max_entries: int = 100000,
+                 path: Optional[str] = None, save_interval: float = 60.0):
+        """
+        Initialize the cache, loading persisted entries if a path is given.
+
+        Args:
+            category_keywords: Keywords the cached results were computed from
+            max_entries: Maximum number of cached descriptions
+            path: File used to persist the cache, or None to keep it in memory only
+            save_interval: Minimum number of seconds between automatic saves
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.save_interval = save_interval
+        self.fingerprint = hashlib.sha1(
+            json.dumps(list(category_keywords.items())).encode('utf-8')
+        ).hexdigest()
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, description: str) -> Optional[str]:
+        """
+        Get the cached category for a normalized description.
+
+        Args:
+            description: Normalized description
+
+        Returns:
+            str: The cached category, or None on a miss
+        """
+        with self._lock:
+            category = self._entries.get(description)
+            if category is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(description)
+            self.hits += 1
+            return category
+
+    def get_many(self, descriptions: Iterable[str]) -> Dict[str, str]:
+        """
+        Get cached categories for several normalized descriptions.
+
+        Args:
+            descriptions: Normalized descriptions
+
+        Returns:
+            Dict[str, str]: Categories for the descriptions that were cached
+        """
+        found = {}
+        with self._lock:
+            for description in descriptions:
+                category = self._entries.get(description)
+                if category is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(description)
+                self.hits += 1
+                found[description] = category
+        return found
+
+    def put_many(self, results: Dict[str, str]) -> None:
+        """
+        Cache categories for normalized descriptions, evicting the least recently used.
+
+        Args:
+            results: Mapping from normalized description to category
+        """
+        if not results:
+            return
+        with self._lock:
+            self._entries.update(results)
+            for description in results:
+                self._entries.move_to_end(description)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+        if self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def put(self, description: str, category: str) -> None:
+        """
+        Cache the category for a normalized description.
+
+        Args:
+            description: Normalized description
+            category: The category
+        """
+        self.put_many({description: category})
+
+    def load(self) -> None:
+        """
+        Load persisted entries, ignoring missing, unreadable or stale files.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('fingerprint') != self.fingerprint:
+            return
+
+        entries = data.get('entries', {})
+        with self._lock:
+            for description, category in list(entries.items())[-self.max_entries:]:
+                self._entries[description] = category
+
+    def save(self) -> None:
+        """
+        Persist the cache to its file, replacing it atomically.
+        """
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'fingerprint': self.fingerprint, 'entries': dict(self._entries)}
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            with self._lock:
+                self._dirty = True
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, int]: Entry count and hit/miss counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,505 @@
+"""
+columnar_cache.py - Columnar Upload Cache for Muzzy Tracker
+
+This module keeps a binary, column-oriented copy of each uploaded CSV file so
+wizard steps after the first read load typed columns from a memory-mapped file
+instead of parsing the CSV text again. The copy is written once, during the
+first full read of the upload, next to the CSV file.
+It includes:
+- Arrow IPC (Feather v2) files when pyarrow is installed
+- A fallback layout of raw memory-mapped column files (NumPy) otherwise
+- A JSON sidecar with the column dtypes, the sniffed CSV format and the
+  mapping settings chosen in the wizard
+- A lock file holding the converting process ID, so a copy left behind by a
+  crashed conversion is cleared instead of blocking the upload for good
+"""
+
+import json
+import logging
+import os
+import shutil
+from typing import Dict, Any, Optional, List, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Fall back to raw memory-mapped column files
+    pa = None
+
+# Layout used for new columnar copies
+COLUMNAR_FORMAT = 'arrow' if pa is not None else 'raw'
+
+# Separator between strings in raw string columns; uploads containing it are not converted
+_STRING_END = '\x00'
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarUnsupported(Exception):
+    """
+    Raised when an upload cannot be stored column-wise (its CSV is read directly instead).
+    """
+
+
+def _dtype_kind(dtype: Any) -> str:
+    """
+    Classify a column dtype for storage.
+
+    Args:
+        dtype: Column dtype
+
+    Returns:
+        str: 'number' for bool/int/float, 'string' for object and string dtypes
+
+    Raises:
+        ColumnarUnsupported: For any other dtype
+    """
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return 'number'
+    if pd.api.types.is_string_dtype(dtype):
+        return 'string'
+    raise ColumnarUnsupported(f"unsupported dtype {dtype}")
+
+
+def _conform(chunk: pd.DataFrame, columns: List[str], dtypes: List[Any]) -> pd.DataFrame:
+    """
+    Give a later chunk the dtypes inferred from the first one.
+
+    Args:
+        chunk: The chunk
+        columns: Column names of the first chunk
+        dtypes: Dtypes of the first chunk
+
+    Returns:
+        pd.DataFrame: The chunk with matching dtypes
+
+    Raises:
+        ColumnarUnsupported: If a column cannot be cast without changing its values,
+            so a whole-file read would have inferred a different dtype
+    """
+    if list(chunk.columns) != columns:
+        raise ColumnarUnsupported('columns differ between chunks')
+    for column, dtype in zip(columns, dtypes):
+        chunk_dtype = chunk[column].dtype
+        if chunk_dtype == dtype:
+            continue
+        if _dtype_kind(dtype) == 'string' or (_dtype_kind(chunk_dtype) == 'number'
+                                              and np.can_cast(chunk_dtype, dtype, 'safe')):
+            chunk[column] = chunk[column].astype(dtype)
+        else:
+            raise ColumnarUnsupported(f"column {column!r} changes dtype from {dtype} to {chunk_dtype}")
+    return chunk
+
+
+def _process_alive(pid: int) -> bool:
+    """
+    Check whether a process is running on this host.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        bool: True if the process exists (or its state cannot be checked)
+    """
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _nulls_to_nan(df: pd.DataFrame, string_columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Represent missing strings as NaN, the way pandas.read_csv does, instead of Arrow's None.
+
+    Args:
+        df: The frame to fix in place
+        string_columns: Names of its string columns
+
+    Returns:
+        pd.DataFrame: The frame
+    """
+    for column in string_columns:
+        series = df[column]
+        if series.hasnans:
+            df[column] = series.where(series.notna(), np.nan)
+    return df
+
+
+class _ArrowWriter:
+    """
+    Appends chunks to an Arrow IPC file.
+    """
+
+    def __init__(self, path: str, first: pd.DataFrame):
+        # Object columns are always strings, even when the first chunk has only missing values
+        self.schema = pa.schema([(column, pa.string() if _dtype_kind(dtype) == 'string'
+                                  else pa.from_numpy_dtype(dtype))
+                                 for column, dtype in first.dtypes.items()])
+        self._writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        self._writer.write_table(pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _RawWriter:
+    """
+    Appends chunks to one raw file per column.
+
+    Number columns are stored as their binary values. String columns are
+    stored as UTF-8 text with each value terminated by a NUL, plus an array
+    of end offsets and a null mask, so any row range can be decoded with a
+    single decode and split.
+    """
+
+    def __init__(self, path: str, first: pd.DataFrame):
+        os.makedirs(path)
+        self.kinds = [_dtype_kind(dtype) for dtype in first.dtypes]
+        self._files = []
+        for i, kind in enumerate(self.kinds):
+            names = ['data'] if kind == 'number' else ['data', 'offsets', 'nulls']
+            self._files.append({name: open(os.path.join(path, f"{i}.{name}"), 'wb') for name in names})
+        self._string_bytes = [0] * len(self.kinds)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        for i, (kind, files) in enumerate(zip(self.kinds, self._files)):
+            series = chunk.iloc[:, i]
+            if kind == 'number':
+                files['data'].write(np.ascontiguousarray(series.to_numpy()).tobytes())
+                continue
+
+            nulls = series.isna().to_numpy()
+            values = series.where(~nulls, '').astype(str).tolist()
+            text = _STRING_END.join(values) + _STRING_END
+            data = text.encode('utf-8')
+            if text.count(_STRING_END) != len(values):
+                raise ColumnarUnsupported('text contains NUL characters')
+            if len(data) == len(text):
+                # ASCII text: character lengths are byte lengths
+                lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+            else:
+                lengths = np.fromiter((len(value.encode('utf-8')) for value in values),
+                                      dtype=np.int64, count=len(values))
+            ends = np.cumsum(lengths + 1)
+            files['data'].write(data)
+            files['offsets'].write((ends + self._string_bytes[i]).tobytes())
+            files['nulls'].write(nulls.tobytes())
+            self._string_bytes[i] += len(data)
+
+    def close(self) -> None:
+        for files in self._files:
+            for f in files.values():
+                f.close()
+
+
+class ColumnarUpload:
+    """
+    Binary columnar copy of an uploaded CSV file, stored next to it.
+
+    For an upload saved as ``<id>.csv`` the copy is ``<id>.arrow`` (or the
+    ``<id>.cols`` directory) and the sidecar is ``<id>.meta.json``. A copy
+    only counts as present once its sidecar has been written. While a copy is
+    written, ``<id>.lock`` holds the ID of the writing process.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Locate the columnar copy of an upload.
+
+        Args:
+            file_path: Path to the uploaded CSV file
+        """
+        base = os.path.splitext(file_path)[0]
+        self.meta_path = base + '.meta.json'
+        self.lock_path = base + '.lock'
+        self.paths = {'arrow': base + '.arrow', 'raw': base + '.cols'}
+        self._meta: Optional[Dict[str, Any]] = None
+
+    @property
+    def meta(self) -> Optional[Dict[str, Any]]:
+        """
+        The sidecar contents, or None if there is no sidecar.
+        """
+        if self._meta is None and os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self._meta = json.load(f)
+        return self._meta
+
+    def exists(self) -> bool:
+        """
+        Check whether a complete columnar copy is present.
+
+        Returns:
+            bool: True if the copy can be read
+        """
+        meta = self.meta
+        if meta is None or meta.get('rows') is None:
+            return False
+        # Arrow copies need pyarrow to be read back
+        return meta['format'] == 'raw' or pa is not None
+
+    def update_meta(self, **fields: Any) -> None:
+        """
+        Store extra fields (such as the CSV format or mapping settings) in the sidecar.
+
+        Args:
+            **fields: JSON-serializable values to store
+        """
+        # Re-read the sidecar so fields written through other instances are kept
+        self._meta = None
+        meta = dict(self.meta or {})
+        meta.update(fields)
+        self._write_meta(meta)
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        # Write atomically so readers never see a partial sidecar
+        temp_path = self.meta_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.meta_path)
+        self._meta = meta
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Store chunks of the upload as they pass through.
+
+        Chunks are yielded unchanged, except that later chunks are cast to the
+        dtypes of the first. The copy is only completed if every chunk is
+        consumed; otherwise, or if the data cannot be stored column-wise, the
+        partial copy is removed and the chunks keep flowing from the CSV. No
+        copy is written while another live process is writing one.
+
+        Args:
+            chunks: Chunks read from the CSV file
+
+        Yields:
+            pd.DataFrame: The same chunks
+        """
+        writer = None
+        locked = False
+        columns: List[str] = []
+        dtypes: List[Any] = []
+        rows = 0
+        completed = False
+        try:
+            for chunk in chunks:
+                if writer is None and not columns:
+                    columns, dtypes = list(chunk.columns), list(chunk.dtypes)
+                    try:
+                        locked = self._lock()
+                        if locked:
+                            writer = self._open_writer(chunk)
+                    except (ColumnarUnsupported, OSError) as e:
+                        logger.info("Skipping columnar copy of %s: %s", self.meta_path, e)
+                        writer = None
+                if writer is not None:
+                    try:
+                        chunk = _conform(chunk, columns, dtypes)
+                        writer.write(chunk)
+                        rows += len(chunk)
+                    except (ColumnarUnsupported, OSError, ValueError, TypeError) as e:
+                        logger.info("Skipping columnar copy of %s: %s", self.meta_path, e)
+                        writer.close()
+                        writer = None
+                        self._remove_data()
+                yield chunk
+            completed = True
+        finally:
+            if writer is not None:
+                writer.close()
+                if completed and columns:
+                    self.update_meta(format=COLUMNAR_FORMAT, rows=rows, columns=columns,
+                                     dtypes=[str(dtype) for dtype in dtypes],
+                                     kinds=[_dtype_kind(dtype) for dtype in dtypes])
+                else:
+                    self._remove_data()
+            if locked:
+                self._unlock()
+
+    def _lock(self) -> bool:
+        """
+        Claim the conversion of the upload, clearing what a dead conversion left behind.
+
+        Returns:
+            bool: True if the claim was taken, False if a live process holds it
+                or a complete copy appeared meanwhile
+        """
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(self.lock_path, 'r', encoding='ascii', errors='replace') as f:
+                        text = f.read().strip()
+                except FileNotFoundError:
+                    continue
+                # An empty lock file belongs to an owner that has not written its ID yet
+                owner = int(text) if text.isdigit() else None
+                if owner is None or owner == os.getpid() or _process_alive(owner):
+                    logger.info("Skipping columnar copy of %s: conversion in progress (pid %s)",
+                                self.meta_path, owner)
+                    return False
+                logger.warning("Removing columnar copy of %s left by dead process %s", self.meta_path, owner)
+                try:
+                    os.remove(self.lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'w', encoding='ascii') as f:
+                f.write(str(os.getpid()))
+            break
+
+        self._meta = None
+        if self.exists():
+            self._unlock()
+            return False
+        # Data without a completed sidecar is left from a conversion that never finished
+        self._remove_data()
+        return True
+
+    def _unlock(self) -> None:
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """
+        Store a whole upload read in one piece.
+
+        Args:
+            df: The parsed upload
+        """
+        for _ in self.write_chunks([df]):
+            pass
+
+    def _open_writer(self, first: pd.DataFrame):
+        for dtype in first.dtypes:
+            _dtype_kind(dtype)
+        if not all(isinstance(column, str) for column in first.columns):
+            raise ColumnarUnsupported('column names must be strings')
+        if COLUMNAR_FORMAT == 'arrow':
+            return _ArrowWriter(self.paths['arrow'], first)
+        return _RawWriter(self.paths['raw'], first)
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read a range of rows from the memory-mapped copy.
+
+        Number columns share memory with the mapped file where possible, so
+        they are read-only: pandas raises on writes into them, and callers
+        replace such a column (df[column] = ...) instead, which leaves the
+        mapped data alone. Data is still copied in these cases:
+        - Raw copies: number columns are the memory-mapped slice itself; string
+          columns are decoded from their byte range into new Python strings.
+        - Arrow copies: only the record batches overlapping the range are read.
+          A number column without missing values is shared when the range lies
+          within one batch (one batch is written per chunk, so reads aligned to
+          the chunk size are shared); ranges spanning batches are concatenated,
+          columns with missing values are copied to fill in NaN, and string
+          columns are converted into new Python strings.
+        - Both: string columns with a pandas string dtype are converted again.
+
+        Args:
+            start: First row
+            stop: Row after the last one, or None for the end
+
+        Returns:
+            pd.DataFrame: The rows, indexed by their row numbers like pandas.read_csv
+        """
+        meta = self.meta
+        stop = meta['rows'] if stop is None else min(stop, meta['rows'])
+        start = min(start, stop)
+        if meta['format'] == 'arrow':
+            df = self._read_arrow(start, stop)
+            string_columns = [column for column, kind in zip(meta['columns'], meta['kinds']) if kind == 'string']
+            _nulls_to_nan(df, string_columns)
+        else:
+            df = pd.DataFrame({column: self._read_raw(i, dtype, kind, start, stop)
+                               for i, (column, dtype, kind)
+                               in enumerate(zip(meta['columns'], meta['dtypes'], meta['kinds']))},
+                              columns=meta['columns'], copy=False)
+        df.index = pd.RangeIndex(start, stop)
+        for column, dtype, kind in zip(meta['columns'], meta['dtypes'], meta['kinds']):
+            if kind == 'string' and dtype != 'object':
+                # Restore pandas string dtypes
+                df[column] = df[column].astype(dtype)
+        return df
+
+    def _read_arrow(self, start: int, stop: int) -> pd.DataFrame:
+        with pa.memory_map(self.paths['arrow']) as source:
+            reader = pa.ipc.open_file(source)
+            batches = []
+            offset = 0
+            for i in range(reader.num_record_batches):
+                if offset >= stop:
+                    break
+                # Batches are mapped, not read, so skipping one only reads its metadata
+                batch = reader.get_batch(i)
+                end = offset + batch.num_rows
+                if end > start:
+                    first = max(start, offset)
+                    batches.append(batch.slice(first - offset, min(stop, end) - first))
+                offset = end
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            del batches
+            # Columns are kept in separate blocks, so shared buffers are not consolidated into copies
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def _read_raw(self, i: int, dtype: str, kind: str, start: int, stop: int) -> np.ndarray:
+        path = os.path.join(self.paths['raw'], str(i))
+        if start == stop:
+            return np.empty(0, dtype=dtype if kind == 'number' else object)
+        if kind == 'number':
+            # A read-only view of the mapped file
+            return np.memmap(path + '.data', dtype=dtype, mode='r')[start:stop]
+
+        ends = np.memmap(path + '.offsets', dtype=np.int64, mode='r')
+        first_byte = int(ends[start - 1]) if start else 0
+        with open(path + '.data', 'rb') as f:
+            f.seek(first_byte)
+            text = f.read(int(ends[stop - 1]) - first_byte).decode('utf-8')
+        values = np.array(text.split(_STRING_END)[:-1], dtype=object)
+        nulls = np.fromfile(path + '.nulls', dtype=np.bool_, count=stop - start, offset=start)
+        values[nulls] = np.nan
+        return values
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Read the copy as a sequence of fixed-size chunks.
+
+        Args:
+            chunk_size: Number of rows per chunk
+
+        Yields:
+            pd.DataFrame: The chunks, with a running row index
+        """
+        rows = self.meta['rows']
+        for start in range(0, rows, chunk_size):
+            yield self.read(start, start + chunk_size)
+
+    def _remove_data(self) -> None:
+        if os.path.isdir(self.paths['raw']):
+            shutil.rmtree(self.paths['raw'], ignore_errors=True)
+        if os.path.exists(self.paths['arrow']):
+            os.remove(self.paths['arrow'])
+
+    def remove(self) -> None:
+        """
+        Delete the copy, its sidecar and its lock file.
+        """
+        self._remove_data()
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+        self._unlock()
+        self._meta = None
@@ -8,14 +8,31 @@ It includes:
 - Date format detection and conversion
 - Transaction categorization
 - Duplicate detection
+- Streaming uploads with early format sniffing
+- A columnar copy of each upload, so later wizard steps skip CSV parsing
 """
 
 import os
+import atexit
+import logging
+import numpy as np
 import pandas as pd
 import uuid
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, Any, Iterator
+
+from app.services.category_matcher import CategoryMatcher, CategoryCache, normalize_description
+from app.services.import_cache import import_session_cache, get_upload_id
+from app.services.columnar_cache import ColumnarUpload
+from app.services.upload_service import UploadWriter, UPLOAD_CHUNK_SIZE, sniff_csv_format, read_options
+from app.services.metrics import instrument_stage
+from app.services.serialization import frame_records
+from app.models.fingerprint_index import date_to_day
+from app.models.transaction import find_duplicate_transactions
+
+logger = logging.getLogger(__name__)
 
 # Define common date formats for automatic detection
 DATE_FORMATS = [
@@ -67,9 +84,352 @@ CATEGORY_KEYWORDS = {
     'Transfer': ['transfer', 'zelle', 'venmo', 'paypal', 'cash app', 'wire', 'ach', 'withdrawal', 'deposit']
 }
 
+@lru_cache(maxsize=1)
+def get_category_matcher() -> CategoryMatcher:
+    """
+    Get the compiled category matcher, built once per process.
+    
+    Returns:
+        CategoryMatcher: Matcher over CATEGORY_KEYWORDS
+    """
+    return CategoryMatcher(CATEGORY_KEYWORDS)
+
+# Process-wide memo of normalized description -> category. Set CATEGORY_CACHE_PATH
+# to persist it so new worker processes start with a warm cache.
+category_cache = CategoryCache(
+    CATEGORY_KEYWORDS,
+    max_entries=int(os.environ.get('CATEGORY_CACHE_SIZE', 100000)),
+    path=os.environ.get('CATEGORY_CACHE_PATH') or None
+)
+atexit.register(category_cache.save)
+
+# Files larger than this are imported in chunks instead of being loaded whole
+STREAMING_THRESHOLD_BYTES = int(os.environ.get('IMPORT_STREAMING_THRESHOLD', 50 * 1024 * 1024))  # 50 MB
+
+# Number of rows sampled when inferring the date format of a column
+DATE_SAMPLE_SIZE = 1000
+
+# Number of rows per chunk when streaming an import
+DEFAULT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 50000))
+
+# Number of affected row indices included in each validation issue; the full
+# list is fetched page by page with CSVService.get_issue_rows
+MAX_ISSUE_SAMPLE_ROWS = int(os.environ.get('IMPORT_ISSUE_SAMPLE_ROWS', 100))
+
+# Largest page of affected row indices returned by CSVService.get_issue_rows
+MAX_ISSUE_PAGE_SIZE = 10000
+
+# Amounts above this absolute value are flagged during validation
+LARGE_AMOUNT_THRESHOLD = 5000  # $5,000
+
+# Transactions within this many days of a stored one with the same fingerprint count as duplicates
+DUPLICATE_WINDOW_DAYS = int(os.environ.get('DUPLICATE_WINDOW_DAYS', 0))
+
+# Day number of 1970-01-01, used to convert datetime columns to day numbers
+EPOCH_DAY = 719163
+
+# Message templates for validation issues that carry a row count
+ISSUE_MESSAGES = {
+    'invalid_dates': "Found {count} transactions with invalid dates",
+    'future_dates': "Found {count} transactions dated in the future",
+    'non_numeric_amounts': "Found {count} transactions with missing or non-numeric amounts",
+    'missing_categories': "Found {count} transactions with missing categories",
+    'large_amounts': f"Found {{count}} transactions with unusually large amounts (>${LARGE_AMOUNT_THRESHOLD})",
+    'duplicate_rows': "Found {count} transactions that appear more than once in the file",
+    'duplicates': "Found {count} transactions that were already imported"
+}
+
+# Number of rows included as sample data in import previews
+PREVIEW_SAMPLE_ROWS = 10
+
+# Format of dates shown in import previews
+PREVIEW_DATE_FORMAT = '%b %d, %Y'
+
+# Nanoseconds per day, and the day number NaT falls on after integer division
+NANOSECONDS_PER_DAY = 86400 * 10**9
+NAT_DAY = np.iinfo(np.int64).min // NANOSECONDS_PER_DAY
+
+# Category label for transactions without a category in preview breakdowns
+UNCATEGORIZED = 'Uncategorized'
+
+# Columns compared when looking for transactions repeated within a file
+DUPLICATE_ROW_FIELDS = ['date', 'description', 'amount', 'account']
+
+def issue_summary(issue_type: str, mask: np.ndarray, index: pd.Index) -> Optional[Dict[str, Any]]:
+    """
+    Build a validation issue from a boolean mask of affected rows.
+    
+    Only the first MAX_ISSUE_SAMPLE_ROWS affected row indices are included,
+    so the issue stays small however many rows are affected.
+    
+    Args:
+        issue_type: Issue type (a key of ISSUE_MESSAGES)
+        mask: Boolean array marking the affected rows
+        index: Index of the validated DataFrame, aligned with the mask
+        
+    Returns:
+        Optional[Dict[str, Any]]: The issue, or None if no row is affected
+    """
+    positions = np.flatnonzero(mask)
+    count = len(positions)
+    if not count:
+        return None
+    return {
+        'type': issue_type,
+        'count': count,
+        'rows': index[positions[:MAX_ISSUE_SAMPLE_ROWS]].tolist(),
+        'rows_truncated': count > MAX_ISSUE_SAMPLE_ROWS,
+        'message': ISSUE_MESSAGES[issue_type].format(count=count)
+    }
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """
+    Convert amount strings such as "$1,234.56" to floats.
+    
+    Args:
+        values: The amounts
+        
+    Returns:
+        pd.Series: Float amounts, NaN where a value is not a number
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    return pd.to_numeric(values.astype(str).str.replace('[$,]', '', regex=True), errors='coerce')
+
+def duplicate_row_mask(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """
+    Flag transactions that repeat an earlier row of the same DataFrame.
+    
+    Args:
+        df: The DataFrame containing mapped transaction data
+        
+    Returns:
+        Optional[np.ndarray]: Boolean mask (the first occurrence is not flagged),
+        or None without description and amount columns
+    """
+    if 'description' not in df.columns or 'amount' not in df.columns:
+        return None
+    fields = [field for field in DUPLICATE_ROW_FIELDS if field in df.columns]
+    return df.duplicated(subset=fields, keep='first').to_numpy()
+
+def frame_totals(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the preview statistics of a DataFrame in one aggregation pass.
+    
+    Every row is assigned a (category, sign) and a (month, sign) bucket, and
+    one weighted bincount per grouping sums the amounts of all buckets at
+    once. The overall income and expenses are the sums of the category
+    totals, so they need no pass of their own.
+    
+    Args:
+        df: The DataFrame containing transaction data
+        
+    Returns:
+        Dict[str, Any]: 'count', 'income', 'expenses', 'min_date' and 'max_date'
+        (Timestamps or None), plus 'categories' and 'months' mapping each
+        category name and 'YYYY-MM' month to [count, income, expenses]
+    """
+    count = len(df)
+    totals = {'count': count, 'income': 0.0, 'expenses': 0.0, 'min_date': None, 'max_date': None,
+              'categories': {}, 'months': {}}
+    if not count:
+        return totals
+    
+    # Sign bucket of each row: 0 for zero or missing amounts, 1 for income, 2 for expenses
+    if 'amount' in df.columns:
+        amounts = parse_amounts(df['amount']).to_numpy(dtype=float, na_value=np.nan)
+        signs = (amounts > 0).astype(np.intp) + 2 * (amounts < 0)
+        weights = np.where(np.isnan(amounts), 0.0, amounts)
+    else:
+        signs = np.zeros(count, dtype=np.intp)
+        weights = np.zeros(count)
+    
+    def grouped(codes: np.ndarray, groups: int) -> Tuple[np.ndarray, np.ndarray]:
+        sums = np.bincount(codes * 3 + signs, weights=weights, minlength=groups * 3).reshape(groups, 3)
+        return np.bincount(codes, minlength=groups), sums
+    
+    # Per-category totals (missing categories are grouped as UNCATEGORIZED)
+    if 'category' in df.columns:
+        codes, names = pd.factorize(df['category'])
+        labels = [str(name) for name in names] + [UNCATEGORIZED]
+        codes = np.where(codes < 0, len(names), codes)
+    else:
+        codes, labels = np.zeros(count, dtype=np.intp), [UNCATEGORIZED]
+    counts, sums = grouped(codes, len(labels))
+    for label, group_count, (_, income, expenses) in zip(labels, counts.tolist(), sums.tolist()):
+        if group_count:
+            merged = totals['categories'].setdefault(label, [0, 0.0, 0.0])
+            merged[0] += group_count
+            merged[1] += income
+            merged[2] += expenses
+    totals['income'] = float(sums[:, 1].sum())
+    totals['expenses'] = float(sums[:, 2].sum())
+    
+    # Date bounds and per-month totals. Dates repeat heavily, so each distinct
+    # day is converted to its month once and the rows pick up its code.
+    if 'date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['date']):
+        dates = df['date']
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        nanoseconds = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        day_codes, days = pd.factorize(nanoseconds // NANOSECONDS_PER_DAY)
+        dated = days != NAT_DAY
+        if dated.any():
+            day_values = (days[dated] * NANOSECONDS_PER_DAY).astype('datetime64[ns]')
+            totals['min_date'] = pd.Timestamp(day_values.min())
+            totals['max_date'] = pd.Timestamp(day_values.max())
+            
+            # Rows without a date get their own group, left out of the months
+            day_months, months = pd.factorize(day_values.astype('datetime64[M]'))
+            month_of_day = np.full(len(days), len(months), dtype=np.intp)
+            month_of_day[dated] = day_months
+            counts, sums = grouped(month_of_day[day_codes], len(months) + 1)
+            month_labels = np.datetime_as_string(np.asarray(months, dtype='datetime64[M]')).tolist()
+            for label, group_count, (_, income, expenses) in zip(month_labels, counts.tolist(), sums.tolist()):
+                totals['months'][label] = [group_count, income, expenses]
+    
+    return totals
+
+def _breakdown(groups: Dict[str, List[float]], key: str) -> List[Dict[str, Any]]:
+    """
+    Format grouped totals for a preview.
+    
+    Args:
+        groups: [count, income, expenses] per group
+        key: Name of the group field ('category' or 'month')
+        
+    Returns:
+        List[Dict[str, Any]]: One entry per group with count, income, expenses and net
+    """
+    return [{
+        key: name,
+        'count': count,
+        'income': round(income, 2),
+        'expenses': round(expenses, 2),
+        'net': round(income + expenses, 2)
+    } for name, (count, income, expenses) in groups.items()]
+
+class ImportAggregates:
+    """
+    Running totals for an import processed in chunks.
+    
+    Only aggregates are kept, so memory use does not grow with the number of rows.
+    """
+    
+    def __init__(self):
+        """
+        Initialize empty aggregates.
+        """
+        self.total_transactions = 0
+        self.income = 0.0
+        self.expenses = 0.0
+        self.min_date = None
+        self.max_date = None
+        self.categories: Dict[str, List[float]] = {}
+        self.months: Dict[str, List[float]] = {}
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.sample_data: List[Dict[str, Any]] = []
+    
+    def update(self, df: pd.DataFrame, issues: List[Dict[str, Any]]) -> None:
+        """
+        Fold a processed chunk into the running totals.
+        
+        Args:
+            df: The processed chunk
+            issues: Validation issues found in the chunk
+        """
+        totals = frame_totals(df)
+        self.total_transactions += totals['count']
+        self.income += totals['income']
+        self.expenses += totals['expenses']
+        
+        chunk_min, chunk_max = totals['min_date'], totals['max_date']
+        if chunk_min is not None and (self.min_date is None or chunk_min < self.min_date):
+            self.min_date = chunk_min
+        if chunk_max is not None and (self.max_date is None or chunk_max > self.max_date):
+            self.max_date = chunk_max
+        
+        for groups, chunk_groups in ((self.categories, totals['categories']), (self.months, totals['months'])):
+            for name, (count, income, expenses) in chunk_groups.items():
+                merged = groups.setdefault(name, [0, 0.0, 0.0])
+                merged[0] += count
+                merged[1] += income
+                merged[2] += expenses
+        
+        self.merge_issues(issues)
+    
+    def merge_issues(self, issues: List[Dict[str, Any]]) -> None:
+        """
+        Merge validation issues from a chunk, keeping a bounded list of affected rows.
+        
+        Args:
+            issues: Validation issues found in the chunk
+        """
+        for issue in issues:
+            key = issue['type'] if 'count' in issue else f"{issue['type']}:{issue.get('field')}"
+            merged = self.issues.get(key)
+            if merged is None:
+                merged = dict(issue)
+                if 'rows' in merged:
+                    merged['rows'] = list(merged['rows'])
+                self.issues[key] = merged
+            elif 'count' in issue:
+                merged['count'] += issue['count']
+                room = MAX_ISSUE_SAMPLE_ROWS - len(merged['rows'])
+                if room > 0:
+                    merged['rows'].extend(issue['rows'][:room])
+            
+            if 'count' in merged and merged['type'] in ISSUE_MESSAGES:
+                merged['rows_truncated'] = merged['count'] > len(merged['rows'])
+                merged['message'] = ISSUE_MESSAGES[merged['type']].format(count=merged['count'])
+    
+    def get_issues(self) -> List[Dict[str, Any]]:
+        """
+        Get the merged validation issues.
+        
+        Returns:
+            List[Dict[str, Any]]: List of validation issues
+        """
+        return list(self.issues.values())
+    
+    def to_preview(self) -> Dict[str, Any]:
+        """
+        Build preview data in the same shape as CSVService.generate_preview.
+        
+        Returns:
+            Dict[str, Any]: Preview data with statistics and issues
+        """
+        date_range = {}
+        if self.min_date is not None and self.max_date is not None:
+            date_range = {
+                'start': self.min_date.strftime(PREVIEW_DATE_FORMAT),
+                'end': self.max_date.strftime(PREVIEW_DATE_FORMAT)
+            }
+        
+        # Categories with the most spending first, then by income; months in order
+        categories = dict(sorted(self.categories.items(), key=lambda item: (item[1][2], -item[1][1])))
+        months = dict(sorted(self.months.items()))
+        
+        return {
+            'date_range': date_range,
+            'stats': {
+                'total_transactions': self.total_transactions,
+                'income': round(self.income, 2),
+                'expenses': round(self.expenses, 2),
+                'net': round(self.income + self.expenses, 2)
+            },
+            'category_totals': _breakdown(categories, 'category'),
+            'monthly_totals': _breakdown(months, 'month'),
+            'issues': self.get_issues(),
+            'sample_data': self.sample_data
+        }
+
 class CSVService:
     """Service for processing CSV files with financial data."""
     
+    # Description -> category memo shared by every service instance
+    category_cache = category_cache
+    
     def __init__(self, upload_folder='temp_uploads'):
         """
         Initialize the CSV service.
@@ -80,48 +440,226 @@ class CSVService:
         self.upload_folder = upload_folder
         os.makedirs(upload_folder, exist_ok=True)
     
+    def open_upload(self) -> UploadWriter:
+        """
+        Open a new upload file in the temporary directory for streaming writes.
+        
+        Returns:
+            UploadWriter: Writer for the upload
+        """
+        # Generate a unique filename to prevent collisions
+        filename = f"{uuid.uuid4().hex}.csv"
+        return UploadWriter(os.path.join(self.upload_folder, filename))
+    
+    @instrument_stage('save_uploaded_file')
     def save_uploaded_file(self, file) -> str:
         """
-        Save an uploaded file to the temporary directory.
+        Save an uploaded file to the temporary directory and remember its format.
+        
+        Uploads already streamed to disk by an UploadWriter are only completed;
+        other file objects are copied through a writer in fixed-size chunks.
         
         Args:
             file: The uploaded file object
             
         Returns:
             str: The path to the saved file
+            
+        Raises:
+            UploadRejected: If the file is too large or not a CSV
         """
-        # Generate a unique filename to prevent collisions
-        filename = f"{uuid.uuid4().hex}.csv"
-        file_path = os.path.join(self.upload_folder, filename)
-        file.save(file_path)
-        return file_path
+        writer = file.stream
+        if not isinstance(writer, UploadWriter):
+            writer = self.open_upload()
+            while True:
+                data = file.stream.read(UPLOAD_CHUNK_SIZE)
+                if not data:
+                    break
+                writer.write(data)
+        
+        csv_format = writer.finish()
+        import_session_cache.put(get_upload_id(writer.file_path), 'format', csv_format)
+        ColumnarUpload(writer.file_path).update_meta(csv_format=csv_format)
+        return writer.file_path
+    
+    def get_file_format(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get the encoding, delimiter and header row of a CSV file.
+        
+        The format sniffed during upload is reused, from the session cache or
+        the upload's sidecar; otherwise the start of the file is sniffed.
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            Dict[str, Any]: The format (see upload_service.sniff_csv_format)
+        """
+        csv_format = import_session_cache.get(get_upload_id(file_path), 'format')
+        if csv_format is None:
+            csv_format = (ColumnarUpload(file_path).meta or {}).get('csv_format')
+        if csv_format is None:
+            with open(file_path, 'rb') as f:
+                sample = f.read(UPLOAD_CHUNK_SIZE)
+            csv_format = sniff_csv_format(sample, final=len(sample) < UPLOAD_CHUNK_SIZE)
+            import_session_cache.put(get_upload_id(file_path), 'format', csv_format)
+        return csv_format
+    
+    def detect_delimiter(self, file_path: str) -> str:
+        """
+        Detect the delimiter of a CSV file from a sample of its contents.
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            str: The detected delimiter
+        """
+        return self.get_file_format(file_path)['delimiter']
     
-    def read_csv(self, file_path: str) -> pd.DataFrame:
+    @instrument_stage('read_csv')
+    def read_csv(self, file_path: str, nrows: Optional[int] = None) -> pd.DataFrame:
         """
         Read a CSV file into a pandas DataFrame.
         
+        Uploads that already have a columnar copy are read from it; the first
+        whole-file read of an upload writes that copy.
+        
         Args:
             file_path: Path to the CSV file
+            nrows: Only read this many rows (reads the whole file if None)
             
         Returns:
             pd.DataFrame: The CSV data as a DataFrame
         """
         try:
-            # Try to detect the delimiter automatically
-            with open(file_path, 'r') as f:
-                sample = f.read(4096)  # Read a sample to detect delimiter
-            
-            # Count occurrences of common delimiters
-            delimiters = [',', ';', '\t', '|']
-            counts = {d: sample.count(d) for d in delimiters}
-            delimiter = max(counts, key=counts.get)
+            columnar = ColumnarUpload(file_path)
+            if columnar.exists():
+                return columnar.read(0, nrows)
             
-            # Read the CSV with the detected delimiter
-            df = pd.read_csv(file_path, delimiter=delimiter)
+            # Read the CSV with the sniffed delimiter, encoding and header row
+            options = read_options(self.get_file_format(file_path))
+            df = pd.read_csv(file_path, nrows=nrows, **options)
+            if nrows is None:
+                columnar.write_frame(df)
             return df
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {str(e)}")
     
+    def iter_csv_chunks(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Read a CSV file as a sequence of fixed-size DataFrame chunks.
+        
+        Chunks keep a running row index, so row numbers in validation
+        issues match those of a whole-file read. Uploads with a columnar copy
+        are read from it; the first complete pass over an upload writes it.
+        
+        Args:
+            file_path: Path to the CSV file
+            chunk_size: Number of rows per chunk
+            
+        Returns:
+            Iterator[pd.DataFrame]: Iterator over the CSV chunks
+        """
+        columnar = ColumnarUpload(file_path)
+        if columnar.exists():
+            yield from columnar.iter_chunks(chunk_size)
+            return
+        
+        try:
+            options = read_options(self.get_file_format(file_path))
+            reader = pd.read_csv(file_path, chunksize=chunk_size, **options)
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {str(e)}")
+        
+        with reader:
+            yield from columnar.write_chunks(reader)
+    
+    def should_stream(self, file_path: str) -> bool:
+        """
+        Check whether a file is large enough to be imported in chunks.
+        
+        Args:
+            file_path: Path to the CSV file
+            
+        Returns:
+            bool: True if the file should be streamed
+        """
+        return os.path.getsize(file_path) > STREAMING_THRESHOLD_BYTES
+    
+    def load_csv(self, file_path: str) -> pd.DataFrame:
+        """
+        Get the parsed DataFrame for an upload, reading the file only on a cache miss.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            
+        Returns:
+            pd.DataFrame: The CSV data as a DataFrame
+        """
+        df = self.get_cached_frame(file_path, 'raw')
+        if df is None:
+            df = self.read_csv(file_path)
+            self.cache_frame(file_path, 'raw', df)
+        return df
+    
+    def get_cached_frame(self, file_path: str, stage: str) -> Optional[pd.DataFrame]:
+        """
+        Get a DataFrame cached for an upload at the given wizard stage.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            stage: Wizard stage ('raw' or 'mapped')
+            
+        Returns:
+            pd.DataFrame: The cached DataFrame, or None if not cached
+        """
+        return import_session_cache.get(get_upload_id(file_path), stage)
+    
+    def cache_frame(self, file_path: str, stage: str, df: pd.DataFrame) -> None:
+        """
+        Cache a DataFrame for an upload so later wizard steps can reuse it.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            stage: Wizard stage ('raw' or 'mapped')
+            df: The DataFrame to cache
+        """
+        import_session_cache.put(get_upload_id(file_path), stage, df)
+    
+    def save_import_settings(self, file_path: str, settings: Dict[str, Any]) -> None:
+        """
+        Remember the mapping settings chosen for an upload.
+        
+        Streamed imports do not keep a mapped DataFrame, so the settings are
+        needed to replay the mapping when the import is processed.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            settings: Mapping, date format and amount format for the upload
+        """
+        upload_id = get_upload_id(file_path)
+        import_session_cache.put(upload_id, 'settings', settings)
+        # Affected rows found under the previous settings no longer apply
+        import_session_cache.put(upload_id, 'issue_rows', {})
+        ColumnarUpload(file_path).update_meta(settings=settings)
+    
+    def get_import_settings(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the mapping settings saved for an upload.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            
+        Returns:
+            Dict[str, Any]: The saved settings, or None if not available
+        """
+        settings = import_session_cache.get(get_upload_id(file_path), 'settings')
+        if settings is None:
+            # Fall back to the sidecar when the session cache has evicted the upload
+            settings = (ColumnarUpload(file_path).meta or {}).get('settings')
+        return settings
+    
     def detect_date_format(self, date_sample: str) -> Optional[str]:
         """
         Detect the format of a date string.
@@ -140,20 +678,92 @@ class CSVService:
                 continue
         return None
     
-    def convert_dates(self, df: pd.DataFrame, date_column: str, date_format: str) -> pd.DataFrame:
+    def infer_date_format(self, values: pd.Series, sample_size: int = DATE_SAMPLE_SIZE) -> Optional[str]:
+        """
+        Infer the date format of a column from a sample of its values.
+        
+        Every entry of DATE_FORMATS is scored by how many sampled rows it parses,
+        using vectorized pd.to_datetime. Looking at many rows resolves day/month
+        ambiguity (e.g. a single '13/01/2025' rules out month-first formats).
+        Ties go to the format listed first in DATE_FORMATS.
+        
+        Args:
+            values: The date column
+            sample_size: Maximum number of non-empty rows to sample
+            
+        Returns:
+            str: The best-scoring date format, or None if no format parses any row
+        """
+        sample = values.dropna().astype(str).str.strip()
+        sample = sample[sample != '']
+        if sample.empty:
+            return None
+        if len(sample) > sample_size:
+            sample = sample.sample(sample_size, random_state=0)
+        
+        best_format = None
+        best_score = 0
+        for date_format in DATE_FORMATS:
+            score = int(pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum())
+            if score > best_score:
+                best_format = date_format
+                best_score = score
+                if score == len(sample):
+                    break
+        return best_format
+    
+    def resolve_date_format(self, file_path: str, date_column: str,
+                            values: Optional[pd.Series] = None) -> Optional[str]:
+        """
+        Get the inferred date format for an upload's date column, inferring it once per upload.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            date_column: Name of the date column in the CSV file
+            values: The column values, or None to read a sample from the file
+            
+        Returns:
+            str: The inferred date format, or None if it could not be inferred
+        """
+        upload_id = get_upload_id(file_path)
+        stage = f"date_format:{date_column}"
+        date_format = import_session_cache.get(upload_id, stage)
+        if date_format is None:
+            if values is None:
+                values = self.read_csv(file_path, nrows=DATE_SAMPLE_SIZE)[date_column]
+            date_format = self.infer_date_format(values)
+            if date_format is not None:
+                import_session_cache.put(upload_id, stage, date_format)
+        return date_format
+    
+    @instrument_stage('convert_dates')
+    def convert_dates(self, df: pd.DataFrame, date_column: str,
+                      date_format: Optional[str] = None,
+                      errors: Optional[str] = None) -> pd.DataFrame:
         """
-        Convert a date column to datetime format.
+        Convert a date column to datetime format in one vectorized pass.
+        
+        When no format is given, it is inferred from the column. Inferred formats
+        default to coercing rows that do not match into NaT, which validation
+        reports as invalid dates; explicit formats raise on such rows.
         
         Args:
             df: The DataFrame containing the data
             date_column: The name of the date column
-            date_format: The format of the dates in the column
+            date_format: The format of the dates in the column, or None to infer it
+            errors: 'raise' or 'coerce' (defaults depend on whether the format was inferred)
             
         Returns:
             pd.DataFrame: The DataFrame with converted dates
         """
+        if not date_format:
+            date_format = self.infer_date_format(df[date_column])
+            if date_format is None:
+                raise ValueError("Error converting dates: could not detect the date format")
+            errors = errors or 'coerce'
+        
         try:
-            df[date_column] = pd.to_datetime(df[date_column], format=date_format)
+            df[date_column] = pd.to_datetime(df[date_column], format=date_format, errors=errors or 'raise')
             return df
         except Exception as e:
             raise ValueError(f"Error converting dates: {str(e)}")
@@ -198,6 +808,7 @@ class CSVService:
         
         return mapping
     
+    @instrument_stage('apply_column_mapping')
     def apply_column_mapping(self, df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
         """
         Apply column mapping to standardize the DataFrame.
@@ -229,14 +840,41 @@ class CSVService:
         Returns:
             str: The suggested category
         """
-        description = description.lower()
+        normalized = normalize_description(description)
+        category = self.category_cache.get(normalized)
+        if category is None:
+            category = get_category_matcher().match(normalized)
+            self.category_cache.put(normalized, category)
+        return category
+    
+    def categorize_descriptions(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Suggest categories for a column of descriptions.
+        
+        Only unique normalized descriptions missing from the category cache are
+        run through the keyword matcher, so the cost grows with the number of
+        distinct merchants rather than the number of rows.
+        
+        Args:
+            descriptions: Series of transaction descriptions
+            
+        Returns:
+            pd.Series: Suggested categories aligned with the input index
+        """
+        normalized = descriptions.astype(str).str.strip().str.lower().fillna('')
+        unique_descriptions = pd.unique(normalized)
         
-        for category, keywords in CATEGORY_KEYWORDS.items():
-            if any(keyword.lower() in description for keyword in keywords):
-                return category
+        categories = self.category_cache.get_many(unique_descriptions)
+        unknown = [d for d in unique_descriptions if d not in categories]
+        if unknown:
+            matched = get_category_matcher().match_series(pd.Series(unknown, dtype=object))
+            new_entries = dict(zip(unknown, matched))
+            self.category_cache.put_many(new_entries)
+            categories.update(new_entries)
         
-        return 'Other'
+        return normalized.map(categories).astype(object)
     
+    @instrument_stage('categorize_transactions')
     def categorize_transactions(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Add or update categories for transactions based on descriptions.
@@ -251,13 +889,19 @@ class CSVService:
         if 'category' not in df.columns:
             df['category'] = None
         
-        # For each transaction without a category, suggest one
-        for idx, row in df.iterrows():
-            if pd.isna(row['category']) and 'description' in df.columns:
-                df.at[idx, 'category'] = self.suggest_category(str(row['description']))
+        if 'description' not in df.columns:
+            return df
+        
+        # Suggest a category for every transaction without one, in a single pass
+        missing = df['category'].isna()
+        if missing.any():
+            if not (pd.api.types.is_object_dtype(df['category']) or pd.api.types.is_string_dtype(df['category'])):
+                df['category'] = df['category'].astype(object)
+            df.loc[missing, 'category'] = self.categorize_descriptions(df.loc[missing, 'description'])
         
         return df
     
+    @instrument_stage('normalize_amounts')
     def normalize_amounts(self, df: pd.DataFrame, amount_format: str) -> pd.DataFrame:
         """
         Normalize transaction amounts based on the specified format.
@@ -272,23 +916,70 @@ class CSVService:
         if 'amount' not in df.columns:
             return df
         
-        # Convert amount strings to float, handling currency symbols and commas
-        df['amount'] = df['amount'].astype(str).str.replace('[$,]', '', regex=True).astype(float)
+        # Convert amount strings to float, handling currency symbols and commas.
+        # Values that are not numbers become NaN and are reported by validate_data.
+        df['amount'] = parse_amounts(df['amount'])
         
         if amount_format == 'separate_columns' and 'debit' in df.columns and 'credit' in df.columns:
             # Convert debit and credit columns to float
-            df['debit'] = df['debit'].astype(str).str.replace('[$,]', '', regex=True).astype(float)
-            df['credit'] = df['credit'].astype(str).str.replace('[$,]', '', regex=True).astype(float)
+            df['debit'] = parse_amounts(df['debit'])
+            df['credit'] = parse_amounts(df['credit'])
             
             # Combine debit and credit into a single amount column
             df['amount'] = df['credit'] - df['debit']
         
         return df
     
+    def issue_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Compute a boolean mask of the affected rows for each row-level check.
+        
+        Each check is a single vectorized operation over one column.
+        
+        Args:
+            df: The DataFrame containing transaction data
+            
+        Returns:
+            Dict[str, np.ndarray]: Mask per issue type, in the order of ISSUE_MESSAGES
+            (already imported transactions are checked by find_duplicates)
+        """
+        masks = {}
+        
+        if 'date' in df.columns:
+            dates = df['date']
+            masks['invalid_dates'] = dates.isna().to_numpy()
+            if pd.api.types.is_datetime64_any_dtype(dates):
+                tomorrow = pd.Timestamp.now(tz=dates.dt.tz).normalize() + pd.Timedelta(days=1)
+                masks['future_dates'] = (dates >= tomorrow).to_numpy()
+        
+        if 'amount' in df.columns:
+            amounts = df['amount']
+            if not pd.api.types.is_numeric_dtype(amounts):
+                # Amounts that have not been normalized yet
+                amounts = parse_amounts(amounts)
+            masks['non_numeric_amounts'] = amounts.isna().to_numpy()
+        
+        if 'category' in df.columns:
+            masks['missing_categories'] = df['category'].isna().to_numpy()
+        
+        if 'amount' in df.columns:
+            masks['large_amounts'] = (amounts.abs() > LARGE_AMOUNT_THRESHOLD).to_numpy()
+        
+        duplicate_rows = duplicate_row_mask(df)
+        if duplicate_rows is not None:
+            masks['duplicate_rows'] = duplicate_rows
+        
+        return masks
+    
+    @instrument_stage('validate_data')
     def validate_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
         Validate the transaction data and identify potential issues.
         
+        Row-level issues carry the number of affected rows and the first
+        MAX_ISSUE_SAMPLE_ROWS of their indices; get_issue_rows pages through
+        the rest.
+        
         Args:
             df: The DataFrame containing transaction data
             
@@ -307,157 +998,392 @@ class CSVService:
                     'message': f"Required field '{field}' is missing"
                 })
         
-        # Check for invalid dates
-        if 'date' in df.columns:
-            invalid_dates = df[df['date'].isna()]
-            if not invalid_dates.empty:
-                issues.append({
-                    'type': 'invalid_dates',
-                    'count': len(invalid_dates),
-                    'rows': invalid_dates.index.tolist(),
-                    'message': f"Found {len(invalid_dates)} transactions with invalid dates"
-                })
+        for issue_type, mask in self.issue_masks(df).items():
+            issue = issue_summary(issue_type, mask, df.index)
+            if issue is not None:
+                issues.append(issue)
         
-        # Check for missing categories
-        if 'category' in df.columns:
-            missing_categories = df[df['category'].isna()]
-            if not missing_categories.empty:
-                issues.append({
-                    'type': 'missing_categories',
-                    'count': len(missing_categories),
-                    'rows': missing_categories.index.tolist(),
-                    'message': f"Found {len(missing_categories)} transactions with missing categories"
-                })
+        return issues
+    
+    @instrument_stage('find_duplicates')
+    def find_duplicates(self, df: pd.DataFrame, window_days: int = DUPLICATE_WINDOW_DAYS) -> pd.Series:
+        """
+        Flag transactions that match one already in the transaction store.
         
-        # Check for unusually large amounts
-        if 'amount' in df.columns:
-            # Define thresholds for unusually large amounts
-            large_threshold = 5000  # $5,000
-            large_amounts = df[df['amount'].abs() > large_threshold]
-            if not large_amounts.empty:
-                issues.append({
-                    'type': 'large_amounts',
-                    'count': len(large_amounts),
-                    'rows': large_amounts.index.tolist(),
-                    'message': f"Found {len(large_amounts)} transactions with unusually large amounts (>${large_threshold})"
-                })
+        A transaction matches when its normalized description, account and
+        amount (in cents) equal those of a stored transaction dated at most
+        window_days apart. All rows are checked in one pass against the
+        store's fingerprint index.
         
-        return issues
+        Args:
+            df: The DataFrame containing mapped transaction data
+            window_days: Maximum difference in days for a match (0 for the same day)
+            
+        Returns:
+            pd.Series: Boolean mask aligned with the DataFrame index
+        """
+        if df.empty or 'date' not in df.columns or 'amount' not in df.columns:
+            return pd.Series(False, index=df.index, dtype=bool)
+        
+        # Convert dates to day numbers, vectorized for converted date columns
+        if pd.api.types.is_datetime64_any_dtype(df['date']):
+            days = (df['date'].dt.normalize() - pd.Timestamp('1970-01-01')).dt.days + EPOCH_DAY
+            days = [None if pd.isna(day) else int(day) for day in days]
+        else:
+            days = [date_to_day(value) if isinstance(value, str) else None for value in df['date']]
+        
+        missing = [None] * len(df)
+        descriptions = df['description'].tolist() if 'description' in df.columns else missing
+        accounts = df['account'].tolist() if 'account' in df.columns else missing
+        
+        # Raw uploads may still hold amount strings such as "$12.00"
+        amounts = parse_amounts(df['amount']).tolist()
+        duplicates = find_duplicate_transactions(days, descriptions, amounts, accounts, window_days)
+        return pd.Series(duplicates, index=df.index, dtype=bool)
+    
+    def duplicate_issues(self, duplicates: pd.Series) -> List[Dict[str, Any]]:
+        """
+        Build the validation issue for transactions that were already imported.
+        
+        Args:
+            duplicates: Boolean mask returned by find_duplicates
+            
+        Returns:
+            List[Dict[str, Any]]: A single 'duplicates' issue, or no issues
+        """
+        issue = issue_summary('duplicates', duplicates.to_numpy(), duplicates.index)
+        return [issue] if issue is not None else []
+    
+    def get_issue_rows(self, file_path: str, issue_type: str, offset: int = 0,
+                       limit: int = 1000) -> Dict[str, Any]:
+        """
+        Get a page of the rows affected by a validation issue.
+        
+        The affected rows are found once per upload and mapping, from the mapped
+        data cached by the import wizard or by replaying the saved mapping
+        chunk by chunk, and kept in the import session cache for later pages.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            issue_type: Issue type (a key of ISSUE_MESSAGES)
+            offset: Number of affected rows to skip
+            limit: Maximum number of row indices to return (at most MAX_ISSUE_PAGE_SIZE)
+            
+        Returns:
+            Dict[str, Any]: 'type', 'count', 'offset', 'rows' and 'next_offset'
+            (None on the last page)
+            
+        Raises:
+            ValueError: If the issue type is unknown or the upload has not been mapped
+        """
+        if issue_type not in ISSUE_MESSAGES:
+            raise ValueError(f"Unknown issue type '{issue_type}'")
+        
+        upload_id = get_upload_id(file_path)
+        cached = import_session_cache.get(upload_id, 'issue_rows') or {}
+        rows = cached.get(issue_type)
+        if rows is None:
+            rows = self._find_issue_rows(file_path, issue_type)
+            import_session_cache.put(upload_id, 'issue_rows', dict(cached, **{issue_type: rows}))
+        
+        offset = max(offset, 0)
+        limit = min(max(limit, 1), MAX_ISSUE_PAGE_SIZE)
+        page = rows[offset:offset + limit]
+        next_offset = offset + len(page)
+        return {
+            'type': issue_type,
+            'count': len(rows),
+            'offset': offset,
+            'rows': page.tolist(),
+            'next_offset': next_offset if next_offset < len(rows) else None
+        }
+    
+    def _find_issue_rows(self, file_path: str, issue_type: str) -> np.ndarray:
+        """
+        Find the indices of all rows affected by a validation issue.
+        
+        Args:
+            file_path: Path to the uploaded CSV file
+            issue_type: Issue type (a key of ISSUE_MESSAGES)
+            
+        Returns:
+            np.ndarray: Row indices, in file order
+            
+        Raises:
+            ValueError: If the upload has not been mapped
+        """
+        def affected(df: pd.DataFrame) -> np.ndarray:
+            if issue_type == 'duplicates':
+                mask = self.find_duplicates(df).to_numpy()
+            else:
+                mask = self.issue_masks(df).get(issue_type)
+                if mask is None:
+                    return np.empty(0, dtype=np.int64)
+            return df.index.to_numpy()[mask]
+        
+        df = self.get_cached_frame(file_path, 'mapped')
+        if df is not None:
+            return affected(df)
+        
+        settings = self.get_import_settings(file_path)
+        if not settings:
+            raise ValueError("Column mapping has not been applied to this file")
+        
+        # Validation of streamed imports is per chunk, so rows repeated in
+        # different chunks are not reported as duplicate_rows here either
+        parts = [affected(self.prepare_chunk(chunk, settings['mapping'], settings['date_format'],
+                                             settings['amount_format'], file_path))
+                 for chunk in self.iter_csv_chunks(file_path)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
     
+    @instrument_stage('generate_preview')
     def generate_preview(self, df: pd.DataFrame, issues: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate a preview of the transaction data with validation results.
         
+        The statistics, including per-category and per-month totals, come from
+        one aggregation pass (see frame_totals), and the sample rows are
+        formatted column by column.
+        
         Args:
             df: The DataFrame containing transaction data
             issues: List of validation issues
             
         Returns:
-            Dict[str, Any]: Preview data with statistics and issues
+            Dict[str, Any]: Preview data with statistics, breakdowns and issues
         """
-        # Calculate date range
-        date_range = {}
-        if 'date' in df.columns and not df.empty:
-            min_date = df['date'].min()
-            max_date = df['date'].max()
-            if pd.notna(min_date) and pd.notna(max_date):
-                date_range = {
-                    'start': min_date.strftime('%b %d, %Y'),
-                    'end': max_date.strftime('%b %d, %Y')
-                }
-        
-        # Calculate financial statistics
-        stats = {}
-        if 'amount' in df.columns:
-            income = df[df['amount'] > 0]['amount'].sum() if not df.empty else 0
-            expenses = df[df['amount'] < 0]['amount'].sum() if not df.empty else 0
-            stats = {
-                'total_transactions': len(df),
-                'income': round(income, 2),
-                'expenses': round(expenses, 2),
-                'net': round(income + expenses, 2)
-            }
+        aggregates = ImportAggregates()
+        aggregates.update(df, issues)
+        aggregates.sample_data = self.sample_rows(df)
+        return aggregates.to_preview()
+    
+    def sample_rows(self, df: pd.DataFrame, count: int = PREVIEW_SAMPLE_ROWS) -> List[Dict[str, Any]]:
+        """
+        Format the first rows of a DataFrame for a preview.
         
-        # Prepare sample data (first 10 rows)
-        sample_data = []
-        if not df.empty:
-            for _, row in df.head(10).iterrows():
-                sample_row = {}
-                for col in df.columns:
-                    value = row[col]
-                    if col == 'date' and pd.notna(value):
-                        value = value.strftime('%b %d, %Y')
-                    sample_row[col] = value
-                sample_data.append(sample_row)
-        
-        # Compile preview data
-        preview = {
-            'date_range': date_range,
-            'stats': stats,
-            'issues': issues,
-            'sample_data': sample_data
-        }
+        Args:
+            df: The DataFrame containing transaction data
+            count: Number of rows
+            
+        Returns:
+            List[Dict[str, Any]]: One dictionary per row, with dates formatted for display
+        """
+        return frame_records(df.head(count), PREVIEW_DATE_FORMAT)
+    
+    def generate_ids(self, count: int) -> List[str]:
+        """
+        Generate unique transaction IDs in bulk.
+        
+        IDs are 128-bit random values in the same 32-character hex form as
+        uuid.uuid4().hex, drawn from a single os.urandom call.
         
-        return preview
+        Args:
+            count: Number of IDs to generate
+            
+        Returns:
+            List[str]: The generated IDs
+        """
+        hex_ids = os.urandom(16 * count).hex()
+        return [hex_ids[i:i + 32] for i in range(0, 32 * count, 32)]
     
-    def process_import(self, df: pd.DataFrame) -> Dict[str, Any]:
+    @instrument_stage('process_import_columns')
+    def process_import_columns(self, df: pd.DataFrame, batch_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Process the final import and prepare data for storage.
+        Process the final import column by column and prepare data for storage.
+        
+        IDs are assigned in bulk, the import timestamp is computed once, dates are
+        formatted column-wise and the summary uses vectorized sums. Missing values
+        are stored as None.
         
         Args:
             df: The DataFrame containing transaction data
+            batch_id: ID of the import batch (a new one is generated if None)
             
         Returns:
-            Dict[str, Any]: Processed transaction data ready for storage
+            Dict[str, Any]: 'columns' mapping each field to its values, and 'summary'
         """
         # Generate a unique batch ID for this import
-        batch_id = uuid.uuid4().hex
-        
-        # Prepare transactions for storage
-        transactions = []
-        for _, row in df.iterrows():
-            transaction = {
-                'id': uuid.uuid4().hex,
-                'import_batch_id': batch_id,
-                'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            # Copy data from DataFrame
-            for col in df.columns:
-                value = row[col]
-                if col == 'date' and pd.notna(value):
-                    value = value.strftime('%Y-%m-%d')
-                transaction[col] = value
+        if batch_id is None:
+            batch_id = uuid.uuid4().hex
+        
+        count = len(df)
+        columns: Dict[str, Any] = {
+            'id': self.generate_ids(count),
+            'import_batch_id': batch_id,
+            'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        
+        date_range = {}
+        for col in df.columns:
+            series = df[col]
+            if col == 'date' and pd.api.types.is_datetime64_any_dtype(series):
+                series = series.dt.strftime('%Y-%m-%d')
+                if count:
+                    date_range = {'start': series.min(), 'end': series.max()}
             
-            transactions.append(transaction)
+            if col == 'amount':
+                columns[col] = series.to_numpy(dtype=float, na_value=float('nan'))
+            else:
+                columns[col] = series.astype(object).where(series.notna(), None).tolist()
+        
+        income = expenses = 0.0
+        if 'amount' in df.columns:
+            amounts = df['amount']
+            income = float(amounts[amounts > 0].sum())
+            expenses = float(amounts[amounts < 0].sum())
         
         # Calculate import summary
         summary = {
             'batch_id': batch_id,
-            'total_transactions': len(transactions),
-            'date_range': {
-                'start': min(t['date'] for t in transactions if 'date' in t),
-                'end': max(t['date'] for t in transactions if 'date' in t)
-            } if transactions else {},
-            'income': sum(t['amount'] for t in transactions if 'amount' in t and t['amount'] > 0),
-            'expenses': sum(t['amount'] for t in transactions if 'amount' in t and t['amount'] < 0)
+            'total_transactions': count,
+            'date_range': date_range,
+            'income': income,
+            'expenses': expenses
         }
         
         return {
-            'transactions': transactions,
+            'columns': columns,
             'summary': summary
         }
     
+    @instrument_stage('process_import')
+    def process_import(self, df: pd.DataFrame, batch_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process the final import and prepare data for storage.
+        
+        Args:
+            df: The DataFrame containing transaction data
+            batch_id: ID of the import batch (a new one is generated if None)
+            
+        Returns:
+            Dict[str, Any]: Processed transaction data ready for storage
+        """
+        result = self.process_import_columns(df, batch_id)
+        columns = result['columns']
+        
+        # Build one dict per transaction from the prepared columns,
+        # repeating the values shared by the whole batch
+        count = result['summary']['total_transactions']
+        fields = list(columns)
+        values = []
+        for value in columns.values():
+            if isinstance(value, str):
+                value = [value] * count
+            elif not isinstance(value, list):
+                value = value.tolist()
+            values.append(value)
+        
+        transactions = [dict(zip(fields, row)) for row in zip(*values)]
+        
+        return {
+            'transactions': transactions,
+            'summary': result['summary']
+        }
+    
+    def prepare_chunk(self, df: pd.DataFrame, mapping: Dict[str, str],
+                      date_format: Optional[str] = None,
+                      amount_format: str = 'negative_expense',
+                      file_path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Run a chunk of raw CSV data through mapping, date conversion,
+        amount normalization and categorization.
+        
+        Args:
+            df: The raw CSV chunk
+            mapping: Mapping from CSV columns to standard fields
+            date_format: The format of the dates, or None to use the format
+                inferred for the upload (dates stay unconverted without a file_path)
+            amount_format: Format of the amounts ('negative_expense' or 'separate_columns')
+            file_path: Path to the uploaded CSV file the chunk comes from
+            
+        Returns:
+            pd.DataFrame: The prepared chunk
+        """
+        df = self.apply_column_mapping(df, mapping)
+        if 'date' in df.columns:
+            if date_format:
+                df = self.convert_dates(df, 'date', date_format)
+            elif file_path:
+                # Every chunk uses the format inferred once for the whole upload
+                inferred = self.resolve_date_format(file_path, mapping['date'])
+                if inferred:
+                    df = self.convert_dates(df, 'date', inferred, errors='coerce')
+        df = self.normalize_amounts(df, amount_format)
+        return self.categorize_transactions(df)
+    
+    def stream_import(self, file_path: str, mapping: Dict[str, str],
+                      date_format: Optional[str] = None,
+                      amount_format: str = 'negative_expense',
+                      aggregates: Optional[ImportAggregates] = None,
+                      batch_id: Optional[str] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      build_transactions: bool = True,
+                      skip_duplicates: bool = False,
+                      duplicate_window_days: int = DUPLICATE_WINDOW_DAYS) -> Iterator[Dict[str, Any]]:
+        """
+        Import a CSV file chunk by chunk with bounded memory use.
+        
+        Each chunk is mapped, normalized, categorized, validated and checked
+        for duplicates on its own. Only running totals are kept across chunks,
+        in the given aggregates.
+        
+        Args:
+            file_path: Path to the CSV file
+            mapping: Mapping from CSV columns to standard fields
+            date_format: The format of the dates, or None to infer it from the file
+            amount_format: Format of the amounts ('negative_expense' or 'separate_columns')
+            aggregates: Running totals to update (a new object is used if None)
+            batch_id: ID of the import batch shared by every chunk
+            chunk_size: Number of rows per chunk
+            build_transactions: Whether to build transaction columns for each chunk
+            skip_duplicates: Whether to drop transactions that were already imported
+            duplicate_window_days: Maximum difference in days for a duplicate match
+            
+        Returns:
+            Iterator[Dict[str, Any]]: Per-chunk results with 'columns' (see
+            process_import_columns) and 'issues'
+        """
+        if aggregates is None:
+            aggregates = ImportAggregates()
+        if batch_id is None:
+            batch_id = uuid.uuid4().hex
+        
+        for chunk in self.iter_csv_chunks(file_path, chunk_size):
+            chunk = self.prepare_chunk(chunk, mapping, date_format, amount_format, file_path)
+            issues = self.validate_data(chunk)
+            duplicates = self.find_duplicates(chunk, duplicate_window_days)
+            issues.extend(self.duplicate_issues(duplicates))
+            if skip_duplicates and duplicates.any():
+                chunk = chunk[~duplicates]
+            
+            # Keep the first rows as the preview sample
+            if len(aggregates.sample_data) < PREVIEW_SAMPLE_ROWS:
+                aggregates.sample_data.extend(
+                    self.sample_rows(chunk, PREVIEW_SAMPLE_ROWS - len(aggregates.sample_data)))
+            
+            aggregates.update(chunk, issues)
+            
+            columns = None
+            if build_transactions:
+                columns = self.process_import_columns(chunk, batch_id)['columns']
+            
+            yield {
+                'columns': columns,
+                'issues': issues
+            }
+    
     def cleanup_temp_file(self, file_path: str) -> None:
         """
-        Remove a temporary file after processing.
+        Remove a temporary file and its cached data after processing.
         
         Args:
             file_path: Path to the temporary file
         """
+        import_session_cache.invalidate(get_upload_id(file_path))
         try:
+            ColumnarUpload(file_path).remove()
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
             # Log the error but don't raise it
-            print(f"Error removing temporary file: {str(e)}")
+            logger.warning("Error removing temporary file %s: %s", file_path, e)
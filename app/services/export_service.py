@@ -0,0 +1,90 @@
+"""
+export_service.py - Transaction Export Service for Muzzy Tracker
+
+This module streams stored transactions out as CSV or newline-delimited JSON.
+Transactions are read from the store one keyset page at a time and encoded
+chunk by chunk, so memory use stays flat however long the history is.
+It includes:
+- Chunked iteration over filtered transactions in (date, id) order
+- CSV and NDJSON encoders that yield chunks for streaming responses
+"""
+
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.models.transaction import Transaction, query_transactions
+from app.services.serialization import to_json
+
+# Transactions read from the store per query
+EXPORT_CHUNK_SIZE = 1000
+
+# Exported fields, in Transaction.to_dict order
+EXPORT_FIELDS = ('id', 'date', 'description', 'amount', 'category', 'account',
+                 'notes', 'status', 'import_batch_id', 'import_date')
+
+
+def iter_transaction_chunks(filters: Optional[Dict[str, Any]] = None,
+                            chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Transaction]]:
+    """
+    Read filtered transactions from the store in chunks, ordered by (date, id).
+
+    Each chunk resumes right after the last transaction of the previous one,
+    so only one chunk is held in memory at a time. Transactions without a
+    valid date are not exported.
+
+    Args:
+        filters: Keyword arguments for query_transactions (start_date, end_date,
+            categories, accounts, min_amount, max_amount, text)
+        chunk_size: Number of transactions per chunk
+
+    Yields:
+        List[Transaction]: The next chunk of transactions
+    """
+    filters = filters or {}
+    after = None
+    while True:
+        chunk = query_transactions(after=after, limit=chunk_size, **filters)
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        after = (chunk[-1].date, chunk[-1].id)
+
+
+def generate_csv(chunks: Iterable[List[Transaction]]) -> Iterator[str]:
+    """
+    Encode transaction chunks as CSV, starting with a header row.
+
+    Args:
+        chunks: Chunks of transactions
+
+    Yields:
+        str: CSV text, one piece per chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([getattr(transaction, field) for field in EXPORT_FIELDS]
+                         for transaction in chunk)
+        yield buffer.getvalue()
+
+
+def generate_ndjson(chunks: Iterable[List[Transaction]]) -> Iterator[bytes]:
+    """
+    Encode transaction chunks as newline-delimited JSON, one object per transaction.
+
+    Args:
+        chunks: Chunks of transactions
+
+    Yields:
+        bytes: UTF-8 NDJSON, one piece per chunk
+    """
+    for chunk in chunks:
+        yield b''.join(to_json(transaction.to_dict()) + b'\n' for transaction in chunk)
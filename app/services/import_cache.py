@@ -0,0 +1,214 @@
+"""
+import_cache.py - Import Session Cache for Muzzy Tracker
+
+This module provides a server-side cache for the CSV import wizard.
+Each upload is parsed once and the resulting DataFrames (raw, mapped,
+normalized) are kept in memory, keyed by the upload ID, so later wizard
+steps can reuse them instead of re-reading the file from disk.
+It includes:
+- LRU eviction bounded by an approximate memory budget
+- Time-to-live expiry for abandoned import sessions
+- Hit/miss/eviction counters for monitoring
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+# Default limits, overridable through environment variables
+DEFAULT_MAX_BYTES = int(os.environ.get('IMPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))  # 512 MB
+DEFAULT_TTL_SECONDS = int(os.environ.get('IMPORT_CACHE_TTL', 30 * 60))  # 30 minutes
+
+
+def get_upload_id(file_path: str) -> str:
+    """
+    Derive the upload ID from the path of an uploaded file.
+
+    Uploaded files are saved as ``<uuid>.csv``, so the file name without
+    its extension uniquely identifies the upload.
+
+    Args:
+        file_path: Path to the uploaded file
+
+    Returns:
+        str: The upload ID
+    """
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return sys.getsizeof(value)
+
+
+class ImportSessionCache:
+    """
+    Thread-safe LRU cache for parsed import data, keyed by upload ID and stage.
+
+    A stage names a step of the import wizard, for example ``'raw'`` for the
+    parsed CSV or ``'mapped'`` for the mapped and normalized DataFrame.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the import session cache.
+
+        Args:
+            max_bytes: Approximate memory budget for all cached entries
+            ttl_seconds: Seconds after the last access before an entry expires
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[Any, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, upload_id: str, stage: str) -> Optional[Any]:
+        """
+        Get a cached value for an upload.
+
+        Args:
+            upload_id: ID of the upload
+            stage: Wizard stage the value belongs to
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        key = (upload_id, stage)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # Refresh the entry's position and access time
+            value, size, _ = entry
+            self._entries[key] = (value, size, now)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, upload_id: str, stage: str, value: Any) -> None:
+        """
+        Store a value for an upload, evicting least recently used entries if needed.
+
+        Values larger than the whole memory budget are not cached.
+
+        Args:
+            upload_id: ID of the upload
+            stage: Wizard stage the value belongs to
+            value: The value to cache
+        """
+        key = (upload_id, stage)
+        size = estimate_size(value)
+        now = time.monotonic()
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, now)
+            self._total_bytes += size
+            self._expire(now)
+
+            # Evict least recently used entries until we are within budget
+            while self._total_bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, upload_id: str) -> None:
+        """
+        Remove every cached stage of an upload.
+
+        Args:
+            upload_id: ID of the upload
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == upload_id]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Entry count, memory usage and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        """
+        Remove an entry without taking the lock. Callers must hold the lock.
+
+        Args:
+            key: (upload_id, stage) key of the entry
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _expire(self, now: float) -> None:
+        """
+        Drop entries that have not been accessed within the TTL. Callers must hold the lock.
+
+        Args:
+            now: Current monotonic time
+        """
+        # Entries are kept in access order, so expired ones are at the front
+        while self._entries:
+            key, (_, _, last_access) = next(iter(self._entries.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._remove(key)
+            self.expirations += 1
+
+
+# Process-wide cache shared by all import requests
+import_session_cache = ImportSessionCache()
@@ -0,0 +1,280 @@
+"""
+import_jobs.py - Background Import Jobs for Muzzy Tracker
+
+This module runs CSV imports outside the request thread. Submitting an import
+returns a job ID immediately, a thread pool runs the parse -> normalize ->
+categorize -> store pipeline, and the job records its progress so clients can
+poll for the current stage, rows processed and the final summary.
+It includes:
+- The import pipeline shared by synchronous and background imports
+- A bounded job queue with configurable worker count and queue depth
+- Retention of finished jobs for status polling
+
+Threads are used rather than processes because imported batches are added to
+the in-process transaction store.
+"""
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable
+
+from app.services.csv_service import CSVService, DUPLICATE_WINDOW_DAYS
+from app.services.metrics import instrument_stage, track_stage
+from app.models.transaction import TransactionBatch, TransactionColumns, add_transaction_batch
+
+# Worker pool settings, overridable through environment variables
+DEFAULT_WORKERS = int(os.environ.get('IMPORT_WORKERS', 2))
+DEFAULT_QUEUE_DEPTH = int(os.environ.get('IMPORT_QUEUE_DEPTH', 16))
+
+# Finished jobs are kept this long so clients can fetch the result
+JOB_RETENTION_SECONDS = 60 * 60  # 1 hour
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the import queue has no room for another job."""
+
+
+class ImportJob:
+    """
+    Tracks the state and progress of one background import.
+    """
+
+    def __init__(self, file_path: str, skip_duplicates: bool = True):
+        """
+        Initialize a queued job.
+
+        Args:
+            file_path: Path to the uploaded CSV file to import
+            skip_duplicates: Whether to skip transactions that were already imported
+        """
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.skip_duplicates = skip_duplicates
+        self.status = 'queued'
+        self.stage = 'queued'
+        self.rows_processed = 0
+        self.summary: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.finished_at: Optional[str] = None
+        self._finished_monotonic: Optional[float] = None
+
+    def update(self, stage: str, rows_processed: Optional[int] = None) -> None:
+        """
+        Record progress.
+
+        Args:
+            stage: Current pipeline stage
+            rows_processed: Number of rows processed so far
+        """
+        self.stage = stage
+        if rows_processed is not None:
+            self.rows_processed = rows_processed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the job to a dictionary for status responses.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the job
+        """
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'rows_processed': self.rows_processed,
+            'summary': self.summary,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+
+@instrument_stage('run_import', rows=lambda batch: batch.total_transactions)
+def run_import(csv_service: CSVService, file_path: str,
+               progress: Optional[Callable[[str, Optional[int]], None]] = None,
+               skip_duplicates: bool = True,
+               duplicate_window_days: int = DUPLICATE_WINDOW_DAYS) -> TransactionBatch:
+    """
+    Import an uploaded CSV file into the transaction store.
+
+    Uses the mapped DataFrame cached by the import wizard when available, and
+    otherwise replays the saved mapping settings chunk by chunk.
+
+    Args:
+        csv_service: CSV service to process the file with
+        file_path: Path to the uploaded CSV file
+        progress: Optional callback receiving the stage and rows processed
+        skip_duplicates: Whether to skip transactions that were already imported
+        duplicate_window_days: Maximum difference in days for a duplicate match
+
+    Returns:
+        TransactionBatch: The stored batch
+    """
+    def report(stage: str, rows: Optional[int] = None) -> None:
+        if progress is not None:
+            progress(stage, rows)
+
+    # Use the data with previously applied mappings from the import session cache
+    df = csv_service.get_cached_frame(file_path, 'mapped')
+    settings = csv_service.get_import_settings(file_path)
+
+    import_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if df is None and settings:
+        # The mapped data is not in memory, so replay the mapping chunk by chunk
+        report('processing', 0)
+        batch = TransactionBatch(uuid.uuid4().hex, TransactionColumns(), import_date)
+        for chunk_result in csv_service.stream_import(file_path, settings['mapping'],
+                                                      settings['date_format'],
+                                                      settings['amount_format'],
+                                                      batch_id=batch.id,
+                                                      skip_duplicates=skip_duplicates,
+                                                      duplicate_window_days=duplicate_window_days):
+            batch.extend(TransactionColumns.from_columns(chunk_result['columns']))
+            report('processing', batch.total_transactions)
+    else:
+        if df is None:
+            report('reading')
+            df = csv_service.load_csv(file_path)
+
+        # Drop transactions that are already in the store
+        if skip_duplicates:
+            report('checking_duplicates')
+            df = df[~csv_service.find_duplicates(df, duplicate_window_days)]
+
+        # Process the import column by column
+        report('processing', 0)
+        import_result = csv_service.process_import_columns(df)
+
+        # Create a TransactionBatch straight from the columns
+        batch = TransactionBatch.from_columns(
+            batch_id=import_result['summary']['batch_id'],
+            columns=import_result['columns'],
+            import_date=import_date
+        )
+        report('processing', batch.total_transactions)
+
+    # Add the batch to the database
+    report('storing')
+    with track_stage('store_batch', rows=batch.total_transactions):
+        add_transaction_batch(batch)
+
+    # Clean up the temporary file
+    csv_service.cleanup_temp_file(file_path)
+    return batch
+
+
+class ImportJobManager:
+    """
+    Runs imports on a bounded thread pool and keeps their status for polling.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_queue_depth: int = DEFAULT_QUEUE_DEPTH):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Number of imports that run at the same time
+            max_queue_depth: Maximum number of queued and running jobs
+        """
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, ImportJob] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, skip_duplicates: bool = True) -> ImportJob:
+        """
+        Queue an import of an uploaded file.
+
+        Args:
+            file_path: Path to the uploaded CSV file
+            skip_duplicates: Whether to skip transactions that were already imported
+
+        Returns:
+            ImportJob: The queued job
+
+        Raises:
+            QueueFullError: If the queue already holds max_queue_depth jobs
+        """
+        job = ImportJob(file_path, skip_duplicates)
+        with self._lock:
+            self._prune()
+            if self._active >= self.max_queue_depth:
+                raise QueueFullError('Too many imports in progress, please try again shortly')
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='import-job')
+            self._jobs[job.id] = job
+            self._active += 1
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """
+        Get a job by its ID.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            ImportJob: The job if known, None otherwise
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: ImportJob) -> None:
+        """
+        Run an import job on a worker thread.
+
+        Args:
+            job: The job to run
+        """
+        job.status = 'running'
+        try:
+            batch = run_import(CSVService(), job.file_path, progress=job.update,
+                               skip_duplicates=job.skip_duplicates)
+            job.summary = batch.to_dict()
+            job.status = 'completed'
+            job.update('completed', batch.total_transactions)
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            job.update('failed')
+        finally:
+            job.finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            job._finished_monotonic = time.monotonic()
+            with self._lock:
+                self._active -= 1
+
+    def _prune(self) -> None:
+        """
+        Forget finished jobs older than the retention period. Callers must hold the lock.
+        """
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job._finished_monotonic is not None and job._finished_monotonic < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker pool.
+
+        Args:
+            wait: Whether to wait for running jobs to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Process-wide job manager shared by all requests
+import_job_manager = ImportJobManager()
@@ -0,0 +1,477 @@
+"""
+metrics.py - Import Pipeline Instrumentation for Muzzy Tracker
+
+This module records how long each import pipeline stage and each HTTP route
+takes, how many rows it handled and how much memory it used. Every sampled
+measurement is aggregated in memory for the /metrics endpoint and written to
+the 'app.services.metrics' logger at DEBUG level, as one JSON object per line.
+It includes:
+- A decorator and a context manager that time pipeline stages
+- Per-request recording of route timings
+- Rendering of the aggregates in the Prometheus text exposition format
+
+Measurements are sampled. METRICS_SAMPLE_RATE (0 to 1, default 0.01) decides
+the share of requests that are recorded, with every stage of a sampled request
+recorded; stages run outside a request (background jobs) are sampled one by one.
+Memory is measured from the process RSS: the change in RSS over a stage and
+the rise of the process peak RSS while it ran. Setting METRICS_TRACE_MEMORY
+measures Python allocations with tracemalloc instead, which is exact but
+slows every allocation and should only be enabled while investigating.
+"""
+
+import os
+import json
+import time
+import sys
+import random
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Any, Optional, Callable, Iterator, List, Tuple
+
+import pandas as pd
+
+from app.services.import_cache import import_session_cache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Share of requests (and of stages outside requests) that are measured
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', 0.01))
+
+# Measure Python allocations with tracemalloc instead of the process RSS
+METRICS_TRACE_MEMORY = os.environ.get('METRICS_TRACE_MEMORY', '').lower() in ('1', 'true', 'yes')
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+# Whether the current request is sampled (None outside requests)
+_request_sampled: ContextVar[Optional[bool]] = ContextVar('metrics_request_sampled', default=None)
+
+if METRICS_TRACE_MEMORY:
+    tracemalloc.start()
+
+
+def rss_bytes() -> Optional[int]:
+    """
+    Get the resident memory of the process.
+
+    Returns:
+        Optional[int]: Resident set size in bytes, or None where it cannot be read
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Get the highest resident memory the process has reached.
+
+    Returns:
+        Optional[int]: Peak resident set size in bytes, or None where it cannot be read
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+class _MemoryProbe:
+    """
+    Memory reading taken when a stage starts, compared with a reading at its end.
+    """
+
+    __slots__ = ('current', 'peak')
+
+    def __init__(self):
+        if METRICS_TRACE_MEMORY:
+            # Concurrent and nested stages share the traced peak, so it is
+            # only exact for the innermost stage of a single thread
+            tracemalloc.reset_peak()
+            self.current = tracemalloc.get_traced_memory()[0]
+            self.peak = self.current
+        else:
+            self.current = rss_bytes()
+            self.peak = peak_rss_bytes()
+
+    def result(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Measure the memory used since the probe was taken.
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: Change in memory and rise of the peak, in bytes
+        """
+        if METRICS_TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+        else:
+            current, peak = rss_bytes(), peak_rss_bytes()
+        delta = current - self.current if current is not None and self.current is not None else None
+        growth = max(peak - self.peak, 0) if peak is not None and self.peak is not None else None
+        return delta, growth
+
+
+class _Series:
+    """
+    Aggregated measurements for one stage or route.
+    """
+
+    __slots__ = ('count', 'seconds', 'buckets', 'rows', 'errors', 'memory_delta', 'max_memory_growth')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.rows = 0
+        self.errors = 0
+        self.memory_delta: Optional[int] = None
+        self.max_memory_growth = 0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe aggregates of stage and route measurements.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry.
+        """
+        self._series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, labels: Tuple[Tuple[str, str], ...], seconds: float,
+                rows: Optional[int] = None, memory_delta: Optional[int] = None,
+                memory_growth: Optional[int] = None, error: bool = False) -> None:
+        """
+        Add one measurement.
+
+        Args:
+            kind: 'stage' or 'request'
+            labels: Prometheus labels identifying the series
+            seconds: Wall time
+            rows: Rows processed, if known
+            memory_delta: Change in memory in bytes, if known
+            memory_growth: Rise of the peak memory in bytes, if known
+            error: Whether the stage failed or the request returned a server error
+        """
+        with self._lock:
+            series = self._series.get((kind, labels))
+            if series is None:
+                series = self._series[(kind, labels)] = _Series()
+            series.count += 1
+            series.seconds += seconds
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    series.buckets[i] += 1
+                    break
+            if rows:
+                series.rows += rows
+            if error:
+                series.errors += 1
+            if memory_delta is not None:
+                series.memory_delta = memory_delta
+            if memory_growth:
+                series.max_memory_growth = max(series.max_memory_growth, memory_growth)
+
+    def clear(self) -> None:
+        """
+        Drop all measurements.
+        """
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """
+        Render the measurements and process gauges in the Prometheus text format.
+
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            series = sorted(((kind, labels, _copy(s)) for (kind, labels), s in self._series.items()),
+                            key=lambda item: (item[0], item[1]))
+
+        lines: List[str] = []
+        for kind, description in (('stage', 'import pipeline stage'), ('request', 'HTTP request')):
+            prefix = f"muzzy_{kind}"
+            entries = [(labels, s) for k, labels, s in series if k == kind]
+
+            lines.append(f"# HELP {prefix}_duration_seconds Wall time of each sampled {description}")
+            lines.append(f"# TYPE {prefix}_duration_seconds histogram")
+            for labels, s in entries:
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, s.buckets):
+                    cumulative += count
+                    lines.append(f"{prefix}_duration_seconds_bucket{_labels(labels, le=repr(bound))} {cumulative}")
+                lines.append(f"{prefix}_duration_seconds_bucket{_labels(labels, le='+Inf')} {s.count}")
+                lines.append(f"{prefix}_duration_seconds_sum{_labels(labels)} {s.seconds!r}")
+                lines.append(f"{prefix}_duration_seconds_count{_labels(labels)} {s.count}")
+
+            for name, kind_text, help_text, value in (
+                ('rows_total', 'counter', 'Rows processed', lambda s: s.rows),
+                ('errors_total', 'counter', 'Failed runs', lambda s: s.errors),
+                ('memory_delta_bytes', 'gauge', 'Change in memory over the last run', lambda s: s.memory_delta),
+                ('memory_growth_bytes_max', 'gauge', 'Largest rise of the peak memory during one run',
+                 lambda s: s.max_memory_growth),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text} per sampled {description}")
+                lines.append(f"# TYPE {prefix}_{name} {kind_text}")
+                for labels, s in entries:
+                    if value(s) is not None:
+                        lines.append(f"{prefix}_{name}{_labels(labels)} {value(s)}")
+
+        for name, help_text, value in (
+            ('process_resident_memory_bytes', 'Resident memory of the process', rss_bytes()),
+            ('process_peak_resident_memory_bytes', 'Highest resident memory of the process', peak_rss_bytes()),
+        ):
+            if value is not None:
+                lines.extend([f"# HELP muzzy_{name} {help_text}", f"# TYPE muzzy_{name} gauge",
+                              f"muzzy_{name} {value}"])
+
+        cache = import_session_cache.stats()
+        for key, kind_text, help_text in (
+            ('hits', 'counter', 'Import session cache hits'),
+            ('misses', 'counter', 'Import session cache misses'),
+            ('evictions', 'counter', 'Import session cache evictions'),
+            ('entries', 'gauge', 'Entries in the import session cache'),
+            ('bytes', 'gauge', 'Approximate memory held by the import session cache'),
+        ):
+            name = f"muzzy_import_cache_{key}_total" if kind_text == 'counter' else f"muzzy_import_cache_{key}"
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind_text}", f"{name} {cache[key]}"])
+
+        return '\n'.join(lines) + '\n'
+
+
+def _copy(series: _Series) -> _Series:
+    """
+    Copy a series so it can be rendered outside the registry lock.
+
+    Args:
+        series: The series to copy
+
+    Returns:
+        _Series: The copy
+    """
+    copy = _Series()
+    for slot in _Series.__slots__:
+        value = getattr(series, slot)
+        setattr(copy, slot, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    """
+    Format Prometheus labels.
+
+    Args:
+        labels: Label names and values
+        **extra: Additional labels (such as the histogram bucket bound)
+
+    Returns:
+        str: The label set, for example '{stage="read_csv"}'
+    """
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+# Process-wide registry served by the /metrics endpoint
+metrics_registry = MetricsRegistry()
+
+
+def _sampled() -> bool:
+    """
+    Decide whether a stage is measured.
+
+    Returns:
+        bool: The current request's sampling decision, or a fresh one outside requests
+    """
+    sampled = _request_sampled.get()
+    if sampled is None:
+        return METRICS_SAMPLE_RATE >= 1 or random.random() < METRICS_SAMPLE_RATE
+    return sampled
+
+
+def _log(record: Dict[str, Any]) -> None:
+    """
+    Write a measurement to the structured log.
+
+    Args:
+        record: The measurement
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps(record))
+
+
+class StageRecord:
+    """
+    Measurement of one stage run, returned by track_stage.
+
+    Set ``rows`` inside the block when the row count is only known there.
+    """
+
+    __slots__ = ('stage', 'rows')
+
+    def __init__(self, stage: str, rows: Optional[int]):
+        self.stage = stage
+        self.rows = rows
+
+
+@contextmanager
+def track_stage(stage: str, rows: Optional[int] = None) -> Iterator[StageRecord]:
+    """
+    Measure a block of pipeline code as a stage.
+
+    Args:
+        stage: Name of the stage
+        rows: Rows processed, if known up front
+
+    Yields:
+        StageRecord: Record whose row count can be updated inside the block
+    """
+    record = StageRecord(stage, rows)
+    if not _sampled():
+        yield record
+        return
+    with _measure(record):
+        yield record
+
+
+@contextmanager
+def _measure(record: StageRecord) -> Iterator[None]:
+    """
+    Measure a sampled stage and record the result.
+
+    Args:
+        record: The stage being run
+    """
+    probe = _MemoryProbe()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        memory_delta, memory_growth = probe.result()
+        metrics_registry.observe('stage', (('stage', record.stage),), seconds, record.rows,
+                                 memory_delta, memory_growth, error is not None)
+        _log({'event': 'stage', 'stage': record.stage, 'seconds': round(seconds, 6), 'rows': record.rows,
+              'memory_delta_bytes': memory_delta, 'memory_growth_bytes': memory_growth, 'error': error})
+
+
+def _default_rows(result: Any, args: tuple) -> Optional[int]:
+    """
+    Count the rows a stage processed: the rows of its DataFrame result, or of
+    its first DataFrame argument.
+
+    Args:
+        result: Return value of the stage
+        args: Positional arguments of the stage
+
+    Returns:
+        Optional[int]: Number of rows, or None if no DataFrame is involved
+    """
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    for arg in args:
+        if isinstance(arg, pd.DataFrame):
+            return len(arg)
+    return None
+
+
+def instrument_stage(stage: str, rows: Optional[Callable[[Any], Optional[int]]] = None) -> Callable:
+    """
+    Decorate a function so every sampled call is measured as a stage.
+
+    Args:
+        stage: Name of the stage
+        rows: Function counting the rows from the return value (by default
+            the rows of the DataFrame returned or passed in)
+
+    Returns:
+        Callable: The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sampled():
+                return func(*args, **kwargs)
+            record = StageRecord(stage, None)
+            with _measure(record):
+                result = func(*args, **kwargs)
+                record.rows = rows(result) if rows is not None else _default_rows(result, args)
+                return result
+        return wrapper
+    return decorator
+
+
+class RequestMeasurement:
+    """
+    Start of a measured request, returned by start_request.
+    """
+
+    __slots__ = ('token', 'start', 'probe')
+
+    def __init__(self, token, start: Optional[float], probe: Optional[_MemoryProbe]):
+        self.token = token
+        self.start = start
+        self.probe = probe
+
+
+def start_request() -> RequestMeasurement:
+    """
+    Make the sampling decision for a request and start measuring it if sampled.
+
+    Returns:
+        RequestMeasurement: State to pass to finish_request
+    """
+    sampled = METRICS_SAMPLE_RATE >= 1 or random.random() < METRICS_SAMPLE_RATE
+    token = _request_sampled.set(sampled)
+    if not sampled:
+        return RequestMeasurement(token, None, None)
+    return RequestMeasurement(token, time.perf_counter(), _MemoryProbe())
+
+
+def finish_request(measurement: RequestMeasurement, route: str, method: str, status: int) -> None:
+    """
+    Record a finished request.
+
+    Args:
+        measurement: State returned by start_request
+        route: URL rule the request matched
+        method: HTTP method
+        status: Response status code
+    """
+    try:
+        _request_sampled.reset(measurement.token)
+    except ValueError:
+        # The request finished in a different context than it started in
+        _request_sampled.set(None)
+    if measurement.start is None:
+        return
+    seconds = time.perf_counter() - measurement.start
+    memory_delta, memory_growth = measurement.probe.result()
+    labels = (('route', route), ('method', method), ('status', str(status)))
+    metrics_registry.observe('request', labels, seconds, None, memory_delta, memory_growth, status >= 500)
+    _log({'event': 'request', 'route': route, 'method': method, 'status': status,
+          'seconds': round(seconds, 6), 'memory_delta_bytes': memory_delta,
+          'memory_growth_bytes': memory_growth})
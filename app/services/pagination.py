@@ -0,0 +1,79 @@
+"""
+pagination.py - API Pagination Helpers for Muzzy Tracker
+
+This module provides helpers for paginated JSON endpoints. Pages are addressed
+by opaque cursors that encode the sort key of the last item returned, so the
+next page can be fetched with a keyset (seek) query instead of an offset.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional
+
+# Page size used when the client does not ask for one, and the largest allowed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(key: List[Any]) -> str:
+    """
+    Encode the sort key of the last item on a page as an opaque cursor.
+
+    Args:
+        key: Sort key values, e.g. [date, id]
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], length: int) -> Optional[List[Any]]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: The cursor string, or None/empty for the first page
+        length: Expected number of sort key values
+
+    Returns:
+        List[Any]: The sort key, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, list) or len(key) != length:
+        raise ValueError('Invalid cursor')
+    return key
+
+
+def parse_limit(value: Optional[str], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """
+    Parse a page size query parameter.
+
+    Args:
+        value: The raw parameter value, or None
+        default: Page size used when the value is missing
+        maximum: Largest allowed page size
+
+    Returns:
+        int: The page size, clamped to 1..maximum
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, maximum))
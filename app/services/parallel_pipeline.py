@@ -0,0 +1,262 @@
+"""
+parallel_pipeline.py - Multi-Core Import Pipeline for Muzzy Tracker
+
+This module runs the row-independent stages of the import pipeline
+(normalize_amounts, categorize_transactions and validate_data) on several
+CPU cores. The DataFrame is split into contiguous partitions, each partition
+is processed in a ProcessPoolExecutor worker, and the results are merged back
+with their original row indices so the output matches the serial path exactly.
+
+The worker pool is long-lived: it is created on first use and shared by
+every request and background job. Workers are started with the forkserver
+method (spawn where forkserver is unavailable) rather than forked from the
+threaded web process, since a fork could copy locks held by other threads.
+Each worker compiles the category matcher once, in worker_bootstrap.py.
+"""
+
+import atexit
+import multiprocessing
+import os
+import runpy
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple, Any, Optional
+
+import pandas as pd
+
+from app.services.csv_service import (
+    CSVService, ISSUE_MESSAGES, MAX_ISSUE_SAMPLE_ROWS, get_category_matcher, issue_summary, duplicate_row_mask
+)
+from app.services.metrics import instrument_stage
+
+# Number of worker processes for large imports (0 or 1 disables parallel processing)
+DEFAULT_WORKERS = int(os.environ.get('IMPORT_PARALLEL_WORKERS', 0))
+
+# Frames smaller than this are processed serially, since pickling costs more than it saves
+PARALLEL_THRESHOLD_ROWS = int(os.environ.get('IMPORT_PARALLEL_THRESHOLD', 1000000))
+
+# Script run by each worker process before it takes work
+WORKER_BOOTSTRAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker_bootstrap.py')
+
+# Service instance used inside each worker process
+_worker_service: Optional[CSVService] = None
+
+# Shared worker pool and the (workers, upload folder) it was created for
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple[int, str]] = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(upload_folder: str) -> None:
+    """
+    Prepare a worker process: create its service and compile the category matcher once.
+
+    Args:
+        upload_folder: Upload folder of the parent service
+    """
+    global _worker_service
+    _worker_service = CSVService(upload_folder)
+    get_category_matcher()
+
+
+def _process_partition(partition: pd.DataFrame, amount_format: str) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Run normalization, categorization and validation on one partition.
+
+    Args:
+        partition: Rows to process, with their original index
+        amount_format: Format of the amounts ('negative_expense' or 'separate_columns')
+
+    Returns:
+        Tuple[pd.DataFrame, List[Dict[str, Any]]]: The processed rows and their validation issues
+    """
+    service = _worker_service
+    partition = service.normalize_amounts(partition, amount_format)
+    partition = service.categorize_transactions(partition)
+    return partition, service.validate_data(partition)
+
+
+def get_worker_pool(workers: int, upload_folder: str) -> ProcessPoolExecutor:
+    """
+    Get the shared worker pool, starting it on first use.
+
+    The pool is replaced if a different number of workers or upload folder is requested.
+
+    Args:
+        workers: Number of worker processes
+        upload_folder: Upload folder of the workers' services
+
+    Returns:
+        ProcessPoolExecutor: The worker pool
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None and _pool_key != (workers, upload_folder):
+            # Work already submitted to the old pool still completes
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context(method),
+                                        initializer=runpy.run_path,
+                                        initargs=(WORKER_BOOTSTRAP, {'upload_folder': upload_folder}))
+            _pool_key = (workers, upload_folder)
+        return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """
+    Stop the shared worker pool, if it is running.
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = None
+        _pool_key = None
+
+
+atexit.register(shutdown_worker_pool)
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Forget a pool whose worker died, so the next import starts a new one.
+
+    Args:
+        pool: The broken pool
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            _pool_key = None
+    pool.shutdown(wait=False)
+
+
+def split_frame(df: pd.DataFrame, partitions: int) -> List[pd.DataFrame]:
+    """
+    Split a DataFrame into contiguous partitions of nearly equal size.
+
+    Args:
+        df: The DataFrame to split
+        partitions: Number of partitions
+
+    Returns:
+        List[pd.DataFrame]: Non-empty partitions, keeping the original index
+    """
+    partitions = max(1, min(partitions, len(df)))
+    size, remainder = divmod(len(df), partitions)
+    bounds = [0]
+    for i in range(partitions):
+        bounds.append(bounds[-1] + size + (1 if i < remainder else 0))
+    return [df.iloc[start:end] for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def merge_issues(partition_issues: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merge the validation issues of consecutive partitions.
+
+    Schema-level issues (missing fields) are reported by every partition and kept
+    once. Row-level issues are combined with counts added up and their sampled
+    row indices concatenated in partition order (up to MAX_ISSUE_SAMPLE_ROWS),
+    then listed in the order validate_data reports them (the order of ISSUE_MESSAGES).
+
+    Args:
+        partition_issues: Validation issues of each partition, in row order
+
+    Returns:
+        List[Dict[str, Any]]: The merged validation issues
+    """
+    schema_issues: List[Dict[str, Any]] = []
+    seen_fields = set()
+    row_issues: Dict[str, Dict[str, Any]] = {}
+
+    for issues in partition_issues:
+        for issue in issues:
+            if 'count' not in issue:
+                key = (issue['type'], issue.get('field'))
+                if key not in seen_fields:
+                    seen_fields.add(key)
+                    schema_issues.append(dict(issue))
+                continue
+
+            merged = row_issues.get(issue['type'])
+            if merged is None:
+                row_issues[issue['type']] = dict(issue, rows=list(issue['rows']))
+            else:
+                merged['count'] += issue['count']
+                merged['rows'].extend(issue['rows'][:MAX_ISSUE_SAMPLE_ROWS - len(merged['rows'])])
+
+    ordered = [row_issues[issue_type] for issue_type in ISSUE_MESSAGES if issue_type in row_issues]
+    ordered.extend(issue for issue_type, issue in row_issues.items() if issue_type not in ISSUE_MESSAGES)
+    for issue in ordered:
+        issue['rows_truncated'] = issue['count'] > len(issue['rows'])
+        if issue['type'] in ISSUE_MESSAGES:
+            issue['message'] = ISSUE_MESSAGES[issue['type']].format(count=issue['count'])
+
+    return schema_issues + ordered
+
+
+@instrument_stage('process_parallel')
+def process_parallel(df: pd.DataFrame, amount_format: str = 'negative_expense',
+                     workers: Optional[int] = None,
+                     csv_service: Optional[CSVService] = None) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Normalize, categorize and validate a mapped DataFrame on several cores.
+
+    Falls back to the serial path for a single worker or a single partition.
+
+    Args:
+        df: Mapped transaction data (dates already converted)
+        amount_format: Format of the amounts ('negative_expense' or 'separate_columns')
+        workers: Number of worker processes (defaults to the CPU count)
+        csv_service: Service whose settings the workers copy
+
+    Returns:
+        Tuple[pd.DataFrame, List[Dict[str, Any]]]: The processed data and its validation issues
+    """
+    csv_service = csv_service or CSVService()
+    workers = workers or os.cpu_count() or 1
+    partitions = split_frame(df, workers)
+
+    if workers <= 1 or len(partitions) <= 1:
+        df = csv_service.normalize_amounts(df, amount_format)
+        df = csv_service.categorize_transactions(df)
+        return df, csv_service.validate_data(df)
+
+    pool = get_worker_pool(workers, csv_service.upload_folder)
+    try:
+        results = list(pool.map(_process_partition, partitions, [amount_format] * len(partitions)))
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        raise
+
+    merged = pd.concat([partition for partition, _ in results])
+    issues = merge_issues([issues for _, issues in results])
+
+    # Partitions only see their own rows, so rows repeated in another
+    # partition are found on the merged frame instead (duplicate_rows is
+    # the last issue validate_data reports)
+    issues = [issue for issue in issues if issue['type'] != 'duplicate_rows']
+    mask = duplicate_row_mask(merged)
+    duplicate_rows = issue_summary('duplicate_rows', mask, merged.index) if mask is not None else None
+    if duplicate_rows is not None:
+        issues.append(duplicate_rows)
+    return merged, issues
+
+
+def should_process_parallel(df: pd.DataFrame, workers: int = DEFAULT_WORKERS) -> bool:
+    """
+    Check whether a DataFrame is large enough for parallel processing.
+
+    Args:
+        df: The DataFrame to process
+        workers: Configured number of worker processes
+
+    Returns:
+        bool: True if parallel processing is enabled and worthwhile
+    """
+    return workers > 1 and len(df) >= PARALLEL_THRESHOLD_ROWS
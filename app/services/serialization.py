@@ -0,0 +1,178 @@
+"""
+serialization.py - JSON Serialization for Muzzy Tracker
+
+This module encodes API and import responses as JSON. Import responses carry
+values straight out of pandas (NumPy integers and floats, Timestamps, NaN and
+NaT), which the standard library encoder rejects, so they are converted here.
+It includes:
+- to_json, which uses orjson when it is installed and the standard library
+  encoder otherwise
+- Conversion of NumPy and pandas values (NaN and NaT become null)
+- frame_records, which builds JSON-ready records from DataFrame columns
+
+Both backends produce the same JSON values, so responses do not depend on
+whether orjson is installed.
+"""
+
+import json
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+# Name of the encoder in use, for diagnostics
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """
+    Convert a value the encoder does not handle natively.
+
+    Args:
+        value: The value to convert
+
+    Returns:
+        Any: A JSON-compatible equivalent
+
+    Raises:
+        TypeError: If the value has no JSON representation
+    """
+    if value is pd.NaT:
+        return None
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        value = float(value)
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'M':
+            # tolist() would give epoch integers; format like datetime64 scalars
+            formatted = _format_datetimes(pd.Series(value.ravel()), None)
+            return np.array(formatted, dtype=object).reshape(value.shape).tolist()
+        return _replace_nan(value.tolist())
+    if isinstance(value, (pd.Series, pd.Index)):
+        if pd.api.types.is_datetime64_any_dtype(value):
+            return _format_datetimes(pd.Series(value), None)
+        return _replace_nan(value.tolist())
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _replace_nan(value: Any) -> Any:
+    """
+    Replace NaN and infinite floats with None, recursively.
+
+    Args:
+        value: A JSON-compatible value
+
+    Returns:
+        Any: The value with non-finite floats replaced
+    """
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: _replace_nan(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_nan(item) for item in value]
+    return value
+
+
+def to_json(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    NumPy scalars and arrays, Timestamps, dates and Decimals are converted;
+    NaN, infinities and NaT become null.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        bytes: The JSON document
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # orjson rejects some NumPy values (such as NaT datetime64) without
+            # calling default; encode NumPy values through default instead
+            return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(value, default=_default, allow_nan=False,
+                          ensure_ascii=False, separators=(',', ':'))
+    except ValueError:
+        # Plain floats are not passed to default, so NaN needs a second pass
+        text = json.dumps(_replace_nan(value), default=_default, allow_nan=False,
+                          ensure_ascii=False, separators=(',', ':'))
+    return text.encode('utf-8')
+
+
+def _format_datetimes(series: pd.Series, date_format: Optional[str]) -> List[Optional[str]]:
+    """
+    Format a datetime column as strings, formatting each distinct value once.
+
+    Imported dates repeat heavily (many transactions per day), so this is
+    much faster than formatting every row.
+
+    Args:
+        series: Datetime column
+        date_format: strftime format (ISO 8601 if None)
+
+    Returns:
+        List[Optional[str]]: Formatted values, None for NaT
+    """
+    codes, uniques = pd.factorize(series)
+    if date_format:
+        labels = list(uniques.strftime(date_format))
+    else:
+        labels = [value.isoformat() for value in uniques]
+    # NaT has code -1, which picks the trailing None
+    labels = np.array(labels + [None], dtype=object)
+    return labels[codes].tolist()
+
+
+def frame_records(df: pd.DataFrame, date_format: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to a list of row dictionaries, column by column.
+
+    Each column is converted to Python values in one step, which is much
+    faster than DataFrame.to_dict('records') and leaves no NumPy scalars.
+
+    Args:
+        df: The DataFrame to convert
+        date_format: strftime format for datetime columns (ISO 8601 if None)
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per row, with None for missing values
+    """
+    columns = [str(column) for column in df.columns]
+    values = []
+    for _, series in df.items():
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values.append(_format_datetimes(series, date_format))
+        elif pd.api.types.is_float_dtype(series) or series.hasnans:
+            # Missing values in object columns are NaN after pandas.read_csv
+            values.append(series.astype(object).where(series.notna(), None).tolist())
+        else:
+            values.append(series.tolist())
+    return [dict(zip(columns, row)) for row in zip(*values)]
@@ -0,0 +1,259 @@
+"""
+upload_service.py - Streaming Upload Handling for Muzzy Tracker
+
+This module writes uploaded CSV files to disk as they arrive, in fixed-size
+chunks, without buffering the whole body first. The first chunk is sniffed
+while it is written, so the encoding, delimiter and header row are known
+before the rest of the upload is read, and files that are too large or do
+not look like CSV are rejected early.
+It includes:
+- CSV format sniffing (encoding, delimiter, header row) from a byte sample
+- A size-limited upload writer usable as a werkzeug file stream
+- size_limit_message, the error message for uploads over the size limit
+"""
+
+import codecs
+import os
+import re
+from typing import Dict, Any, Optional
+
+# Largest accepted upload in bytes, also used as Flask's MAX_CONTENT_LENGTH
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_CONTENT_LENGTH', 500 * 1024 * 1024))  # 500 MB
+
+# Size of the writes to disk, and of the sample sniffed for the file format
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64 KB
+
+# Delimiters recognized in uploaded files
+DELIMITERS = [',', ';', '\t', '|']
+
+# Encodings tried, in order, for files without a byte order mark
+FALLBACK_ENCODINGS = ['utf-8', 'cp1252', 'latin-1']
+
+# Fields that look like amounts or dates rather than column names
+_VALUE_PATTERN = re.compile(r'^[\s$€£(+-]*\d[\d\s,./:-]*\)?$')
+
+
+class UploadRejected(Exception):
+    """
+    Raised when an upload is refused before or while it is written.
+
+    This is deliberately not a ValueError: werkzeug's form parser silently
+    swallows ValueErrors raised by file streams.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        """
+        Initialize the error.
+
+        Args:
+            message: Reason the upload was refused
+            status_code: HTTP status to answer with (413 for oversized uploads)
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def size_limit_message(max_bytes: int) -> str:
+    """
+    Describe why an upload over the size limit was refused.
+
+    Args:
+        max_bytes: Largest accepted upload in bytes
+
+    Returns:
+        str: Error message with the limit in MB, KB or bytes
+    """
+    for unit, size in (('MB', 1024 * 1024), ('KB', 1024)):
+        if max_bytes >= size:
+            return f"File is larger than the {round(max_bytes / size, 1):g} {unit} limit"
+    return f"File is larger than the {max_bytes} byte limit"
+
+
+def _detect_encoding(sample: bytes, final: bool) -> str:
+    """
+    Pick the encoding of a byte sample.
+
+    Args:
+        sample: The first bytes of the file
+        final: Whether the sample is the whole file
+
+    Returns:
+        str: An encoding name usable by open() and pandas
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if b'\x00' in sample:
+        raise UploadRejected('File does not look like a CSV (binary content)')
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            # An incremental decoder tolerates a character cut off at the end of the sample
+            codecs.getincrementaldecoder(encoding)().decode(sample, final)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return FALLBACK_ENCODINGS[-1]
+
+
+def sniff_csv_format(sample: bytes, final: bool = False) -> Dict[str, Any]:
+    """
+    Detect the format of a CSV file from its first bytes.
+
+    Args:
+        sample: The first bytes of the file
+        final: Whether the sample is the whole file
+
+    Returns:
+        Dict[str, Any]: 'encoding', 'delimiter', 'has_header' and 'column_count'
+
+    Raises:
+        UploadRejected: If the sample is empty, binary or has no delimited header line
+    """
+    if not sample.strip():
+        raise UploadRejected('File is empty')
+    encoding = _detect_encoding(sample, final)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final)
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        # Bytes such as b'\x1c' decode to line breaks or Unicode whitespace only
+        raise UploadRejected('File is empty')
+    if not final and len(lines) > 1:
+        # The last line may be cut off by the end of the sample
+        lines = lines[:-1]
+    first_line = lines[0]
+
+    # Count occurrences of common delimiters; the header line must contain the winner
+    counts = {d: text.count(d) for d in DELIMITERS}
+    delimiter = max(counts, key=counts.get)
+    if delimiter not in first_line:
+        raise UploadRejected('File does not look like a CSV (no column delimiter found)')
+
+    fields = [field.strip().strip('"') for field in first_line.split(delimiter)]
+    has_header = not any(_VALUE_PATTERN.match(field) for field in fields if field)
+    return {'encoding': encoding, 'delimiter': delimiter, 'has_header': has_header,
+            'column_count': len(fields)}
+
+
+def read_options(csv_format: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get pandas.read_csv arguments for a sniffed file format.
+
+    Files without a header row get generated column names.
+
+    Args:
+        csv_format: Format returned by sniff_csv_format
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for pandas.read_csv
+    """
+    options = {'delimiter': csv_format['delimiter'], 'encoding': csv_format['encoding']}
+    if not csv_format['has_header']:
+        options['header'] = None
+        options['names'] = [f"Column {i + 1}" for i in range(csv_format['column_count'])]
+    return options
+
+
+class UploadWriter:
+    """
+    Write-through file stream for an upload, sniffed and size-checked as it is written.
+
+    Data is written to disk in UPLOAD_CHUNK_SIZE blocks. The first block is
+    held back until it can be sniffed, so an upload that is not a CSV is
+    refused before anything after it is read. Refused uploads are deleted.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int = MAX_UPLOAD_BYTES):
+        """
+        Open the destination file.
+
+        Args:
+            file_path: Where to write the upload
+            max_bytes: Largest accepted upload in bytes
+        """
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.bytes_written = 0
+        self.csv_format: Optional[Dict[str, Any]] = None
+        self.finished = False
+        self._head = bytearray()
+        self._file = open(file_path, 'wb', buffering=UPLOAD_CHUNK_SIZE)
+
+    def write(self, data: bytes) -> int:
+        """
+        Write the next piece of the upload.
+
+        Args:
+            data: The bytes received
+
+        Returns:
+            int: Number of bytes accepted
+
+        Raises:
+            UploadRejected: If the upload is too large or not a CSV
+        """
+        self.bytes_written += len(data)
+        if self.bytes_written > self.max_bytes:
+            self.discard()
+            raise UploadRejected(size_limit_message(self.max_bytes), 413)
+
+        if self.csv_format is None:
+            self._head += data
+            if len(self._head) >= UPLOAD_CHUNK_SIZE:
+                self._sniff(final=False)
+        else:
+            self._file.write(data)
+        return len(data)
+
+    def _sniff(self, final: bool) -> None:
+        """
+        Sniff the held-back first block and write it out.
+
+        Args:
+            final: Whether the block is the whole upload
+        """
+        try:
+            self.csv_format = sniff_csv_format(bytes(self._head), final)
+        except UploadRejected:
+            self.discard()
+            raise
+        self._file.write(self._head)
+        self._head = bytearray()
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Complete the upload and close the file.
+
+        Returns:
+            Dict[str, Any]: The sniffed CSV format
+
+        Raises:
+            UploadRejected: If the upload is empty or not a CSV
+        """
+        if self.csv_format is None:
+            self._sniff(final=True)
+        self._file.close()
+        self.finished = True
+        return self.csv_format
+
+    def discard(self) -> None:
+        """
+        Close and delete the partially written file.
+        """
+        self._file.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def close(self) -> None:
+        """
+        Close the file, keeping what was written.
+        """
+        self._file.close()
+
+    # werkzeug rewinds the stream after the last part; the data is already on disk
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return 0
+
+    def flush(self) -> None:
+        self._file.flush()
@@ -0,0 +1,29 @@
+"""
+worker_bootstrap.py - Import Worker Start-Up for Muzzy Tracker
+
+This script is run with runpy.run_path as the initializer of the parallel
+import worker processes (see parallel_pipeline.py). The workers start from a
+fresh interpreter (forkserver or spawn), where the top-level app.py module
+shadows the app/ package directory on sys.path, so the package is registered
+before the pipeline is imported. The worker then creates its CSV service and
+compiles the category matcher once.
+
+The upload folder is passed in the script's globals as 'upload_folder'.
+"""
+
+import os
+import sys
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if 'app' not in sys.modules or not hasattr(sys.modules['app'], '__path__'):
+    package = types.ModuleType('app')
+    package.__path__ = [os.path.join(REPO_ROOT, 'app')]
+    sys.modules['app'] = package
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from app.services.parallel_pipeline import _init_worker  # noqa: E402
+
+_init_worker(globals()['upload_folder'])
@@ -0,0 +1,98 @@
+"""
+bench_categorize.py - Categorization Benchmark for Muzzy Tracker
+
+Compares the original per-row categorization loop (iterrows plus a keyword
+scan per row) with CSVService.categorize_transactions, which runs the compiled
+CategoryMatcher over unique descriptions only, with a cold and a warm
+description -> category cache. Also checks that both approaches agree.
+
+Usage:
+    python benchmarks/bench_categorize.py [rows]
+"""
+
+import random
+import sys
+
+import pandas as pd
+
+from common import setup_app_package, best_of
+
+setup_app_package()
+
+from app.services.csv_service import CSVService, CATEGORY_KEYWORDS  # noqa: E402
+
+MERCHANTS = [
+    'STARBUCKS #1234', 'AMAZON MKTPLACE PMTS', 'SHELL OIL 5521', 'NETFLIX.COM',
+    'PAYROLL ACME CORP', 'CITY PARKING GARAGE', 'WHOLE FOODS MARKET', 'ZELLE TO J SMITH',
+    'DELTA AIRLINES', 'CVS PHARMACY', 'LOCAL HARDWARE', 'UBER EATS ORDER', 'HOME DEPOT',
+    'VANGUARD BROKERAGE', 'SQ *CORNER BAKERY', 'COMCAST CABLE', 'AIRBNB * HMQ2',
+]
+
+
+def legacy_categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Categorize transactions the way the service did before the compiled matcher.
+
+    Args:
+        df: DataFrame with a description column
+
+    Returns:
+        pd.DataFrame: DataFrame with categories filled in
+    """
+    def suggest_category(description: str) -> str:
+        description = description.lower()
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if any(keyword.lower() in description for keyword in keywords):
+                return category
+        return 'Other'
+
+    if 'category' not in df.columns:
+        df['category'] = None
+    for idx, row in df.iterrows():
+        if pd.isna(row['category']):
+            df.at[idx, 'category'] = suggest_category(str(row['description']))
+    return df
+
+
+def make_descriptions(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a DataFrame of realistic transaction descriptions.
+
+    Args:
+        rows: Number of rows
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: DataFrame with a description column
+    """
+    rng = random.Random(seed)
+    descriptions = [f"{rng.choice(MERCHANTS)} {rng.randint(100, 999)}" for _ in range(rows)]
+    return pd.DataFrame({'description': descriptions})
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    service = CSVService()
+    base = make_descriptions(rows)
+
+    legacy_time, legacy_result = best_of(lambda: legacy_categorize(base.copy()), repeat=1)
+
+    def run_cold():
+        service.category_cache.clear()
+        return service.categorize_transactions(base.copy())
+
+    compiled_time, compiled_result = best_of(run_cold)
+    warm_time, _ = best_of(lambda: service.categorize_transactions(base.copy()))
+
+    assert legacy_result['category'].tolist() == compiled_result['category'].tolist()
+
+    print(f"rows:              {rows}")
+    print(f"legacy iterrows:   {legacy_time:.3f}s  ({rows / legacy_time:,.0f} rows/s)")
+    print(f"compiled, cold:    {compiled_time:.3f}s  ({rows / compiled_time:,.0f} rows/s)")
+    print(f"compiled, warm:    {warm_time:.3f}s  ({rows / warm_time:,.0f} rows/s)")
+    print(f"speedup:           {legacy_time / compiled_time:.1f}x cold, {legacy_time / warm_time:.1f}x warm")
+    print(f"unique merchants:  {len(service.category_cache)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+bench_import_pipeline.py - Import Pipeline Benchmark Suite for Muzzy Tracker
+
+Times every CSVService stage of the /import/* flow on generated bank
+statements (see statement_generator.py), and the Flask routes end to end
+through the test client when Flask is installed. Results are written to JSON
+so runs on different commits can be compared.
+
+Each statement size is run once per variant; the default variants cover every
+date format in DATE_FORMATS with each delimiter and amount style. Generated
+statements are kept in benchmarks/.data and reused.
+
+Usage:
+    python benchmarks/bench_import_pipeline.py [--sizes 1000,10000,100000] [--quick]
+        [--repeat 3] [--output results.json] [--compare baseline.json] [--no-routes]
+
+Stage times are the best of --repeat runs. Every run gets its own empty
+in-memory transaction store, so runs do not see each other's transactions and
+a configured database is neither read nor written. --quick runs a single
+variant per size, which is the practical choice at 1M-10M rows. --compare
+prints the ratio of each timing to the same timing in an earlier results file.
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+
+from common import setup_app_package, REPO_ROOT
+
+setup_app_package()
+
+from app.services.csv_service import CSVService, CATEGORY_KEYWORDS  # noqa: E402
+from app.services.category_matcher import CategoryCache  # noqa: E402
+from app.models.transaction import TransactionStore, set_transaction_store  # noqa: E402
+from statement_generator import ensure_statement, statement_variants  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+
+# Timings more than this much slower than the baseline are flagged by --compare
+REGRESSION_THRESHOLD = 1.10
+
+# Timings shorter than this are too noisy to be flagged
+MIN_COMPARE_SECONDS = 0.01
+
+
+def run_environment() -> Dict[str, Any]:
+    """
+    Describe the code and environment a run was made with.
+
+    Returns:
+        Dict[str, Any]: Commit, versions and timestamp
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions = {}
+    for module in ('pandas', 'numpy', 'pyarrow', 'flask'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': versions,
+    }
+
+
+def upload_copy(service: CSVService, statement: str) -> str:
+    """
+    Put a statement in the service's upload folder under a fresh upload ID.
+
+    A fresh ID means no cached frames or columnar copy from earlier runs.
+
+    Args:
+        service: CSV service
+        statement: Path of the generated statement
+
+    Returns:
+        str: Path of the upload
+    """
+    path = os.path.join(service.upload_folder, f"{uuid.uuid4().hex}.csv")
+    try:
+        os.link(statement, path)
+    except OSError:
+        shutil.copyfile(statement, path)
+    return path
+
+
+def time_stages(service: CSVService, statement: str) -> Dict[str, float]:
+    """
+    Run the import pipeline stage by stage on a statement and time each stage.
+
+    Args:
+        service: CSV service
+        statement: Path of the generated statement
+
+    Returns:
+        Dict[str, float]: Seconds per stage
+    """
+    timings: Dict[str, float] = {}
+    path = upload_copy(service, statement)
+
+    def timed(stage: str, func: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = func()
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    # Start each run with a cold, in-memory description -> category memo and an empty store
+    service.category_cache = CategoryCache(CATEGORY_KEYWORDS)
+    set_transaction_store(TransactionStore())
+    try:
+        df = timed('read_csv', lambda: service.read_csv(path))
+        timed('read_csv_cached', lambda: service.read_csv(path))
+        mapping = service.suggest_column_mapping(df)
+        df = timed('apply_column_mapping', lambda: service.apply_column_mapping(df, mapping))
+        df = timed('convert_dates', lambda: service.convert_dates(df, 'date'))
+        df = timed('normalize_amounts', lambda: service.normalize_amounts(df, 'negative_expense'))
+        df = timed('categorize_transactions', lambda: service.categorize_transactions(df))
+        issues = timed('validate_data', lambda: service.validate_data(df))
+        timed('generate_preview', lambda: service.generate_preview(df, issues))
+        timed('process_import', lambda: service.process_import(df))
+    finally:
+        service.cleanup_temp_file(path)
+    timings['total'] = sum(seconds for stage, seconds in timings.items() if stage != 'read_csv_cached')
+    return timings
+
+
+def load_flask_app() -> Optional[Any]:
+    """
+    Load the Flask application from app.py, if Flask is installed.
+
+    Returns:
+        The Flask app, or None without Flask
+    """
+    try:
+        import flask  # noqa: F401
+    except ImportError:
+        return None
+    spec = importlib.util.spec_from_file_location('muzzy_app', os.path.join(REPO_ROOT, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def time_routes(flask_app: Any, statement: str) -> Dict[str, float]:
+    """
+    Run a statement through the /import/* routes with the test client and time each request.
+
+    Args:
+        flask_app: The Flask app
+        statement: Path of the generated statement
+
+    Returns:
+        Dict[str, float]: Seconds per route
+    """
+    timings: Dict[str, float] = {}
+    client = flask_app.test_client()
+    # Keep duplicate detection and store growth out of the measurement
+    set_transaction_store(TransactionStore())
+
+    def timed(route: str, func: Callable[[], Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        response = func()
+        timings[route] = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"{route} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return json.loads(response.get_data(as_text=True))
+
+    with open(statement, 'rb') as f:
+        upload = timed('/import/upload', lambda: client.post(
+            '/import/upload', data={'file': (io.BytesIO(f.read()), 'statement.csv')},
+            content_type='multipart/form-data'))
+    file_path = upload['file_path']
+    timed('/import/map', lambda: client.post('/import/map', json={
+        'file_path': file_path,
+        'mapping': upload['suggested_mapping'],
+        'date_format': upload['suggested_date_format'],
+        'amount_format': 'negative_expense'
+    }))
+    timed('/import/preview', lambda: client.post('/import/preview', json={'file_path': file_path}))
+    timed('/import/process', lambda: client.post('/import/process', json={
+        'file_path': file_path, 'skip_duplicates': False
+    }))
+    timings['total'] = sum(timings.values())
+    return timings
+
+
+def best_timings(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Keep the fastest time of each stage over several runs.
+
+    Args:
+        runs: Timings of each run
+
+    Returns:
+        Dict[str, float]: Best seconds per stage
+    """
+    return {stage: min(run[stage] for run in runs) for stage in runs[0]}
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """
+    Identify a result for comparisons between runs.
+
+    Args:
+        result: One entry of the results list
+
+    Returns:
+        str: Key made of the kind, size and variant
+    """
+    return f"{result['kind']}/{result['rows']}/{result['date_format']}/{result['delimiter']}/{result['amount_style']}"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """
+    Print each timing as a ratio to the same timing in an earlier results file.
+
+    Args:
+        results: Results of this run
+        baseline_path: Path of the earlier results JSON file
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {result_key(result): result['seconds'] for result in baseline['results']}
+    print(f"\ncompared with {baseline_path} (commit {baseline['environment'].get('commit')}):")
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        for stage, seconds in result['seconds'].items():
+            if stage in old and old[stage] > 0:
+                ratio = seconds / old[stage]
+                regressed = ratio > REGRESSION_THRESHOLD and seconds >= MIN_COMPARE_SECONDS
+                flag = '  REGRESSION' if regressed else ''
+                print(f"  {result_key(result):60} {stage:24} {ratio:6.2f}x{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the CSV import pipeline.')
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='comma-separated statement sizes in rows (up to 10000000)')
+    parser.add_argument('--quick', action='store_true', help='run one variant per size')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is kept)')
+    parser.add_argument('--seed', type=int, default=42, help='statement generator seed')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='compare with an earlier results JSON file')
+    parser.add_argument('--no-routes', action='store_true', help='skip the Flask route benchmark')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    variants = statement_variants()[:1] if args.quick else statement_variants()
+    flask_app = None if args.no_routes else load_flask_app()
+    if not args.no_routes and flask_app is None:
+        print('Flask is not installed; skipping the route benchmark')
+
+    results: List[Dict[str, Any]] = []
+    work_dir = tempfile.mkdtemp(prefix='muzzy-bench-')
+    cwd = os.getcwd()
+    try:
+        # The routes create their own CSVService on temp_uploads in the working directory
+        os.chdir(work_dir)
+        service = CSVService(os.path.join(work_dir, 'temp_uploads'))
+        for rows in sizes:
+            for date_format, delimiter, amount_style in variants:
+                statement = ensure_statement(DATA_DIR, rows, date_format, delimiter, amount_style, args.seed)
+                variant = {'rows': rows, 'date_format': date_format, 'delimiter': delimiter,
+                           'amount_style': amount_style, 'file_bytes': os.path.getsize(statement)}
+
+                stages = best_timings([time_stages(service, statement) for _ in range(args.repeat)])
+                results.append({'kind': 'stages', **variant, 'seconds': stages})
+                print(f"{rows:>10,} {date_format:10} {delimiter:9} {amount_style:8} stages "
+                      f"{stages['total']:8.3f}s  ({rows / stages['total']:,.0f} rows/s)")
+
+                if flask_app is not None:
+                    routes = best_timings([time_routes(flask_app, statement) for _ in range(args.repeat)])
+                    results.append({'kind': 'routes', **variant, 'seconds': routes})
+                    print(f"{'':>10} {'':10} {'':9} {'':8} routes {routes['total']:8.3f}s")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': run_environment(), 'results': results}, f, indent=2)
+        print(f"results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
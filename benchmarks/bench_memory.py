@@ -0,0 +1,131 @@
+"""
+bench_memory.py - Transaction Memory Benchmark for Muzzy Tracker
+
+Measures bytes per transaction for the different in-memory representations:
+regular objects with a per-instance __dict__ (the original Transaction),
+slotted Transaction objects, and columnar TransactionColumns, both on their
+own and once indexed by a TransactionStore.
+
+Usage:
+    python benchmarks/bench_memory.py [transactions]
+"""
+
+import gc
+import random
+import sys
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Any, Dict, List
+
+from common import setup_app_package
+
+setup_app_package()
+
+from app.models.transaction import (  # noqa: E402
+    Transaction, TransactionBatch, TransactionColumns, TransactionStore
+)
+
+MERCHANTS = ['STARBUCKS #1234', 'AMAZON MKTPLACE', 'SHELL OIL 5521', 'NETFLIX.COM',
+             'PAYROLL ACME CORP', 'WHOLE FOODS MARKET', 'ZELLE TO J SMITH', 'CVS PHARMACY']
+CATEGORIES = ['Food & Dining', 'Shopping', 'Transportation', 'Bills & Utilities', 'Income', 'Other']
+ACCOUNTS = ['Chase Checking', 'Amex Gold', 'Ally Savings']
+
+
+class DictTransaction:
+    """
+    Transaction with a per-instance __dict__, as before __slots__ was added.
+    """
+
+    def __init__(self, transaction_id, date, description, amount, category=None, account=None,
+                 notes=None, status='cleared', import_batch_id=None, import_date=None):
+        self.id = transaction_id
+        self.date = date
+        self.description = description
+        self.amount = amount
+        self.category = category
+        self.account = account
+        self.notes = notes
+        self.status = status
+        self.import_batch_id = import_batch_id
+        self.import_date = import_date
+
+
+def make_rows(count: int, seed: int = 42) -> Dict[str, List[Any]]:
+    """
+    Build synthetic transaction columns, as parsed from a CSV file.
+
+    Every string is a fresh object, like values read from a file.
+
+    Args:
+        count: Number of transactions
+        seed: Random seed
+
+    Returns:
+        Dict[str, List[Any]]: Column values by field name
+    """
+    rng = random.Random(seed)
+    first_day = date(2020, 1, 1)
+    return {
+        'id': [f"{rng.getrandbits(128):032x}" for _ in range(count)],
+        'date': [(first_day + timedelta(days=rng.randrange(1500))).isoformat() for _ in range(count)],
+        'description': [''.join(rng.choice(MERCHANTS)) for _ in range(count)],
+        'amount': [round(rng.uniform(-300, 300), 2) for _ in range(count)],
+        'category': [''.join(rng.choice(CATEGORIES)) for _ in range(count)],
+        'account': [''.join(rng.choice(ACCOUNTS)) for _ in range(count)],
+        'import_batch_id': 'b' * 32,
+        'import_date': '2025-01-01 00:00:00'
+    }
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """
+    Measure the memory retained by the object a function builds.
+
+    Args:
+        build: Function that builds the structure
+
+    Returns:
+        int: Retained bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    def objects(cls):
+        rows = make_rows(count)
+        return [cls(rows['id'][i], rows['date'][i], rows['description'][i], rows['amount'][i],
+                    rows['category'][i], rows['account'][i], None, 'cleared',
+                    rows['import_batch_id'], rows['import_date']) for i in range(count)]
+
+    def columns():
+        return TransactionColumns.from_columns(make_rows(count))
+
+    def store():
+        store = TransactionStore()
+        store.add_batch(TransactionBatch('b' * 32, columns(), '2025-01-01 00:00:00'))
+        return store
+
+    results = [
+        ('objects with __dict__', measure(lambda: objects(DictTransaction))),
+        ('objects with __slots__', measure(lambda: objects(Transaction))),
+        ('TransactionColumns', measure(columns)),
+        ('columns in indexed store', measure(store)),
+    ]
+
+    print(f"transactions: {count:,}")
+    for name, retained in results:
+        print(f"{name:<26} {retained / count:8.1f} bytes/transaction")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+bench_process_import.py - Import Processing Benchmark for Muzzy Tracker
+
+Compares the original import path (iterrows in process_import, then one
+Transaction.from_dict per row) with the bulk path (process_import_columns,
+then TransactionBatch.from_columns) on a prepared DataFrame.
+
+Usage:
+    python benchmarks/bench_process_import.py [rows]
+"""
+
+import random
+import sys
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from common import setup_app_package, best_of
+
+setup_app_package()
+
+from app.services.csv_service import CSVService  # noqa: E402
+from app.models.transaction import Transaction, TransactionBatch  # noqa: E402
+
+
+def legacy_import(df: pd.DataFrame) -> TransactionBatch:
+    """
+    Build a batch the way the import route did before the bulk path.
+
+    Args:
+        df: Prepared transaction data
+
+    Returns:
+        TransactionBatch: The imported batch
+    """
+    batch_id = uuid.uuid4().hex
+    transactions = []
+    for _, row in df.iterrows():
+        transaction = {
+            'id': uuid.uuid4().hex,
+            'import_batch_id': batch_id,
+            'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        for col in df.columns:
+            value = row[col]
+            if col == 'date' and pd.notna(value):
+                value = value.strftime('%Y-%m-%d')
+            transaction[col] = value
+        transactions.append(transaction)
+
+    objects = [Transaction.from_dict(t) for t in transactions]
+    return TransactionBatch(batch_id, objects, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def bulk_import(service: CSVService, df: pd.DataFrame) -> TransactionBatch:
+    """
+    Build a batch through the bulk column path.
+
+    Args:
+        service: CSV service
+        df: Prepared transaction data
+
+    Returns:
+        TransactionBatch: The imported batch
+    """
+    result = service.process_import_columns(df)
+    return TransactionBatch.from_columns(result['summary']['batch_id'], result['columns'],
+                                         datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a prepared (mapped, converted and categorized) transaction DataFrame.
+
+    Args:
+        rows: Number of rows
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame: Transaction data
+    """
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'date': pd.to_datetime('2024-01-01') + pd.to_timedelta([rng.randrange(365) for _ in range(rows)], unit='D'),
+        'description': [f"MERCHANT {rng.randrange(500)}" for _ in range(rows)],
+        'amount': [round(rng.uniform(-250, 250), 2) for _ in range(rows)],
+        'account': [rng.choice(['Checking', 'Credit Card']) for _ in range(rows)],
+        'category': [rng.choice(['Food & Dining', 'Shopping', 'Income', 'Other']) for _ in range(rows)],
+    })
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    service = CSVService()
+    df = make_frame(rows)
+
+    legacy_time, legacy_batch = best_of(lambda: legacy_import(df), repeat=1)
+    bulk_time, bulk_batch = best_of(lambda: bulk_import(service, df))
+
+    assert legacy_batch.total_transactions == bulk_batch.total_transactions
+    assert legacy_batch.date_range == bulk_batch.date_range
+    assert abs(legacy_batch.net_amount - bulk_batch.net_amount) < 0.01
+
+    print(f"rows:         {rows:,}")
+    print(f"legacy path:  {legacy_time:.3f}s  ({rows / legacy_time:,.0f} rows/s)")
+    print(f"bulk path:    {bulk_time:.3f}s  ({rows / bulk_time:,.0f} rows/s)")
+    print(f"speedup:      {legacy_time / bulk_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
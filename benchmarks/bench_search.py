@@ -0,0 +1,102 @@
+"""
+bench_search.py - Transaction Search Benchmark for Muzzy Tracker
+
+Loads the in-memory transaction store with synthetic transactions whose
+descriptions mix merchant names, store numbers and payment keywords, then
+compares full-text index searches against a substring scan of every
+description and note.
+
+Usage:
+    python benchmarks/bench_search.py [transactions]
+"""
+
+import random
+import sys
+import time
+
+from common import setup_app_package, best_of
+
+setup_app_package()
+
+from app.models.transaction import TransactionBatch, TransactionStore  # noqa: E402
+from app.models.search_index import tokenize  # noqa: E402
+
+MERCHANTS = ['Starbucks', 'Amazon Marketplace', 'Whole Foods Market', 'Shell Oil', 'Netflix',
+             'Uber Trip', 'Delta Air Lines', 'Walgreens', 'Target', 'Costco Wholesale',
+             'Chipotle Mexican Grill', 'Home Depot', 'Spotify USA', 'Trader Joes', 'Lyft Ride']
+KEYWORDS = ['POS PURCHASE', 'DEBIT CARD', 'RECURRING', 'ONLINE', 'CONTACTLESS']
+NOTES = ['reimbursable', 'split with roommate', 'business trip', 'gift', 'refund pending']
+QUERIES = ['starbucks', 'whole foods', 'amaz', 'deb card', 'trip business', 'netflix recurring']
+
+
+def build_store(count: int, batch_size: int = 50000, seed: int = 42) -> TransactionStore:
+    """
+    Build a store filled with synthetic transactions.
+
+    Args:
+        count: Number of transactions
+        batch_size: Number of transactions per import batch
+        seed: Random seed
+
+    Returns:
+        TransactionStore: The filled store
+    """
+    rng = random.Random(seed)
+    store = TransactionStore()
+    for batch_number in range(0, count, batch_size):
+        size = min(batch_size, count - batch_number)
+        batch_id = f"batch{batch_number:08d}"
+        columns = {
+            'id': [f"{batch_number + i:032x}" for i in range(size)],
+            'date': [f"20{rng.randrange(15, 25)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"
+                     for _ in range(size)],
+            'description': [f"{rng.choice(KEYWORDS)} {rng.choice(MERCHANTS)} #{rng.randrange(500)}"
+                            for _ in range(size)],
+            'amount': [round(rng.uniform(-200, 200), 2) for _ in range(size)],
+            'notes': [rng.choice(NOTES) if rng.random() < 0.05 else None for _ in range(size)],
+            'import_batch_id': [batch_id] * size,
+        }
+        store.add_batch(TransactionBatch.from_columns(batch_id, columns, '2025-01-01 00:00:00'))
+    return store
+
+
+def naive_search(store: TransactionStore, query: str, limit: int):
+    """
+    Find transactions whose words start with every query term by scanning them all.
+
+    Args:
+        store: The store to scan
+        query: The search text
+        limit: Maximum number of transactions to return
+
+    Returns:
+        Tuple[int, List[Transaction]]: Number of matching transactions and the newest ones
+    """
+    terms = tokenize(query)
+    matches = []
+    for transaction in store.transactions:
+        words = tokenize(transaction.description) + tokenize(transaction.notes)
+        if all(any(word.startswith(term) for word in words) for term in terms):
+            matches.append(transaction)
+    return len(matches), matches[::-1][:limit]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    start = time.perf_counter()
+    store = build_store(count)
+    print(f"transactions:       {count:,}")
+    print(f"build with indexes: {time.perf_counter() - start:.2f}s")
+    print(f"distinct texts:     {len(store.search_index.fields['description'].text_ids):,}")
+
+    for query in QUERIES:
+        indexed, (total, _) = best_of(lambda: store.search_transactions(query, 50), repeat=5)
+        scan, (scan_total, _) = best_of(lambda: naive_search(store, query, 50), repeat=1)
+        assert total == scan_total, (query, total, scan_total)
+        print(f"{query!r:22} {total:>9,} matches  index {indexed * 1e3:8.2f} ms  "
+              f"scan {scan * 1e3:10,.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+bench_store.py - Transaction Store Lookup Benchmark for Muzzy Tracker
+
+Loads the in-memory transaction store with synthetic transactions and compares
+indexed lookups (by ID, by batch and by date range) against the linear scans
+the store used to perform over plain lists.
+
+Usage:
+    python benchmarks/bench_store.py [transactions]
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from common import setup_app_package, best_of
+
+setup_app_package()
+
+from app.models.transaction import Transaction, TransactionBatch, TransactionStore  # noqa: E402
+
+
+def build_store(count: int, batch_size: int = 10000, seed: int = 42) -> TransactionStore:
+    """
+    Build a store filled with synthetic transactions.
+
+    Args:
+        count: Number of transactions
+        batch_size: Number of transactions per import batch
+        seed: Random seed
+
+    Returns:
+        TransactionStore: The filled store
+    """
+    rng = random.Random(seed)
+    store = TransactionStore()
+    first_day = date(2015, 1, 1)
+    for batch_number in range(0, count, batch_size):
+        batch_id = f"batch{batch_number:08d}"
+        transactions = [
+            Transaction(
+                transaction_id=f"{batch_number + i:032x}",
+                date=(first_day + timedelta(days=rng.randrange(3650))).isoformat(),
+                description='Synthetic merchant',
+                amount=round(rng.uniform(-200, 200), 2),
+                category='Other',
+                import_batch_id=batch_id
+            )
+            for i in range(min(batch_size, count - batch_number))
+        ]
+        store.add_batch(TransactionBatch(batch_id, transactions, '2025-01-01 00:00:00'))
+    return store
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    start = time.perf_counter()
+    store = build_store(count)
+    print(f"transactions:            {count:,}")
+    print(f"build with indexes:      {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(7)
+    ids = [f"{rng.randrange(count):032x}" for _ in range(1000)]
+    batch_id = store.batches[len(store.batches) // 2].id
+
+    indexed, _ = best_of(lambda: [store.get_transaction(i) for i in ids])
+    scan, _ = best_of(lambda: [next(t for t in store.transactions if t.id == i) for i in ids[:5]], repeat=1)
+    print(f"get by id (indexed):     {indexed / len(ids) * 1e6:.2f} us/lookup")
+    print(f"get by id (linear scan): {scan / 5 * 1e6:,.0f} us/lookup")
+
+    indexed, _ = best_of(lambda: store.get_transactions_by_batch(batch_id))
+    scan, _ = best_of(lambda: [t for t in store.transactions if t.import_batch_id == batch_id], repeat=1)
+    print(f"get by batch (indexed):  {indexed * 1e3:.2f} ms")
+    print(f"get by batch (scan):     {scan * 1e3:.2f} ms")
+
+    indexed, result = best_of(lambda: store.get_transactions_by_date_range('2020-03-01', '2020-03-31'))
+    scan, _ = best_of(lambda: [t for t in store.transactions if '2020-03-01' <= t.date <= '2020-03-31'], repeat=1)
+    print(f"one month (indexed):     {indexed * 1e3:.2f} ms ({len(result):,} rows)")
+    print(f"one month (scan):        {scan * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+common.py - Shared Helpers for Muzzy Tracker Benchmarks
+
+This module makes the application packages importable from benchmark scripts
+and provides small timing utilities.
+
+The top-level app.py module shadows the app/ package directory on sys.path,
+so the package is registered explicitly before anything imports it.
+"""
+
+import os
+import sys
+import time
+import types
+from typing import Callable, Any, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_app_package() -> None:
+    """
+    Register the app/ directory as the 'app' package.
+    """
+    if 'app' not in sys.modules or not hasattr(sys.modules['app'], '__path__'):
+        package = types.ModuleType('app')
+        package.__path__ = [os.path.join(REPO_ROOT, 'app')]
+        sys.modules['app'] = package
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> Tuple[float, Any]:
+    """
+    Run a function several times and report the fastest run.
+
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        Tuple[float, Any]: Best wall time in seconds and the last result
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
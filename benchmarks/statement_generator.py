@@ -0,0 +1,206 @@
+"""
+statement_generator.py - Synthetic Bank Statement Generator for Muzzy Tracker Benchmarks
+
+Writes seeded, realistic bank-statement CSV files for benchmarking the import
+pipeline. Statements are generated in chunks, so files of tens of millions of
+rows can be written without holding them in memory, and the same arguments
+always produce the same file.
+It includes:
+- Merchant descriptions with store numbers and card-processor prefixes, drawn
+  with a skewed frequency like real spending
+- Every date format in CSVService.DATE_FORMATS
+- Plain or currency-formatted amounts ("-$1,234.56")
+- Comma, semicolon, tab and pipe delimiters
+
+Usage:
+    python benchmarks/statement_generator.py rows output.csv [date_format] [delimiter] [amount_style]
+"""
+
+import csv
+import os
+import sys
+from datetime import date
+from typing import List, Tuple
+
+import numpy as np
+
+from common import setup_app_package
+
+setup_app_package()
+
+from app.services.csv_service import DATE_FORMATS  # noqa: E402
+
+# (merchant, typical amount, is income)
+MERCHANTS = [
+    ('STARBUCKS STORE', 6.5, False), ('AMAZON.COM*MK', 38.0, False), ('SHELL OIL', 45.0, False),
+    ('NETFLIX.COM', 15.49, False), ('WHOLE FOODS MARKET', 82.0, False), ('UBER *TRIP', 21.0, False),
+    ('UBER EATS', 29.0, False), ('DELTA AIR LINES', 410.0, False), ('CVS/PHARMACY', 24.0, False),
+    ('TARGET', 57.0, False), ('COSTCO WHSE', 164.0, False), ('CHIPOTLE MEXICAN GRILL', 13.8, False),
+    ('THE HOME DEPOT', 96.0, False), ('SPOTIFY USA', 10.99, False), ('TRADER JOE S', 48.0, False),
+    ('LYFT *RIDE', 18.0, False), ('COMCAST CABLE', 89.99, False), ('CITY PARKING GARAGE', 12.0, False),
+    ('AIRBNB * HMQ', 380.0, False), ('PLANET FITNESS', 24.99, False), ('ZELLE TO J SMITH', 120.0, False),
+    ('VANGUARD BROKERAGE', 500.0, False), ('RENT PAYMENT, APT 4B', 1850.0, False),
+    ('PAYROLL ACME CORP', 3250.0, True), ('INTEREST PAYMENT', 4.12, True), ('VENMO CASHOUT', 75.0, True),
+]
+PREFIXES = ['', '', '', 'SQ *', 'TST* ', 'POS PURCHASE ', 'DEBIT CARD PURCHASE ']
+ACCOUNTS = ['Chase Checking', 'Amex Gold', 'Ally Savings', 'Citi Double Cash']
+
+DELIMITERS = {'comma': ',', 'semicolon': ';', 'tab': '\t', 'pipe': '|'}
+AMOUNT_STYLES = ['plain', 'currency']
+
+HEADER = ['Posting Date', 'Description', 'Amount', 'Account']
+FIRST_DAY = date(2015, 1, 1)
+DAYS = 3650
+CHUNK_ROWS = 100000
+DESCRIPTION_POOL = 5000
+
+
+def statement_variants() -> List[Tuple[str, str, str]]:
+    """
+    Get one (date_format, delimiter name, amount style) variant per date format,
+    pairing delimiters and amount styles round-robin so every option is covered.
+
+    Returns:
+        List[Tuple[str, str, str]]: The variants
+    """
+    delimiters = list(DELIMITERS)
+    return [(date_format, delimiters[i % len(delimiters)], AMOUNT_STYLES[i % len(AMOUNT_STYLES)])
+            for i, date_format in enumerate(DATE_FORMATS)]
+
+
+def statement_name(rows: int, date_format: str, delimiter: str, amount_style: str, seed: int) -> str:
+    """
+    Get a file name that identifies a generated statement.
+
+    Args:
+        rows: Number of transactions
+        date_format: strftime format of the dates
+        delimiter: Delimiter name (a key of DELIMITERS)
+        amount_style: 'plain' or 'currency'
+        seed: Random seed
+
+    Returns:
+        str: The file name
+    """
+    slug = date_format.translate(str.maketrans({'%': '', '/': 's', '-': 'h', ' ': '_', ',': ''}))
+    return f"statement-{rows}-{slug}-{delimiter}-{amount_style}-{seed}.csv"
+
+
+def _description_pool(rng: np.random.Generator) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Build the distinct descriptions a statement draws from.
+
+    Args:
+        rng: Random generator
+
+    Returns:
+        Tuple: Descriptions, their typical amounts and their income flags
+    """
+    descriptions, typical, income = [], [], []
+    for _ in range(DESCRIPTION_POOL):
+        merchant, amount, is_income = MERCHANTS[rng.integers(len(MERCHANTS))]
+        prefix = '' if is_income else PREFIXES[rng.integers(len(PREFIXES))]
+        descriptions.append(f"{prefix}{merchant} #{rng.integers(1, 9999):04d}")
+        typical.append(amount)
+        income.append(is_income)
+    return descriptions, np.array(typical), np.array(income)
+
+
+def _format_amounts(amounts: np.ndarray, amount_style: str) -> List[str]:
+    """
+    Format amounts as they appear in bank exports.
+
+    Args:
+        amounts: Signed amounts
+        amount_style: 'plain' ("-12.50") or 'currency' ("-$1,234.56")
+
+    Returns:
+        List[str]: Formatted amounts
+    """
+    if amount_style == 'currency':
+        return [f"-${-amount:,.2f}" if amount < 0 else f"${amount:,.2f}" for amount in amounts.tolist()]
+    return [f"{amount:.2f}" for amount in amounts.tolist()]
+
+
+def generate_statement(path: str, rows: int, date_format: str = DATE_FORMATS[0],
+                       delimiter: str = 'comma', amount_style: str = 'plain', seed: int = 42) -> str:
+    """
+    Write a synthetic bank statement CSV file.
+
+    Args:
+        path: Where to write the file
+        rows: Number of transactions
+        date_format: strftime format of the dates (one of DATE_FORMATS)
+        delimiter: Delimiter name (a key of DELIMITERS)
+        amount_style: 'plain' or 'currency'
+        seed: Random seed
+
+    Returns:
+        str: The path of the written file
+    """
+    rng = np.random.default_rng(seed)
+    descriptions, typical, income = _description_pool(rng)
+    # Each distinct day is formatted once and looked up by index
+    day_strings = np.array([date.fromordinal(FIRST_DAY.toordinal() + day).strftime(date_format)
+                            for day in range(DAYS)], dtype=object)
+    accounts = np.array(ACCOUNTS, dtype=object)
+    description_array = np.array(descriptions, dtype=object)
+
+    # Zipf-like popularity: a few merchants account for most transactions
+    weights = 1.0 / np.arange(1, DESCRIPTION_POOL + 1)
+    weights /= weights.sum()
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=DELIMITERS[delimiter])
+        writer.writerow(HEADER)
+        for start in range(0, rows, CHUNK_ROWS):
+            count = min(CHUNK_ROWS, rows - start)
+            picks = rng.choice(DESCRIPTION_POOL, size=count, p=weights)
+            magnitudes = np.round(typical[picks] * rng.lognormal(0, 0.35, count), 2)
+            amounts = np.where(income[picks], magnitudes, -magnitudes)
+            days = np.sort(rng.integers(0, DAYS, count))
+            writer.writerows(zip(day_strings[days], description_array[picks],
+                                 _format_amounts(amounts, amount_style),
+                                 accounts[rng.integers(0, len(ACCOUNTS), count)]))
+    return path
+
+
+def ensure_statement(directory: str, rows: int, date_format: str, delimiter: str,
+                     amount_style: str, seed: int = 42) -> str:
+    """
+    Get a generated statement, writing it only if it is not already in the directory.
+
+    Args:
+        directory: Directory holding generated statements
+        rows: Number of transactions
+        date_format: strftime format of the dates
+        delimiter: Delimiter name (a key of DELIMITERS)
+        amount_style: 'plain' or 'currency'
+        seed: Random seed
+
+    Returns:
+        str: Path of the statement
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, statement_name(rows, date_format, delimiter, amount_style, seed))
+    if not os.path.exists(path):
+        temp_path = path + '.tmp'
+        generate_statement(temp_path, rows, date_format, delimiter, amount_style, seed)
+        os.replace(temp_path, path)
+    return path
+
+
+def main() -> None:
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    rows, path = int(sys.argv[1]), sys.argv[2]
+    date_format = sys.argv[3] if len(sys.argv) > 3 else DATE_FORMATS[0]
+    delimiter = sys.argv[4] if len(sys.argv) > 4 else 'comma'
+    amount_style = sys.argv[5] if len(sys.argv) > 5 else 'plain'
+    generate_statement(path, rows, date_format, delimiter, amount_style)
+    print(f"wrote {rows:,} transactions to {path}")
+
+
+if __name__ == '__main__':
+    main()
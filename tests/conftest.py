@@ -0,0 +1,38 @@
+"""
+conftest.py - Shared Test Setup for Muzzy Tracker
+
+The top-level app.py module shadows the app/ package directory on sys.path,
+so the package is registered explicitly before any test imports it.
+"""
+
+import os
+import sys
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'app' not in sys.modules or not hasattr(sys.modules['app'], '__path__'):
+    package = types.ModuleType('app')
+    package.__path__ = [os.path.join(REPO_ROOT, 'app')]
+    sys.modules['app'] = package
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+import pytest  # noqa: E402
+
+from app.models.database import create_database  # noqa: E402
+from app.models.sql_store import SQLTransactionStore  # noqa: E402
+from app.models.transaction import TransactionStore  # noqa: E402
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    """
+    Each transaction store backend, empty: in memory and on a temporary SQLite file.
+    """
+    if request.param == 'memory':
+        yield TransactionStore()
+    else:
+        sql_store = SQLTransactionStore(create_database('sqlite', str(tmp_path / 'store.db')))
+        yield sql_store
+        sql_store.close()
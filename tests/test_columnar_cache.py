@@ -0,0 +1,101 @@
+"""
+test_columnar_cache.py - Tests for the Columnar Upload Cache of Muzzy Tracker
+
+Covers writing and reading the binary column copies of uploads in
+app/services/columnar_cache.py, in both the Arrow and the raw layout.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import columnar_cache
+from app.services.columnar_cache import ColumnarUpload
+
+
+@pytest.fixture(params=['arrow', 'raw'])
+def layout(request, monkeypatch):
+    if request.param == 'arrow' and columnar_cache.pa is None:
+        pytest.skip('pyarrow is not installed')
+    monkeypatch.setattr(columnar_cache, 'COLUMNAR_FORMAT', request.param)
+    return request.param
+
+
+def statement_frame():
+    return pd.DataFrame({
+        'Date': [f"2024-01-{day:02d}" for day in range(1, 11)],
+        'Description': ['Coffee', None, 'Rent', 'Café', 'Payroll', 'Tea', None, 'Books', 'Fuel', 'Gift'],
+        'Amount': np.arange(10, dtype='float64') * -1.5,
+        'Reference': np.arange(100, 110, dtype='int64'),
+    })
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    return process.pid
+
+
+def test_read_ranges_match_the_frame(tmp_path, layout):
+    df = statement_frame()
+    path = str(tmp_path / 'upload.csv')
+    upload = ColumnarUpload(path)
+    chunks = [df.iloc[start:start + 4] for start in range(0, len(df), 4)]
+    for _ in upload.write_chunks(chunks):
+        pass
+    assert upload.exists()
+    assert not os.path.exists(upload.lock_path)
+
+    for start, stop in [(0, None), (0, 4), (1, 3), (2, 9), (8, 20), (5, 5)]:
+        expected = df.iloc[start:stop]
+        expected.index = pd.RangeIndex(start, min(stop or len(df), len(df)))
+        pd.testing.assert_frame_equal(ColumnarUpload(path).read(start, stop), expected)
+
+
+def test_chunk_aligned_reads_share_number_columns(tmp_path, layout):
+    upload = ColumnarUpload(str(tmp_path / 'upload.csv'))
+    df = statement_frame()
+    for _ in upload.write_chunks([df.iloc[:4], df.iloc[4:8], df.iloc[8:]]):
+        pass
+
+    chunk = upload.read(4, 8)
+    assert not chunk['Amount'].to_numpy().flags.writeable
+    assert not chunk['Reference'].to_numpy().flags.writeable
+    # Replacing a column leaves the mapped data alone
+    chunk['Amount'] = chunk['Amount'] * 2
+    assert upload.read(4, 8)['Amount'].tolist() == [-6.0, -7.5, -9.0, -10.5]
+
+
+def test_stale_copy_is_replaced(tmp_path, layout, caplog):
+    upload = ColumnarUpload(str(tmp_path / 'upload.csv'))
+    # A conversion that died after it started writing
+    os.makedirs(upload.paths['raw'])
+    with open(upload.paths['arrow'], 'wb') as f:
+        f.write(b'partial')
+    with open(upload.lock_path, 'w') as f:
+        f.write(str(dead_pid()))
+
+    with caplog.at_level(logging.INFO, logger='app.services.columnar_cache'):
+        upload.write_frame(statement_frame())
+    assert 'left by dead process' in caplog.text
+    assert upload.exists()
+    assert not os.path.exists(upload.lock_path)
+    assert upload.read()['Reference'].tolist() == list(range(100, 110))
+
+
+def test_copy_is_skipped_during_live_conversion(tmp_path, layout, caplog):
+    upload = ColumnarUpload(str(tmp_path / 'upload.csv'))
+    with open(upload.lock_path, 'w') as f:
+        f.write(str(os.getpid()))
+
+    with caplog.at_level(logging.INFO, logger='app.services.columnar_cache'):
+        upload.write_frame(statement_frame())
+    assert 'conversion in progress' in caplog.text
+    assert not upload.exists()
+    assert os.path.exists(upload.lock_path)
+    assert not os.path.exists(upload.paths['arrow']) and not os.path.exists(upload.paths['raw'])
@@ -0,0 +1,223 @@
+"""
+test_csv_service.py - Tests for CSV Import Validation and Previews in Muzzy Tracker
+
+Covers the validation issues of app/services/csv_service.py (the capped issue
+summaries, the row masks behind them and paging through the affected rows)
+and the preview statistics computed by frame_totals and generate_preview.
+Results are compared with a plain pandas computation on a small frame.
+"""
+
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.transaction import TransactionStore, set_transaction_store
+from app.services import csv_service as csv_service_module
+from app.services.csv_service import CSVService, frame_totals, issue_summary
+
+MAPPING = {'date': 'Date', 'description': 'Description', 'amount': 'Amount', 'category': 'Category'}
+SETTINGS = {'mapping': MAPPING, 'date_format': '%Y-%m-%d', 'amount_format': 'negative_expense'}
+
+
+@pytest.fixture
+def service(tmp_path):
+    # Duplicate checks look at the module-level store, so start from an empty one
+    set_transaction_store(TransactionStore())
+    return CSVService(str(tmp_path / 'uploads'))
+
+
+def mapped_frame():
+    future = (pd.Timestamp.now().normalize() + pd.Timedelta(days=30)).strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-05', None, future, '2024-01-05', '2024-01-06', future, '2024-01-07'],
+                               format='%Y-%m-%d'),
+        'description': ['Coffee', 'Rent', 'Gym', 'Coffee', 'Books', 'Fuel', 'Bonus'],
+        'amount': ['-4.50', '$-1,200.00', 'n/a', '-4.50', None, '-60', '7,500'],
+        'category': ['Food', 'Housing', None, 'Food', None, 'Transport', 'Income'],
+    }, index=pd.RangeIndex(10, 17))
+
+
+def plain_masks(df):
+    amounts = pd.to_numeric(df['amount'].str.replace('$', '', regex=False).str.replace(',', '', regex=False),
+                            errors='coerce')
+    return {
+        'invalid_dates': df['date'].isna(),
+        'future_dates': df['date'] > pd.Timestamp.now(),
+        'non_numeric_amounts': amounts.isna(),
+        'missing_categories': df['category'].isna(),
+        'large_amounts': amounts.abs() > 5000,
+        'duplicate_rows': df.duplicated(['date', 'description', 'amount']),
+    }
+
+
+def write_upload(tmp_path, rows):
+    # Uploads are cached by file name, so every test gets its own
+    path = tmp_path / 'uploads' / f"{uuid.uuid4().hex}.csv"
+    path.parent.mkdir(exist_ok=True)
+    lines = ['Date,Description,Amount,Category'] + [','.join(row) for row in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_issue_summary_caps_sample_rows(monkeypatch):
+    monkeypatch.setattr(csv_service_module, 'MAX_ISSUE_SAMPLE_ROWS', 3)
+    index = pd.RangeIndex(100, 110)
+    mask = np.array([True, False, True, True, False, True, True, False, False, True])
+
+    issue = issue_summary('missing_categories', mask, index)
+    assert issue['count'] == 6
+    assert issue['rows'] == [100, 102, 103]
+    assert issue['rows_truncated'] is True
+    assert issue['message'] == 'Found 6 transactions with missing categories'
+
+    issue = issue_summary('missing_categories', mask & (index < 103), index)
+    assert (issue['count'], issue['rows'], issue['rows_truncated']) == (2, [100, 102], False)
+    assert issue_summary('missing_categories', np.zeros(10, dtype=bool), index) is None
+
+
+def test_issue_masks_match_pandas(service):
+    df = mapped_frame()
+    masks = service.issue_masks(df)
+    expected = plain_masks(df)
+    assert list(masks) == list(expected)
+    for issue_type, mask in expected.items():
+        assert masks[issue_type].tolist() == mask.tolist(), issue_type
+
+
+def test_validate_data_counts_every_row(service, monkeypatch):
+    monkeypatch.setattr(csv_service_module, 'MAX_ISSUE_SAMPLE_ROWS', 1)
+    df = mapped_frame()
+    issues = {issue['type']: issue for issue in service.validate_data(df)}
+
+    for issue_type, mask in plain_masks(df).items():
+        rows = df.index[mask.to_numpy()].tolist()
+        assert issues[issue_type]['count'] == len(rows), issue_type
+        assert issues[issue_type]['rows'] == rows[:1]
+        assert issues[issue_type]['rows_truncated'] == (len(rows) > 1)
+
+
+def test_validate_data_reports_missing_fields(service):
+    issues = service.validate_data(pd.DataFrame({'date': pd.to_datetime(['2024-01-05'])}))
+    assert [issue['field'] for issue in issues if issue['type'] == 'missing_field'] == ['description', 'amount']
+
+
+def test_get_issue_rows_pages_through_mapped_frame(service, tmp_path):
+    path = write_upload(tmp_path, [])
+    df = mapped_frame()
+    service.cache_frame(path, 'mapped', df)
+
+    first = service.get_issue_rows(path, 'non_numeric_amounts', 0, 1)
+    assert first == {'type': 'non_numeric_amounts', 'count': 2, 'offset': 0, 'rows': [12], 'next_offset': 1}
+    second = service.get_issue_rows(path, 'non_numeric_amounts', first['next_offset'], 1)
+    assert (second['rows'], second['next_offset']) == ([14], None)
+    assert service.get_issue_rows(path, 'future_dates')['rows'] == [12, 15]
+    assert service.get_issue_rows(path, 'duplicate_rows')['rows'] == [13]
+
+
+def test_get_issue_rows_replays_saved_mapping(service, tmp_path):
+    rows = [('2024-01-%02d' % (i % 28 + 1), f"Shop {i % 3}", 'n/a' if i % 4 == 1 else f"-{i}.25", 'Food')
+            for i in range(11)]
+    path = write_upload(tmp_path, rows)
+    service.save_import_settings(path, SETTINGS)
+
+    raw = pd.read_csv(path)
+    expected = raw.index[pd.to_numeric(raw['Amount'], errors='coerce').isna()].tolist()
+    pages = []
+    offset = 0
+    while offset is not None:
+        page = service.get_issue_rows(path, 'non_numeric_amounts', offset, 2)
+        assert page['count'] == len(expected)
+        pages.append(page['rows'])
+        offset = page['next_offset']
+    assert [row for page in pages for row in page] == expected == [1, 5, 9]
+    assert [len(page) for page in pages] == [2, 1]
+
+
+def test_get_issue_rows_rejects_unknown_and_unmapped(service, tmp_path):
+    path = write_upload(tmp_path, [('2024-01-05', 'Coffee', '-4.50', 'Food')])
+    with pytest.raises(ValueError, match='Unknown issue type'):
+        service.get_issue_rows(path, 'typos')
+    with pytest.raises(ValueError, match='has not been applied'):
+        service.get_issue_rows(path, 'invalid_dates')
+
+
+def preview_frame():
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-02-10', '2024-01-31', None, '2024-02-01', '2024-03-15', '2024-01-05'],
+                               format='%Y-%m-%d'),
+        'description': ['Coffee', None, 'Payroll', 'Rent', 'Refund', 'Tea'],
+        'amount': [-4.5, 2500.0, 1200.0, np.nan, 30.25, -3.0],
+        'category': ['Food', 'Income', None, 'Housing', 'Uncategorized', 'Food'],
+    })
+
+
+def plain_groups(df, keys):
+    groups = {}
+    for key, group in df.groupby(keys):
+        groups[key] = [len(group), group['amount'][group['amount'] > 0].sum(),
+                       group['amount'][group['amount'] < 0].sum()]
+    return groups
+
+
+def test_frame_totals_match_pandas():
+    df = preview_frame()
+    totals = frame_totals(df)
+
+    assert totals['count'] == len(df)
+    assert totals['income'] == pytest.approx(df['amount'][df['amount'] > 0].sum())
+    assert totals['expenses'] == pytest.approx(df['amount'][df['amount'] < 0].sum())
+    assert (totals['min_date'], totals['max_date']) == (df['date'].min(), df['date'].max())
+
+    # Missing categories are grouped with 'Uncategorized'; rows without a date have no month
+    categories = plain_groups(df, df['category'].fillna('Uncategorized'))
+    assert totals['categories'] == pytest.approx(categories)
+    months = plain_groups(df[df['date'].notna()], df['date'].dt.strftime('%Y-%m'))
+    assert totals['months'] == pytest.approx(months)
+
+
+def test_frame_totals_parse_raw_amounts():
+    df = pd.DataFrame({'amount': ['$1,200.50', '-40', 'n/a', None], 'category': ['Income', 'Food', 'Food', None]})
+    totals = frame_totals(df)
+    assert (totals['count'], totals['income'], totals['expenses']) == (4, 1200.5, -40.0)
+    assert totals['categories'] == {'Income': [1, 1200.5, 0.0], 'Food': [2, 0.0, -40.0],
+                                    'Uncategorized': [1, 0.0, 0.0]}
+    assert (totals['min_date'], totals['max_date'], totals['months']) == (None, None, {})
+
+
+def test_frame_totals_of_empty_frame():
+    totals = frame_totals(preview_frame().iloc[:0])
+    assert totals == {'count': 0, 'income': 0.0, 'expenses': 0.0, 'min_date': None, 'max_date': None,
+                      'categories': {}, 'months': {}}
+
+
+def test_generate_preview(service):
+    df = preview_frame()
+    issues = service.validate_data(df)
+    preview = service.generate_preview(df, issues)
+
+    assert preview['date_range'] == {'start': 'Jan 05, 2024', 'end': 'Mar 15, 2024'}
+    assert preview['stats'] == {'total_transactions': 6, 'income': 3730.25, 'expenses': -7.5, 'net': 3722.75}
+    assert preview['category_totals'] == [
+        {'category': 'Food', 'count': 2, 'income': 0.0, 'expenses': -7.5, 'net': -7.5},
+        {'category': 'Income', 'count': 1, 'income': 2500.0, 'expenses': 0.0, 'net': 2500.0},
+        {'category': 'Uncategorized', 'count': 2, 'income': 1230.25, 'expenses': 0.0, 'net': 1230.25},
+        {'category': 'Housing', 'count': 1, 'income': 0.0, 'expenses': 0.0, 'net': 0.0},
+    ]
+    assert [(row['month'], row['count'], row['net']) for row in preview['monthly_totals']] == [
+        ('2024-01', 2, 2497.0), ('2024-02', 2, -4.5), ('2024-03', 1, 30.25)]
+    assert preview['issues'] == issues
+
+
+def test_preview_sample_rows_have_no_nan_or_nat(service):
+    # Missing strings are NaN after pandas.read_csv
+    df = preview_frame().fillna({'description': np.nan, 'category': np.nan})
+    sample = service.generate_preview(df, [])['sample_data']
+
+    assert len(sample) == 6
+    assert service.sample_rows(df, 2) == sample[:2]
+    assert sample[0] == {'date': 'Feb 10, 2024', 'description': 'Coffee', 'amount': -4.5, 'category': 'Food'}
+    assert sample[1]['description'] is None
+    assert sample[2]['date'] is None and sample[2]['category'] is None
+    assert sample[3]['amount'] is None
@@ -0,0 +1,303 @@
+"""
+test_database.py - Tests for the Pooled Data-Access Layer of Muzzy Tracker
+
+Covers the connection pool, transactions and bulk helpers in
+app/models/database.py, and a round trip through SQLTransactionStore. Every
+test runs against a temporary SQLite database file.
+"""
+
+import sqlite3
+
+import pytest
+
+from app.models import database as database_module
+from app.models.database import (
+    ConnectionPool, Database, Driver, PoolTimeoutError, PyMySQLDriver, SQLiteDriver,
+    create_database, translate_placeholders
+)
+from app.models.fingerprint_index import date_to_day
+from app.models.sql_store import SQLTransactionStore
+from app.models.transaction import Transaction, TransactionBatch
+
+
+class FlakySQLiteDriver(SQLiteDriver):
+    """
+    SQLite driver that counts pings and can be told to fail them.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.pings = 0
+        self.fail_pings = False
+
+    def ping(self, connection):
+        self.pings += 1
+        if self.fail_pings:
+            raise sqlite3.OperationalError('connection lost')
+        super().ping(connection)
+
+
+class FakeClock:
+    """
+    Stand-in for the time module with a monotonic clock moved by hand.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'muzzy.db')
+
+
+@pytest.fixture
+def database(db_path):
+    db = Database(SQLiteDriver(db_path), pool_size=2, timeout=0.05)
+    yield db
+    db.close()
+
+
+def test_driver_is_abstract():
+    with pytest.raises(TypeError):
+        Driver()
+
+
+def test_translate_placeholders_keeps_qmark():
+    sql = "SELECT * FROM t WHERE a = ? AND b = '?'"
+    assert translate_placeholders(sql, 'qmark') == sql
+
+
+def test_translate_placeholders_to_format():
+    sql = "SELECT * FROM t WHERE a = ? AND b = '?' AND c LIKE '%x' AND d = \"?\" AND e = ?"
+    assert translate_placeholders(sql, 'format') == (
+        "SELECT * FROM t WHERE a = %s AND b = '?' AND c LIKE '%%x' AND d = \"?\" AND e = %s")
+
+
+def test_translate_placeholders_rejects_unknown_style():
+    with pytest.raises(ValueError):
+        translate_placeholders("SELECT ?", 'named')
+
+
+def test_mysql_upsert_sql():
+    driver = PyMySQLDriver('localhost', 'user', 'secret', 'muzzy')
+    assert driver.upsert_sql('counters', ['key', 'n', 'label'], ['key'], increment=['n']) == (
+        "INSERT INTO counters (key, n, label) VALUES (?, ?, ?) "
+        "ON DUPLICATE KEY UPDATE n = n + VALUES(n), label = VALUES(label)")
+    assert driver.upsert_sql('seen', ['key'], ['key']).endswith("ON DUPLICATE KEY UPDATE key = key")
+
+
+def test_pool_is_bounded_and_times_out(db_path):
+    pool = ConnectionPool(SQLiteDriver(db_path), max_size=2, timeout=0.05)
+    first = pool.acquire()
+    second = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()['in_use'] == 2
+    assert pool.stats()['timeouts'] == 1
+
+    # A released connection is handed out again instead of opening a new one
+    pool.release(second)
+    assert pool.acquire() is second
+    assert pool.stats()['created'] == 2
+
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+
+
+def test_pool_discards_failed_connection(db_path):
+    driver = FlakySQLiteDriver(db_path)
+    pool = ConnectionPool(driver, max_size=1, timeout=0.05)
+
+    driver.fail_pings = True
+    with pytest.raises(RuntimeError):
+        with pool.connection() as connection:
+            raise RuntimeError('query failed')
+    assert pool.stats()['discarded'] == 1
+    assert pool.stats()['idle'] == 0
+
+    # The slot is free again and a fresh connection is opened
+    driver.fail_pings = False
+    with pool.connection() as replacement:
+        assert replacement is not connection
+    assert pool.stats()['created'] == 2
+    pool.close()
+
+
+def test_pool_keeps_connection_that_survives_an_error(db_path):
+    pool = ConnectionPool(FlakySQLiteDriver(db_path), max_size=1, timeout=0.05)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as connection:
+            raise RuntimeError('query failed')
+    with pool.connection() as reused:
+        assert reused is connection
+    assert pool.stats()['discarded'] == 0
+    pool.close()
+
+
+def test_pool_pings_idle_connections_after_interval(db_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(database_module, 'time', clock)
+    driver = FlakySQLiteDriver(db_path)
+    pool = ConnectionPool(driver, max_size=1, timeout=0.05, health_check_interval=30)
+
+    connection = pool.acquire()
+    pool.release(connection)
+
+    # Recently used connections are reused without a ping
+    clock.now += 29
+    assert pool.acquire() is connection
+    assert driver.pings == 0
+    pool.release(connection)
+
+    clock.now += 31
+    assert pool.acquire() is connection
+    assert driver.pings == 1
+    pool.release(connection)
+
+    # A connection that fails its ping is replaced
+    clock.now += 31
+    driver.fail_pings = True
+    replacement = pool.acquire()
+    assert replacement is not connection
+    assert pool.stats()['discarded'] == 1
+    pool.release(replacement)
+    pool.close()
+
+
+def test_transaction_commits(database):
+    database.execute("CREATE TABLE items (name TEXT)")
+    with database.transaction() as session:
+        session.execute("INSERT INTO items (name) VALUES (?)", ('rent',))
+        session.execute("INSERT INTO items (name) VALUES (?)", ('salary',))
+    assert database.query("SELECT name FROM items ORDER BY name") == [('rent',), ('salary',)]
+
+
+def test_transaction_rolls_back_on_error(database):
+    database.execute("CREATE TABLE items (name TEXT)")
+    with pytest.raises(ValueError):
+        with database.transaction() as session:
+            session.execute("INSERT INTO items (name) VALUES (?)", ('rent',))
+            raise ValueError('import failed')
+    assert database.query_one("SELECT COUNT(*) FROM items") == (0,)
+
+    # The connection is usable again after the rollback
+    database.execute("INSERT INTO items (name) VALUES (?)", ('salary',))
+    assert database.query_one("SELECT COUNT(*) FROM items") == (1,)
+
+
+def test_bulk_insert_in_chunks(database, monkeypatch):
+    monkeypatch.setattr(database_module, 'BULK_CHUNK_SIZE', 2)
+    database.execute("CREATE TABLE items (id INTEGER, name TEXT)")
+    rows = ((i, f"item {i}") for i in range(5))
+    assert database.bulk_insert('items', ['id', 'name'], rows) == 5
+    assert database.query("SELECT id FROM items ORDER BY id") == [(i,) for i in range(5)]
+
+
+def test_bulk_insert_joins_open_transaction(database):
+    database.execute("CREATE TABLE items (id INTEGER)")
+    with pytest.raises(RuntimeError):
+        with database.transaction() as session:
+            database.bulk_insert('items', ['id'], [(1,), (2,)], session=session)
+            raise RuntimeError('import failed')
+    assert database.query_one("SELECT COUNT(*) FROM items") == (0,)
+
+
+def test_bulk_upsert_increments_and_replaces(database):
+    database.execute("CREATE TABLE counters (key TEXT PRIMARY KEY, n INTEGER, label TEXT)")
+    columns = ['key', 'n', 'label']
+    database.bulk_upsert('counters', columns, [('a', 1, 'first'), ('b', 2, 'first')],
+                         keys=['key'], increment=['n'])
+    database.bulk_upsert('counters', columns, [('a', 5, 'second'), ('c', 3, 'second')],
+                         keys=['key'], increment=['n'])
+    assert database.query("SELECT key, n, label FROM counters ORDER BY key") == [
+        ('a', 6, 'second'), ('b', 2, 'first'), ('c', 3, 'second')]
+
+
+def test_bulk_upsert_ignores_conflict_without_other_columns(database):
+    database.execute("CREATE TABLE seen (key TEXT PRIMARY KEY)")
+    database.bulk_upsert('seen', ['key'], [('a',), ('a',), ('b',)], keys=['key'])
+    assert database.query("SELECT key FROM seen ORDER BY key") == [('a',), ('b',)]
+
+
+@pytest.fixture
+def sql_store(db_path):
+    store = SQLTransactionStore(create_database('sqlite', db_path))
+    yield store
+    store.close()
+
+
+def statement_batch(batch_id):
+    rows = [
+        ('2024-01-05', 'Coffee Shop', -4.5, 'Food', 'Checking', None),
+        ('2024-01-05', 'Payroll', 2500.0, 'Income', 'Checking', None),
+        ('2024-01-20', 'Grocery Store', -82.25, 'Food', 'Checking', 'weekly shop'),
+        ('2024-02-01', 'Rent', -1500.0, 'Housing', 'Checking', None),
+        ('2024-02-14', 'Flowers', -30.0, 'Gifts', 'Credit Card', None),
+    ]
+    transactions = [Transaction(f"{batch_id}-{i}", date, description, amount, category, account,
+                                notes=notes, import_batch_id=batch_id, import_date='2024-03-01')
+                    for i, (date, description, amount, category, account, notes) in enumerate(rows, 1)]
+    return TransactionBatch(batch_id, transactions, '2024-03-01')
+
+
+def test_sql_store_round_trip(sql_store):
+    sql_store.add_batch(statement_batch('b1'))
+
+    assert len(sql_store.transactions) == 5
+    assert sql_store.get_batch('b1').total_transactions == 5
+    assert [t.id for t in sql_store.get_transactions_by_batch('b1')] == [f"b1-{i}" for i in range(1, 6)]
+    assert sql_store.get_transaction('b1-3').notes == 'weekly shop'
+
+
+def test_sql_store_keyset_pages(sql_store):
+    sql_store.add_batch(statement_batch('b1'))
+
+    pages = []
+    after = None
+    while True:
+        page = sql_store.query_transactions(after=after, limit=2)
+        if not page:
+            break
+        pages.append([t.id for t in page])
+        after = (page[-1].date, page[-1].id)
+    assert pages == [['b1-1', 'b1-2'], ['b1-3', 'b1-4'], ['b1-5']]
+
+    newest = sql_store.query_transactions(limit=2, descending=True)
+    assert [t.id for t in newest] == ['b1-5', 'b1-4']
+    older = sql_store.query_transactions(after=(newest[-1].date, newest[-1].id), limit=2, descending=True)
+    assert [t.id for t in older] == ['b1-3', 'b1-2']
+
+    food = sql_store.query_transactions(categories=['Food'], max_amount=-10)
+    assert [t.id for t in food] == ['b1-3']
+
+
+def test_sql_store_find_duplicates(sql_store):
+    sql_store.add_batch(statement_batch('b1'))
+
+    days = [date_to_day('2024-01-05'), date_to_day('2024-01-07'), date_to_day('2024-01-05'), None]
+    descriptions = ['coffee  shop', 'Coffee Shop', 'Coffee Shop', 'Coffee Shop']
+    amounts = [-4.5, -4.5, -4.51, -4.5]
+    accounts = ['Checking'] * 4
+    assert sql_store.find_duplicates(days, descriptions, amounts, accounts) == [True, False, False, False]
+    assert sql_store.find_duplicates(days, descriptions, amounts, accounts, window_days=2) == [
+        True, True, False, False]
+
+
+def test_sql_store_rollups(sql_store):
+    sql_store.add_batch(statement_batch('b1'))
+    sql_store.add_batch(statement_batch('b2'))
+
+    january = sql_store.get_rollups('2024-01', '2024-01')
+    assert january == [
+        {'month': '2024-01', 'category': 'Food', 'account': 'Checking',
+         'count': 4, 'income': 0.0, 'expenses': -173.5},
+        {'month': '2024-01', 'category': 'Income', 'account': 'Checking',
+         'count': 2, 'income': 5000.0, 'expenses': 0.0},
+    ]
+    cards = sql_store.get_rollups(accounts=['Credit Card'])
+    assert [(row['month'], row['count'], row['expenses']) for row in cards] == [('2024-02', 2, -60.0)]
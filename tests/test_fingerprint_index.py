@@ -0,0 +1,91 @@
+"""
+test_fingerprint_index.py - Tests for Duplicate Transaction Detection in Muzzy Tracker
+
+Covers amount_to_cents, the FingerprintIndex day window, and find_duplicates
+on both transaction store backends.
+"""
+
+import pytest
+
+from app.models.fingerprint_index import FingerprintIndex, amount_to_cents, date_to_day
+from app.models.transaction import Transaction, TransactionBatch
+
+DAY = date_to_day('2024-03-10')
+
+
+@pytest.mark.parametrize('amount, cents', [
+    (12.0, 1200), (-4.5, -450), ('3.25', 325), (0, 0),
+    (None, None), (float('nan'), None), (float('inf'), None),
+    ('$12.00', None), ('n/a', None), ('', None),
+])
+def test_amount_to_cents(amount, cents):
+    assert amount_to_cents(amount) == cents
+
+
+def test_window_edges():
+    index = FingerprintIndex()
+    index.add(DAY, 'Coffee Shop', -4.5, 'Checking')
+
+    assert index.contains(DAY, 'Coffee Shop', -4.5, 'Checking')
+    assert not index.contains(DAY + 1, 'Coffee Shop', -4.5, 'Checking')
+    for offset in (-2, 2):
+        assert index.contains(DAY + offset, 'Coffee Shop', -4.5, 'Checking', window_days=2)
+    for offset in (-3, 3):
+        assert not index.contains(DAY + offset, 'Coffee Shop', -4.5, 'Checking', window_days=2)
+
+
+def test_fingerprint_normalizes_text_only():
+    index = FingerprintIndex()
+    index.add(DAY, 'Coffee Shop', -4.5, 'Checking')
+
+    assert index.contains(DAY, '  coffee   SHOP ', -4.50, 'checking')
+    assert not index.contains(DAY, 'Coffee Shop', -4.51, 'Checking')
+    assert not index.contains(DAY, 'Coffee Shop', -4.5, 'Savings')
+    assert not index.contains(DAY, 'Coffee Shop', 4.5, 'Checking')
+
+
+def test_non_numeric_amounts_are_never_matched():
+    index = FingerprintIndex()
+    index.add(DAY, 'Coffee Shop', '$4.50', 'Checking')
+    index.add(None, 'Coffee Shop', -4.5, 'Checking')
+    assert len(index) == 0
+
+    index.add(DAY, 'Coffee Shop', -4.5, 'Checking')
+    assert not index.contains(DAY, 'Coffee Shop', '$4.50', 'Checking')
+    assert not index.contains(None, 'Coffee Shop', -4.5, 'Checking')
+
+
+def stored_batch():
+    transactions = [
+        Transaction('t1', '2024-03-10', 'Coffee Shop', -4.5, 'Food', 'Checking', import_batch_id='b1'),
+        Transaction('t2', '2024-03-12', 'Payroll', 2500.0, 'Income', 'Checking', import_batch_id='b1'),
+        Transaction('t3', '2024-03-15', 'Parking', None, None, 'Checking', import_batch_id='b1'),
+    ]
+    return TransactionBatch('b1', transactions, '2024-04-01')
+
+
+def test_store_find_duplicates(store):
+    store.add_batch(stored_batch())
+
+    days = [DAY, DAY + 2, DAY + 3, DAY - 2, DAY, date_to_day('2024-03-15'), None]
+    descriptions = ['coffee shop', 'Coffee Shop', 'Coffee Shop', 'Coffee Shop', 'Coffee Shop',
+                    'Parking', 'Coffee Shop']
+    amounts = [-4.5, -4.5, -4.5, -4.5, '$4.50', 'n/a', -4.5]
+    accounts = ['Checking'] * 7
+
+    assert store.find_duplicates(days, descriptions, amounts, accounts) == [
+        True, False, False, False, False, False, False]
+    assert store.find_duplicates(days, descriptions, amounts, accounts, window_days=2) == [
+        True, True, False, True, False, False, False]
+
+
+def test_store_duplicates_across_batches(store):
+    store.add_batch(stored_batch())
+    second = TransactionBatch('b2', [
+        Transaction('t4', '2024-03-20', 'Coffee Shop', -4.5, 'Food', 'Checking', import_batch_id='b2')
+    ], '2024-04-02')
+    store.add_batch(second)
+
+    days = [date_to_day('2024-03-20'), date_to_day('2024-03-17')]
+    assert store.find_duplicates(days, ['Coffee Shop'] * 2, [-4.5] * 2, ['Checking'] * 2,
+                                 window_days=3) == [True, True]
@@ -0,0 +1,60 @@
+"""
+test_parallel_pipeline.py - Tests for the Multi-Core Import Pipeline of Muzzy Tracker
+
+Checks that process_parallel, which runs partitions in the shared worker
+pool, returns exactly what the serial pipeline returns.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.csv_service import CSVService
+from app.services import parallel_pipeline
+from app.services.parallel_pipeline import process_parallel, shutdown_worker_pool
+
+
+@pytest.fixture
+def csv_service(tmp_path):
+    yield CSVService(str(tmp_path / 'uploads'))
+    shutdown_worker_pool()
+
+
+def mapped_frame():
+    rows = [
+        ('2024-01-05', 'STARBUCKS STORE #123', '-4.50'),
+        ('2024-01-05', 'PAYROLL ACME CORP', '$2,500.00'),
+        ('2024-01-06', 'WHOLE FOODS MARKET', '-82.25'),
+        ('2024-01-06', 'STARBUCKS STORE #123', '-4.50'),
+        (None, 'NETFLIX.COM', '-15.49'),
+        ('2024-01-08', 'UBER *TRIP', 'n/a'),
+        ('2099-01-01', 'DELTA AIR LINES', '-12500.00'),
+        ('2024-01-09', 'mystery shop', '-7.00'),
+        ('2024-01-05', 'STARBUCKS STORE #123', '-4.50'),
+    ]
+    df = pd.DataFrame(rows, columns=['date', 'description', 'amount'])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def test_parallel_matches_serial(csv_service):
+    df = mapped_frame()
+    serial = csv_service.normalize_amounts(df.copy(), 'negative_expense')
+    serial = csv_service.categorize_transactions(serial)
+    serial_issues = csv_service.validate_data(serial)
+
+    parallel, parallel_issues = process_parallel(df.copy(), 'negative_expense', workers=2,
+                                                 csv_service=csv_service)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert parallel_issues == serial_issues
+    # Rows repeated across partitions are still reported
+    assert any(issue['type'] == 'duplicate_rows' for issue in parallel_issues)
+
+
+def test_pool_is_reused(csv_service):
+    df = mapped_frame()
+    first, _ = process_parallel(df.copy(), workers=2, csv_service=csv_service)
+    pool = parallel_pipeline._pool
+    second, _ = process_parallel(df.copy(), workers=2, csv_service=csv_service)
+    assert parallel_pipeline._pool is pool
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,123 @@
+"""
+test_rollups.py - Tests for Monthly Transaction Rollups in Muzzy Tracker
+
+Covers MonthlyRollups and summarize_rollups in app/models/rollups.py, and the
+rollups each transaction store backend keeps up to date as batches are added.
+"""
+
+import math
+
+import pytest
+
+from app.models.rollups import MonthlyRollups, month_of, summarize_rollups
+from app.models.transaction import Transaction, TransactionBatch, TransactionColumns
+
+
+def make_batch(batch_id, rows, columnar=False):
+    transactions = [Transaction(f"{batch_id}-{i}", date, 'Statement line', amount, category, account,
+                                import_batch_id=batch_id)
+                    for i, (date, amount, category, account) in enumerate(rows)]
+    batch = TransactionBatch(batch_id, transactions, '2024-04-01')
+    if columnar:
+        batch.transactions = TransactionColumns.from_transactions(transactions)
+    return batch
+
+
+FIRST_ROWS = [
+    ('2024-01-05', -4.5, 'Food', 'Checking'),
+    ('2024-01-20', 2500.0, 'Income', 'Checking'),
+    ('2024-01-31', -82.25, 'Food', 'Checking'),
+    ('2024-02-14', -30.0, 'Gifts', 'Card'),
+]
+SECOND_ROWS = [
+    ('2024-01-06', -10.0, 'Food', 'Checking'),
+    ('2024-02-01', -1500.0, 'Housing', 'Checking'),
+    ('2024-02-15', 12.5, 'Gifts', 'Card'),
+    ('2024-03-01', 0.0, 'Food', 'Card'),
+    # Invalid dates and missing amounts are not rolled up
+    ('2024-02-30', -1.0, 'Food', 'Checking'),
+    ('2024-03-02', None, 'Food', 'Checking'),
+]
+
+
+def plain_rollups(rows):
+    entries = {}
+    for date, amount, category, account in rows:
+        if date == '2024-02-30' or amount is None:
+            continue
+        entry = entries.setdefault((date[:7], category, account), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += max(amount, 0.0)
+        entry[2] += min(amount, 0.0)
+    return [{'month': month, 'category': category, 'account': account,
+             'count': count, 'income': round(income, 2), 'expenses': round(expenses, 2)}
+            for (month, category, account), (count, income, expenses) in sorted(entries.items())]
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_store_rollups_increment_across_batches(store, columnar):
+    store.add_batch(make_batch('b1', FIRST_ROWS))
+    assert store.get_rollups() == plain_rollups(FIRST_ROWS)
+
+    store.add_batch(make_batch('b2', SECOND_ROWS, columnar))
+    assert store.get_rollups() == plain_rollups(FIRST_ROWS + SECOND_ROWS)
+
+    # Re-importing the same rows adds to the existing entries
+    store.add_batch(make_batch('b3', FIRST_ROWS, columnar))
+    food = [row for row in store.get_rollups('2024-01', '2024-01') if row['category'] == 'Food']
+    assert food == [{'month': '2024-01', 'category': 'Food', 'account': 'Checking',
+                     'count': 5, 'income': 0.0, 'expenses': -183.5}]
+
+
+def test_store_rollups_filter_months_and_accounts(store):
+    store.add_batch(make_batch('b1', FIRST_ROWS))
+    store.add_batch(make_batch('b2', SECOND_ROWS))
+    expected = plain_rollups(FIRST_ROWS + SECOND_ROWS)
+
+    assert store.get_rollups('2024-02', '2024-02') == [row for row in expected if row['month'] == '2024-02']
+    assert store.get_rollups(start_month='2024-02') == [row for row in expected if row['month'] >= '2024-02']
+    assert store.get_rollups(accounts=['Card']) == [row for row in expected if row['account'] == 'Card']
+
+
+def test_month_of():
+    assert month_of('2024-02-29') == '2024-02'
+    assert month_of('2023-02-29') is None
+    assert month_of(None) is None
+
+
+def test_rollups_skip_missing_and_nan_amounts():
+    rollups = MonthlyRollups()
+    rollups.add('2024-01-05', math.nan, 'Food', 'Checking')
+    rollups.add('2024-01-05', None, 'Food', 'Checking')
+    rollups.add('not a date', -5.0, 'Food', 'Checking')
+    assert len(rollups) == 0
+
+
+def test_rollups_merge():
+    first = MonthlyRollups()
+    first.add_many(['2024-01-05', '2024-01-06'], [-4.5, 20.0], ['Food', 'Food'], ['Checking', 'Checking'])
+    second = MonthlyRollups()
+    second.add_many(['2024-01-07', '2024-02-01'], [-5.5, -30.0], ['Food', 'Gifts'], ['Checking', 'Card'])
+
+    first.merge(second)
+    assert first.query() == [
+        {'month': '2024-01', 'category': 'Food', 'account': 'Checking', 'count': 3, 'income': 20.0, 'expenses': -10.0},
+        {'month': '2024-02', 'category': 'Gifts', 'account': 'Card', 'count': 1, 'income': 0.0, 'expenses': -30.0},
+    ]
+    # The merged rollups are left unchanged
+    assert second.query()[0]['count'] == 1
+
+
+def test_summarize_rollups():
+    rollups = MonthlyRollups()
+    rollups.add_many(*zip(*(FIRST_ROWS + SECOND_ROWS)))
+    rollups.add('2024-03-03', -7.0, None, 'Card')
+    summary = summarize_rollups(rollups.query())
+
+    assert summary['months'] == ['2024-01', '2024-02', '2024-03']
+    assert summary['monthly_totals'][1] == {'month': '2024-02', 'income': 12.5, 'expenses': -1530.0,
+                                            'count': 3, 'net': -1517.5}
+    assert [row['category'] for row in summary['category_totals']] == [
+        'Housing', 'Food', 'Gifts', 'Uncategorized', 'Income']
+    assert summary['spending_by_category']['Food'] == [96.75, 0.0, 0.0]
+    assert summary['totals'] == {'income': 2512.5, 'expenses': -1633.75, 'count': 9}
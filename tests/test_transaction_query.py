@@ -0,0 +1,141 @@
+"""
+test_transaction_query.py - Tests for Filtered Transaction Pages in Muzzy Tracker
+
+Covers keyset pagination and filtering in query_transactions. Every test runs
+against both transaction store backends and compares the pages with a plain
+Python filter over the same transactions, so the backends return the same
+pages.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import transaction as transaction_module
+from app.models.search_index import tokenize
+from app.models.transaction import Transaction, TransactionBatch, TransactionColumns
+
+CATEGORIES = ['Food', 'Rent', 'Travel', 'Food', 'Income', None]
+ACCOUNTS = ['Checking', 'Card', 'Savings']
+DESCRIPTIONS = ['Coffee Shop', 'Grocery Market', 'Airline Tickets', 'Coffee Roasters', 'Payroll', 'Shoe Store']
+
+
+def sample_transactions():
+    transactions = []
+    for i in range(60):
+        transactions.append(Transaction(
+            f"t{(i * 37) % 60:03d}",
+            (date(2024, 1, 1) + timedelta(days=(i * 7) % 40)).isoformat(),
+            DESCRIPTIONS[i % len(DESCRIPTIONS)],
+            None if i == 13 else (i * 10.0 if i % 5 == 4 else -i * 1.25),
+            category=CATEGORIES[i % len(CATEGORIES)],
+            account=ACCOUNTS[i % len(ACCOUNTS)],
+            notes='gift for Mom' if i % 7 == 0 else None,
+            import_batch_id=f"b{i // 20}"))
+    # Transactions without a date are never listed
+    transactions.append(Transaction('undated', None, 'Coffee Shop', -3.0, 'Food', 'Card', import_batch_id='b2'))
+    return transactions
+
+
+@pytest.fixture
+def loaded_store(store):
+    transactions = sample_transactions()
+    for number in range(3):
+        batch_id = f"b{number}"
+        members = [t for t in transactions if t.import_batch_id == batch_id]
+        batch = TransactionBatch(batch_id, members, '2024-03-01')
+        if number == 1:
+            # Columnar batches are indexed column by column
+            batch.transactions = TransactionColumns.from_transactions(members)
+        store.add_batch(batch)
+    return store
+
+
+def matches(transaction, start_date=None, end_date=None, categories=None, accounts=None,
+            min_amount=None, max_amount=None, text=None):
+    if transaction.date is None:
+        return False
+    if start_date is not None and transaction.date < start_date:
+        return False
+    if end_date is not None and transaction.date > end_date:
+        return False
+    if categories is not None and transaction.category not in categories:
+        return False
+    if accounts is not None and transaction.account not in accounts:
+        return False
+    amount = transaction.amount
+    if min_amount is not None and (amount is None or amount < min_amount):
+        return False
+    if max_amount is not None and (amount is None or amount > max_amount):
+        return False
+    if text is not None:
+        words = tokenize(transaction.description) + tokenize(transaction.notes)
+        if not all(any(word.startswith(term) for word in words) for term in tokenize(text)):
+            return False
+    return True
+
+
+def expected_ids(descending=False, **filters):
+    ordered = sorted((t for t in sample_transactions() if matches(t, **filters)),
+                     key=lambda t: (t.date, t.id), reverse=descending)
+    return [t.id for t in ordered]
+
+
+def page_ids(store, limit, descending=False, **filters):
+    pages = []
+    after = None
+    while True:
+        page = store.query_transactions(after=after, limit=limit, descending=descending, **filters)
+        if not page:
+            return pages
+        pages.append([t.id for t in page])
+        after = (page[-1].date, page[-1].id)
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_pages_follow_date_order(loaded_store, descending):
+    pages = page_ids(loaded_store, 7, descending)
+    assert [transaction_id for page in pages for transaction_id in page] == expected_ids(descending)
+    assert all(len(page) == 7 for page in pages[:-1])
+    assert len(pages) == 9
+
+
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('filters', [
+    {'start_date': '2024-01-10', 'end_date': '2024-01-29'},
+    {'categories': ['Travel']},
+    {'categories': ['Food', 'Income']},
+    {'categories': ['Unknown']},
+    {'accounts': ['Card']},
+    {'min_amount': 0},
+    {'max_amount': -20},
+    {'min_amount': -30, 'max_amount': 100},
+    {'text': 'coffee'},
+    {'text': 'SHO'},
+    {'text': 'gift mom'},
+    {'text': 'grocery mom'},
+    {'text': 'offee'},
+    {'categories': ['Food', 'Rent'], 'accounts': ['Checking', 'Card'], 'max_amount': -5},
+    {'categories': ['Food'], 'accounts': ['Checking'], 'text': 'coffee', 'start_date': '2024-01-05'},
+])
+def test_filtered_pages(loaded_store, filters, descending):
+    pages = page_ids(loaded_store, 3, descending, **filters)
+    assert [transaction_id for page in pages for transaction_id in page] == expected_ids(descending, **filters)
+    assert all(len(page) == 3 for page in pages[:-1])
+
+
+def test_filtered_pages_span_candidate_chunks(loaded_store, monkeypatch):
+    monkeypatch.setattr(transaction_module, 'QUERY_CHUNK_SIZE', 2)
+    filters = {'accounts': ['Savings'], 'min_amount': 0}
+    pages = page_ids(loaded_store, 2, True, **filters)
+    assert [transaction_id for page in pages for transaction_id in page] == expected_ids(True, **filters)
+
+
+def test_pages_include_later_imports(loaded_store):
+    first = loaded_store.query_transactions(categories=['Travel'], limit=2)
+    loaded_store.add_batch(TransactionBatch('b3', [
+        Transaction('late', '2024-01-01', 'Airline Tickets', -200.0, 'Travel', 'Card', import_batch_id='b3')
+    ], '2024-03-02'))
+    rest = loaded_store.query_transactions(categories=['Travel'], after=(first[-1].date, first[-1].id))
+    assert 'late' not in [t.id for t in rest]
+    assert loaded_store.query_transactions(categories=['Travel'], limit=1)[0].id == 'late'
@@ -0,0 +1,67 @@
+"""
+test_upload_service.py - Tests for Streaming Upload Handling in Muzzy Tracker
+
+Covers CSV format sniffing and the size-limited UploadWriter in
+app/services/upload_service.py.
+"""
+
+import os
+
+import pytest
+
+from app.services.upload_service import (
+    UploadRejected, UploadWriter, size_limit_message, sniff_csv_format
+)
+
+
+@pytest.mark.parametrize('sample', [b'', b'  \r\n', b'\x1c', b'\x1c\x1d\x1e', b'\xe2\x80\xa8 '])
+def test_sniff_rejects_empty_samples(sample):
+    with pytest.raises(UploadRejected, match='File is empty'):
+        sniff_csv_format(sample, final=True)
+
+
+def test_sniff_detects_format():
+    csv_format = sniff_csv_format(b'Date;Description;Amount\n2024-01-05;Coffee;-4.50\n', final=True)
+    assert csv_format == {'encoding': 'utf-8', 'delimiter': ';', 'has_header': True, 'column_count': 3}
+
+
+def test_sniff_detects_missing_header():
+    csv_format = sniff_csv_format(b'2024-01-05,Coffee,-4.50\n2024-01-06,Tea,-3.00\n', final=True)
+    assert csv_format['has_header'] is False
+
+
+def test_size_limit_message():
+    assert size_limit_message(500 * 1024 * 1024) == 'File is larger than the 500 MB limit'
+    assert size_limit_message(1536 * 1024) == 'File is larger than the 1.5 MB limit'
+    assert size_limit_message(64 * 1024) == 'File is larger than the 64 KB limit'
+    assert size_limit_message(100) == 'File is larger than the 100 byte limit'
+
+
+def test_writer_completes_upload(tmp_path):
+    path = str(tmp_path / 'upload.csv')
+    writer = UploadWriter(path)
+    writer.write(b'Date,Description,Amount\n')
+    writer.write(b'2024-01-05,Coffee,-4.50\n')
+    assert writer.finish()['delimiter'] == ','
+    assert writer.finished
+    with open(path, 'rb') as f:
+        assert f.read() == b'Date,Description,Amount\n2024-01-05,Coffee,-4.50\n'
+
+
+def test_writer_removes_oversized_upload(tmp_path):
+    path = str(tmp_path / 'upload.csv')
+    writer = UploadWriter(path, max_bytes=10)
+    with pytest.raises(UploadRejected) as error:
+        writer.write(b'Date,Description,Amount\n')
+    assert error.value.status_code == 413
+    assert not os.path.exists(path)
+
+
+def test_writer_removes_empty_upload(tmp_path):
+    path = str(tmp_path / 'upload.csv')
+    writer = UploadWriter(path)
+    writer.write(b'\x1c')
+    with pytest.raises(UploadRejected, match='File is empty'):
+        writer.finish()
+    assert not writer.finished
+    assert not os.path.exists(path)